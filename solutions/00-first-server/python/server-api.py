@@ -1,29 +1,79 @@
 from mcp.server.fastmcp import FastMCP
 
-import json
-import requests
+import os
+import time
 import asyncio
+import httpx
+
+# Upstream joke API; point it at a local stub to try the server offline
+JOKES_API_URL = os.environ.get("JOKES_API_URL", "https://api.chucknorris.io")
+# How long the list of joke categories is reused before asking again
+CATEGORIES_TTL = float(os.environ.get("JOKES_CATEGORIES_TTL", "3600"))
 
 # Create an MCP server
 mcp = FastMCP("Demo")
 
+_client = None
+_categories = None
+_categories_expire_at = 0.0
+_categories_lock = asyncio.Lock()
+
+def get_client() -> httpx.AsyncClient:
+    """One async client shared by all tool calls.
+
+    Keeps connections to the upstream alive between calls, so a tool call
+    does not pay for a new TCP/TLS handshake, and never blocks the event
+    loop, so concurrent calls overlap.
+    """
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            base_url=JOKES_API_URL,
+            timeout=httpx.Timeout(5.0, connect=2.0),
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10)
+        )
+    return _client
+
+async def fetch_joke(params=None) -> str:
+    try:
+        res = await get_client().get("/jokes/random", params=params)
+        res.raise_for_status()
+    except httpx.HTTPError as e:
+        return f"Could not get a joke: {e!r}"
+
+    return res.json().get("value", "No joke found.")
+
+async def get_categories() -> list:
+    """Joke categories, fetched at most once every CATEGORIES_TTL seconds."""
+    global _categories, _categories_expire_at
+    async with _categories_lock:
+        if _categories is None or time.monotonic() >= _categories_expire_at:
+            res = await get_client().get("/jokes/categories")
+            res.raise_for_status()
+            _categories = res.json()
+            _categories_expire_at = time.monotonic() + CATEGORIES_TTL
+        return _categories
+
 @mcp.tool()
 async def joke() -> str:
     """Get joke"""
-    res = requests.get("https://api.chucknorris.io/jokes/random")
-    json_response = res.json()
-
-    return json_response.get("value", "No joke found.")
+    return await fetch_joke()
 
 @mcp.tool()
 async def joke_param(category: str = "sport") -> str:
     """Get joke with parameter"""
-    
-    res = requests.get(f"https://api.chucknorris.io/jokes/random?category={category}")
-    json_response = res.json()
 
-    return json_response.get("value", "No joke found.")
+    try:
+        categories = await get_categories()
+    except httpx.HTTPError:
+        categories = None
+
+    # Unknown categories are answered from the cached list, without a request
+    if categories is not None and category not in categories:
+        return f"Unknown category '{category}'. Try one of: {', '.join(categories)}"
+
+    return await fetch_joke({"category": category})
 
 if __name__ == "__main__":
     print("Running server")
-    mcp.run()
\ No newline at end of file
+    mcp.run()
@@ -0,0 +1,127 @@
+import asyncio
+import importlib.util
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+import pytest
+
+SERVER_API = Path(__file__).resolve().parent.parent / "server-api.py"
+
+# Seconds the local joke API takes to answer
+JOKE_API_DELAY = 0.3
+
+def _run(coroutine):
+    return asyncio.run(coroutine)
+
+@pytest.fixture
+def server_api():
+    """A fresh copy of server-api.py, so the shared client and category cache start empty."""
+    spec = importlib.util.spec_from_file_location("server_api", SERVER_API)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+@pytest.fixture
+def upstream(server_api):
+    """Point the shared client at a stub joke API and record the paths it is asked for."""
+    requests = []
+
+    def handler(request):
+        requests.append(request.url.path)
+        if request.url.path == "/jokes/categories":
+            return httpx.Response(200, json=["dev", "sport"])
+        return httpx.Response(200, json={"value": f"joke about {request.url.params.get('category', 'anything')}"})
+
+    server_api._client = httpx.AsyncClient(base_url="http://jokes.test", transport=httpx.MockTransport(handler))
+    return requests
+
+class _SlowJokeHandler(BaseHTTPRequestHandler):
+    """The joke API's /jokes/random, answered after JOKE_API_DELAY seconds."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        time.sleep(JOKE_API_DELAY)
+        url = urlparse(self.path)
+        category = parse_qs(url.query).get("category", ["anything"])[0]
+        body = json.dumps({"value": f"joke about {category}"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def slow_joke_api(server_api):
+    """Point the shared client at a joke API served over HTTP on localhost, answering each request slowly."""
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _SlowJokeHandler)
+    httpd.daemon_threads = True
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    server_api.JOKES_API_URL = f"http://127.0.0.1:{httpd.server_address[1]}"
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+    thread.join()
+
+class TestServerAPI:
+    """Test cases for the joke tools and their upstream calls."""
+
+    def test_reuses_one_client(self, server_api, upstream):
+        assert server_api.get_client() is server_api.get_client()
+
+    def test_categories_cached_while_ttl_holds(self, server_api, upstream):
+        async def scenario():
+            # Concurrent lookups wait on the lock instead of all asking upstream
+            first = await asyncio.gather(*(server_api.get_categories() for _ in range(5)))
+            second = await server_api.get_categories()
+            return first, second
+
+        first, second = _run(scenario())
+
+        assert first == [["dev", "sport"]] * 5
+        assert second == ["dev", "sport"]
+        assert upstream == ["/jokes/categories"]
+
+    def test_categories_fetched_again_after_ttl(self, server_api, upstream):
+        async def scenario():
+            await server_api.get_categories()
+            server_api._categories_expire_at = 0.0
+            await server_api.get_categories()
+
+        _run(scenario())
+
+        assert upstream == ["/jokes/categories", "/jokes/categories"]
+
+    def test_unknown_category_answered_from_cache(self, server_api, upstream):
+        async def scenario():
+            return [await server_api.joke_param("sport"), await server_api.joke_param("cooking")]
+
+        sport, cooking = _run(scenario())
+
+        assert sport == "joke about sport"
+        assert cooking.startswith("Unknown category 'cooking'")
+        assert upstream == ["/jokes/categories", "/jokes/random"]
+
+    def test_concurrent_calls_overlap(self, server_api, slow_joke_api):
+        async def scenario():
+            try:
+                start = time.perf_counter()
+                jokes = await asyncio.gather(*(server_api.joke() for _ in range(5)))
+                return jokes, time.perf_counter() - start
+            finally:
+                await server_api.get_client().aclose()
+
+        jokes, elapsed = _run(scenario())
+
+        assert jokes == ["joke about anything"] * 5
+        # Five calls one after the other would take five delays
+        assert elapsed < 2 * JOKE_API_DELAY
@@ -0,0 +1,64 @@
+"""Latency of an `add` call on a cold session (spawn + initialize per call) versus a warm one.
+
+    python bench_sessions.py --calls 20
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+from session_pool import ServerSession
+
+# Same server as client.py
+server_params = StdioServerParameters(
+    command="mcp",  # Executable
+    args=["run", "server.py"],  # Optional command line arguments
+    env=None,  # Optional environment variables
+)
+
+def report(label, seconds):
+    ms = sorted(value * 1000 for value in seconds)
+    p95 = ms[min(len(ms) - 1, int(len(ms) * 0.95))]
+    print(f"{label:<28} median {statistics.median(ms):8.2f} ms   p95 {p95:8.2f} ms   ({len(ms)} calls)")
+
+async def cold_call():
+    # What client.py does on every run
+    async with stdio_client(server_params) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            return await session.call_tool("add", arguments={"a": 1, "b": 7})
+
+async def timed(call):
+    start = time.perf_counter()
+    await call()
+    return time.perf_counter() - start
+
+async def main(calls, concurrency):
+    report("cold (spawn + initialize)", [await timed(cold_call) for _ in range(calls)])
+
+    async with ServerSession("demo", server_params, max_concurrency=concurrency) as server:
+        add = lambda: server.call_tool("add", {"a": 1, "b": 7})
+        await add()  # first call after connecting
+        report("warm", [await timed(add) for _ in range(calls)])
+
+        # Sequential calls for comparison, then the same number multiplexed over the session
+        total = calls * concurrency
+        start = time.perf_counter()
+        for _ in range(total):
+            await add()
+        sequential = time.perf_counter() - start
+        start = time.perf_counter()
+        await asyncio.gather(*(add() for _ in range(total)))
+        multiplexed = time.perf_counter() - start
+        print(f"{'warm, one at a time':<28} {total / sequential:8.0f} calls/s")
+        print(f"{f'warm, {concurrency} in flight':<28} {total / multiplexed:8.0f} calls/s")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+    asyncio.run(main(args.calls, args.concurrency))
@@ -1,10 +1,12 @@
-from mcp import ClientSession, StdioServerParameters, types
-from mcp.client.stdio import stdio_client
+from mcp import StdioServerParameters, types
+from session_pool import ServerSession
 
 # llm
 import os
-from azure.ai.inference import ChatCompletionsClient
-from azure.ai.inference.models import SystemMessage, UserMessage
+import asyncio
+import hashlib
+from azure.ai.inference.aio import ChatCompletionsClient
+from azure.ai.inference.models import SystemMessage, UserMessage, AssistantMessage, ToolMessage
 from azure.core.credentials import AzureKeyCredential
 import json
 
@@ -15,49 +17,40 @@ server_params = StdioServerParameters(
     env=None,  # Optional environment variables
 )
 
-def call_llm(prompt, functions):
-    token = os.environ["GITHUB_TOKEN"]
-    endpoint = "https://models.inference.ai.azure.com"
+# Any endpoint speaking the same chat completions API works, e.g. a local test model
+ENDPOINT = os.environ.get("LLM_ENDPOINT", "https://models.inference.ai.azure.com")
+MODEL_NAME = os.environ.get("LLM_MODEL", "gpt-4o")
 
-    model_name = "gpt-4o"
+# Tool calls from one LLM response that may run at the same time
+MAX_CONCURRENT_TOOLS = int(os.environ.get("MAX_CONCURRENT_TOOLS", "4"))
+# LLM round trips before the agent gives up
+MAX_TURNS = 5
 
-    client = ChatCompletionsClient(
-        endpoint=endpoint,
-        credential=AzureKeyCredential(token),
-    )
+_llm_client = None
+
+def get_llm_client():
+    """One client for the whole process, so every LLM call reuses its connection."""
+    global _llm_client
+    if _llm_client is None:
+        _llm_client = ChatCompletionsClient(
+            endpoint=ENDPOINT,
+            credential=AzureKeyCredential(os.environ["GITHUB_TOKEN"]),
+        )
+    return _llm_client
 
+async def call_llm(messages, functions):
     print("CALLING LLM")
-    response = client.complete(
-        messages=[
-            {
-            "role": "system",
-            "content": "You are a helpful assistant.",
-            },
-            {
-            "role": "user",
-            "content": prompt,
-            },
-        ],
-        model=model_name,
+    response = await get_llm_client().complete(
+        messages=messages,
+        model=MODEL_NAME,
         tools = functions,
         # Optional parameters
         temperature=1.,
         max_tokens=1000,
-        top_p=1.    
+        top_p=1.
     )
 
-    response_message = response.choices[0].message
-    
-    functions_to_call = []
-
-    if response_message.tool_calls:
-        for tool_call in response_message.tool_calls:
-            print("TOOL: ", tool_call)
-            name = tool_call.function.name
-            args = json.loads(tool_call.function.arguments)
-            functions_to_call.append({ "name": name, "args": args })
-
-    return functions_to_call
+    return response.choices[0].message
 
 def convert_to_llm_tool(tool):
     tool_schema = {
@@ -75,43 +68,137 @@ def convert_to_llm_tool(tool):
 
     return tool_schema
 
-async def run():
-    async with stdio_client(server_params) as (read, write):
-        async with ClientSession(
-            read, write
-        ) as session:
-            # Initialize the connection
-            await session.initialize()
-
-            # List available resources
-            resources = await session.list_resources()
-            print("LISTING RESOURCES")
-            for resource in resources:
-                print("Resource: ", resource)
-
-            # List available tools
-            tools = await session.list_tools()
+async def list_all_tools(session):
+    """Every tool of the server, following tools/list pages."""
+    tools = []
+    cursor = None
+    while True:
+        result = await session.list_tools(cursor=cursor)
+        tools.extend(result.tools)
+        cursor = result.nextCursor
+        if not cursor:
+            return tools
+
+def tool_list_hash(tools):
+    payload = json.dumps([tool.model_dump(mode="json", exclude_none=True) for tool in tools], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class ToolCatalog:
+    """The LLM tool schemas of one server, listed and converted only when they change.
+
+    The tool list is fetched on first use and then reused for every prompt
+    until the server sends notifications/tools/list_changed (pass
+    ``message_handler`` to its ClientSession). Converted schemas are kept by
+    a hash of the tool list, so a list that comes back unchanged is not
+    converted again.
+    """
+
+    def __init__(self):
+        self._functions = None
+        self._stale = True
+        self._converted = {}
+
+    async def reset(self, session=None):
+        """Forget the tool list, e.g. after reconnecting (``ServerSession(on_connect=...)``)."""
+        self._stale = True
+
+    async def message_handler(self, message):
+        if isinstance(message, types.ServerNotification) and isinstance(message.root, types.ToolListChangedNotification):
+            print("TOOLS CHANGED")
+            self._stale = True
+
+    async def functions(self, session):
+        if self._stale:
+            # Cleared first: a notification that arrives while listing marks it stale again
+            self._stale = False
+            try:
+                tools = await list_all_tools(session)
+            except BaseException:
+                # Not listed, so list again next time rather than keep the old schemas
+                self._stale = True
+                raise
             print("LISTING TOOLS")
 
-            functions = []
+            key = tool_list_hash(tools)
+            if key not in self._converted:
+                for tool in tools:
+                    print("Tool: ", tool.name)
+                    print("Tool", tool.inputSchema["properties"])
+                self._converted[key] = [convert_to_llm_tool(tool) for tool in tools]
+            self._functions = self._converted[key]
+        return self._functions
 
-            for tool in tools.tools:
-                print("Tool: ", tool.name)
-                print("Tool", tool.inputSchema["properties"])
-                functions.append(convert_to_llm_tool(tool))
-            
-            prompt = "Add 2 to 20"
+async def call_tools(session, tool_calls):
+    """Run the tool calls of one LLM response concurrently, at most MAX_CONCURRENT_TOOLS at a time.
 
-            # ask LLM what tools to all, if any
-            functions_to_call = call_llm(prompt, functions)
+    Returns one ToolMessage per call, in the order the LLM asked for them.
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_TOOLS)
 
-            # call suggested functions
-            for f in functions_to_call:
-                result = await session.call_tool(f["name"], arguments=f["args"])
-                print("TOOLS result: ", result.content)
+    async def call(tool_call):
+        print("TOOL: ", tool_call)
+        async with semaphore:
+            try:
+                args = json.loads(tool_call.function.arguments or "{}")
+                result = await session.call_tool(tool_call.function.name, arguments=args)
+            except Exception as e:
+                # Report the failure to the LLM instead of abandoning the other calls
+                return ToolMessage(content=f"Error: {e}", tool_call_id=tool_call.id)
 
+        print("TOOLS result: ", result.content)
+        text = "\n".join(item.text for item in result.content if isinstance(item, types.TextContent))
+        return ToolMessage(content=f"Error: {text}" if result.isError else text, tool_call_id=tool_call.id)
 
-if __name__ == "__main__":
-    import asyncio
+    return await asyncio.gather(*(call(tool_call) for tool_call in tool_calls))
+
+async def run_agent(session, prompt, functions, max_turns=MAX_TURNS):
+    """Let the LLM call tools until it answers, feeding every result back to it."""
+    messages = [
+        SystemMessage(content="You are a helpful assistant."),
+        UserMessage(content=prompt),
+    ]
+
+    for _ in range(max_turns):
+        response_message = await call_llm(messages, functions)
+
+        if not response_message.tool_calls:
+            return response_message.content
+
+        messages.append(AssistantMessage(content=response_message.content, tool_calls=response_message.tool_calls))
+        messages.extend(await call_tools(session, response_message.tool_calls))
 
-    asyncio.run(run())
\ No newline at end of file
+    return "Stopped after reaching the maximum number of turns."
+
+async def run():
+    try:
+        await run_session()
+    finally:
+        if _llm_client is not None:
+            await _llm_client.close()
+
+async def run_session():
+    catalog = ToolCatalog()
+
+    # One warm session for every prompt, restarted if the server crashes
+    async with ServerSession(
+        "demo", server_params, message_handler=catalog.message_handler, on_connect=catalog.reset
+    ) as session:
+        # List available resources
+        resources = await session.list_resources()
+        print("LISTING RESOURCES")
+        for resource in resources:
+            print("Resource: ", resource)
+
+        prompts = ["Add 2 to 20", "What is 7 plus 35?"]
+
+        for prompt in prompts:
+            # tools are listed and converted once, then reused until the server changes them
+            functions = await catalog.functions(session)
+
+            # let the LLM call tools, feeding their results back, until it answers
+            answer = await run_agent(session, prompt, functions)
+            print("ANSWER: ", answer)
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
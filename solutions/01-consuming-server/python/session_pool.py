@@ -0,0 +1,266 @@
+import asyncio
+import contextlib
+import logging
+from datetime import timedelta
+
+import anyio
+from mcp import ClientSession, StdioServerParameters, types
+from mcp.client.sse import sse_client
+from mcp.client.stdio import stdio_client
+from mcp.shared.exceptions import McpError
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait before reconnecting; doubles after each failed attempt
+RECONNECT_DELAY = 0.5
+MAX_RECONNECT_DELAY = 30.0
+
+def connection_lost(error):
+    """True when ``error`` means the connection to the server is gone, not that a tool failed."""
+    if isinstance(error, McpError):
+        return error.error.code == types.CONNECTION_CLOSED
+    return isinstance(error, (anyio.ClosedResourceError, anyio.BrokenResourceError, anyio.EndOfStream, ConnectionError))
+
+def never_sent(error):
+    """True when a request failed because the connection was already closed, before reaching the server."""
+    return isinstance(error, (anyio.ClosedResourceError, anyio.BrokenResourceError))
+
+class ServerSession:
+    """A warm session to one MCP server that restarts itself when the server goes away.
+
+    ``server`` is either ``StdioServerParameters`` (the server is started as
+    a subprocess) or the URL of an SSE endpoint. The connection is opened
+    once, in a background task that owns it, and every call reuses it:
+    ``initialize`` and, for stdio, interpreter startup are paid once rather
+    than per run. Concurrent calls share the session (MCP matches responses
+    to requests by id), at most ``max_concurrency`` in flight.
+
+    The task pings the server every ``ping_interval`` seconds. When a ping
+    fails, or a call finds the connection closed, it reconnects with
+    backoff; calls made meanwhile wait up to ``connect_timeout`` seconds
+    for the new session. Calls that were in flight when the server died
+    fail as soon as the session is given up, and are not retried, as a tool
+    call may not be safe to repeat; a call the closed connection never sent
+    goes to the new session instead.
+    """
+
+    def __init__(self, name, server, max_concurrency=16, ping_interval=15.0, ping_timeout=5.0,
+                 connect_timeout=30.0, call_timeout=None, message_handler=None, on_connect=None):
+        self.name = name
+        self.server = server
+        self.ping_interval = ping_interval
+        self.ping_timeout = ping_timeout
+        self.connect_timeout = connect_timeout
+        self.call_timeout = timedelta(seconds=call_timeout) if call_timeout else None
+        # Passed to the ClientSession, e.g. ToolCatalog.message_handler
+        self.message_handler = message_handler
+        # Awaited with each new session after initialize, e.g. to drop cached tool lists
+        self.on_connect = on_connect
+
+        self.restarts = 0
+        self.last_error = None
+        self._session = None
+        self._task = None
+        self._ready = asyncio.Event()
+        # Set when the current session is given up, failing the calls still waiting on it
+        self._lost = asyncio.Event()
+        self._reconnect = asyncio.Event()
+        self._closing = asyncio.Event()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    @property
+    def healthy(self):
+        return self._session is not None
+
+    async def start(self):
+        """Connect in the background and wait until the session is ready."""
+        if self._task is None:
+            self._closing.clear()
+            self._task = asyncio.create_task(self._run(), name=f"mcp-session-{self.name}")
+        await self.session()
+
+    async def close(self):
+        if self._task is not None:
+            self._closing.set()
+            await self._task
+            self._task = None
+
+    async def __aenter__(self):
+        try:
+            await self.start()
+        except BaseException:
+            # Stop the background task, which would otherwise keep reconnecting
+            await self.close()
+            raise
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def _transport(self):
+        if isinstance(self.server, StdioServerParameters):
+            return stdio_client(self.server)
+        return sse_client(self.server)
+
+    async def _run(self):
+        delay = RECONNECT_DELAY
+        while not self._closing.is_set():
+            try:
+                async with self._transport() as (read, write):
+                    async with ClientSession(read, write, message_handler=self.message_handler) as session:
+                        await asyncio.wait_for(session.initialize(), self.connect_timeout)
+                        if self.on_connect is not None:
+                            await self.on_connect(session)
+
+                        self._session = session
+                        self._lost = asyncio.Event()
+                        self._ready.set()
+                        delay = RECONNECT_DELAY
+                        try:
+                            await self._monitor(session)
+                        finally:
+                            # Before closing the transport, which can take a while
+                            self._drop_session()
+            except Exception as e:
+                self.last_error = e
+                logger.warning("MCP server %s: connection lost: %r", self.name, e)
+            finally:
+                self._drop_session()
+
+            if not self._closing.is_set():
+                self.restarts += 1
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._closing.wait(), delay)
+                delay = min(delay * 2, MAX_RECONNECT_DELAY)
+
+    async def _monitor(self, session):
+        """Return when closing, when a call saw the connection close, or when a ping fails."""
+        self._reconnect.clear()
+        while True:
+            waiters = [asyncio.ensure_future(self._closing.wait()), asyncio.ensure_future(self._reconnect.wait())]
+            done, pending = await asyncio.wait(waiters, timeout=self.ping_interval, return_when=asyncio.FIRST_COMPLETED)
+            for waiter in pending:
+                waiter.cancel()
+            if done:
+                return
+
+            try:
+                await asyncio.wait_for(session.send_ping(), self.ping_timeout)
+            except Exception as e:
+                self.last_error = e
+                logger.warning("MCP server %s: health check failed: %r", self.name, e)
+                return
+
+    def _drop_session(self):
+        self._session = None
+        self._ready.clear()
+        self._lost.set()
+
+    async def session(self):
+        """The current ClientSession, waiting while it (re)connects."""
+        if self._task is None:
+            raise RuntimeError(f"Session to MCP server {self.name!r} is not started")
+        try:
+            await asyncio.wait_for(self._ready.wait(), self.connect_timeout)
+        except asyncio.TimeoutError:
+            raise ConnectionError(f"MCP server {self.name!r} is not available (last error: {self.last_error!r})") from None
+        return self._session
+
+    async def _request(self, method, *args, **kwargs):
+        async with self._semaphore:
+            for attempt in range(2):
+                session = await self.session()
+                try:
+                    return await self._send(session, self._lost, method, *args, **kwargs)
+                except Exception as e:
+                    # Only restart the session the call was made on, not a newer one;
+                    # later calls wait for the new session instead of using the dead one
+                    if connection_lost(e) and session is self._session:
+                        self.last_error = e
+                        self._drop_session()
+                        self._reconnect.set()
+                    # e.g. the server process exited since the last call: resend once
+                    if attempt == 0 and never_sent(e):
+                        continue
+                    raise
+
+    async def _send(self, session, lost, method, *args, **kwargs):
+        """Await a request, failing it with ConnectionError if its session is given up first."""
+        request = asyncio.ensure_future(getattr(session, method)(*args, **kwargs))
+        lost_waiter = asyncio.ensure_future(lost.wait())
+        try:
+            await asyncio.wait((request, lost_waiter), return_when=asyncio.FIRST_COMPLETED)
+        except BaseException:
+            request.cancel()
+            raise
+        finally:
+            lost_waiter.cancel()
+        if not request.done():
+            request.cancel()
+            raise ConnectionError(f"MCP server {self.name!r}: connection lost during the request")
+        return request.result()
+
+    async def call_tool(self, name, arguments=None):
+        return await self._request("call_tool", name, arguments, read_timeout_seconds=self.call_timeout)
+
+    async def list_tools(self, cursor=None):
+        return await self._request("list_tools", cursor=cursor)
+
+    async def list_resources(self, cursor=None):
+        return await self._request("list_resources", cursor=cursor)
+
+    async def read_resource(self, uri):
+        return await self._request("read_resource", uri)
+
+    async def ping(self):
+        return await self._request("send_ping")
+
+class SessionManager:
+    """Warm sessions to several MCP servers, addressed by name.
+
+    Options given here are defaults for every ``ServerSession``; ``add``
+    can override them per server.
+    """
+
+    def __init__(self, **options):
+        self.options = options
+        self.sessions = {}
+
+    def add(self, name, server, **options):
+        session = ServerSession(name, server, **{**self.options, **options})
+        self.sessions[name] = session
+        return session
+
+    def __getitem__(self, name):
+        return self.sessions[name]
+
+    async def start(self):
+        """Connect to every server concurrently."""
+        await asyncio.gather(*(session.start() for session in self.sessions.values()))
+
+    async def close(self):
+        await asyncio.gather(*(session.close() for session in self.sessions.values()))
+
+    async def __aenter__(self):
+        try:
+            await self.start()
+        except BaseException:
+            await self.close()
+            raise
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def call_tool(self, server, name, arguments=None):
+        return await self.sessions[server].call_tool(name, arguments)
+
+    def health(self):
+        return {
+            name: {
+                "healthy": session.healthy,
+                "restarts": session.restarts,
+                "last_error": repr(session.last_error) if session.last_error else None
+            }
+            for name, session in self.sessions.items()
+        }
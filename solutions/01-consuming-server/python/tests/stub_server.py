@@ -0,0 +1,66 @@
+"""A small MCP server the tests start over stdio.
+
+    python stub_server.py <name> [--broken-list]
+
+Every instance has the same tools, so two of them share tool names;
+``whoami`` tells them apart. With ``--broken-list`` listing tools fails.
+"""
+import asyncio
+import os
+import sys
+import time
+
+from mcp.server.fastmcp import Context, FastMCP
+
+class StubServer(FastMCP):
+    broken_list = False
+
+    async def list_tools(self):
+        if self.broken_list:
+            raise RuntimeError("listing tools is broken")
+        return await super().list_tools()
+
+mcp = StubServer(sys.argv[1] if len(sys.argv) > 1 else "stub", log_level="WARNING")
+mcp.broken_list = "--broken-list" in sys.argv
+
+@mcp.tool()
+def add(a: int, b: int) -> int:
+    """Add two numbers"""
+    return a + b
+
+@mcp.tool()
+def whoami() -> str:
+    """This server's name"""
+    return mcp.name
+
+@mcp.tool()
+def pid() -> int:
+    """This server's process id"""
+    return os.getpid()
+
+@mcp.tool()
+async def sleep(seconds: float) -> str:
+    """Wait without blocking other requests"""
+    await asyncio.sleep(seconds)
+    return "done"
+
+@mcp.tool()
+async def freeze(seconds: float) -> str:
+    """Block the server, pings included"""
+    time.sleep(seconds)
+    return "done"
+
+@mcp.tool()
+def fail() -> str:
+    """Always fails"""
+    raise ValueError("tool failed")
+
+@mcp.tool()
+async def grow(ctx: Context) -> str:
+    """Add a ``multiply`` tool and tell the client"""
+    mcp.add_tool(lambda a, b: a * b, name="multiply", description="Multiply two numbers")
+    await ctx.session.send_tool_list_changed()
+    return "grown"
+
+if __name__ == "__main__":
+    mcp.run()
@@ -0,0 +1,121 @@
+import asyncio
+import importlib.util
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from mcp import types
+
+from azure.ai.inference.models import ChatCompletionsToolCall, FunctionCall, ToolMessage
+
+CLIENT_LLM = Path(__file__).resolve().parent.parent / "client-llm.py"
+
+def _run(coroutine):
+    return asyncio.run(coroutine)
+
+def _tool_call(call_id, name, **arguments):
+    return ChatCompletionsToolCall(id=call_id, function=FunctionCall(name=name, arguments=json.dumps(arguments)))
+
+@pytest.fixture
+def client_llm():
+    spec = importlib.util.spec_from_file_location("client_llm", CLIENT_LLM)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+class FakeSession:
+    """Answers ``add`` after a delay taken from its arguments; ``fail`` raises, ``refuse`` is a tool error."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def call_tool(self, name, arguments=None):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(arguments.get("delay", 0))
+            if name == "fail":
+                raise RuntimeError("server went away")
+            if name == "refuse":
+                return types.CallToolResult(content=[types.TextContent(type="text", text="not allowed")], isError=True)
+            return types.CallToolResult(content=[types.TextContent(type="text", text=str(arguments["a"] + arguments["b"]))])
+        finally:
+            self.in_flight -= 1
+
+class FakeLLM:
+    """Replays scripted responses and records the messages of every request."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    async def complete(self, messages, **kwargs):
+        self.requests.append(list(messages))
+        message = self.responses.pop(0)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+class TestCallTools:
+    """Test cases for running the tool calls of one LLM response."""
+
+    def test_results_in_call_order(self, client_llm):
+        session = FakeSession()
+        # The first call finishes last
+        calls = [_tool_call(f"call-{i}", "add", a=i, b=1, delay=0.05 * (3 - i)) for i in range(4)]
+
+        messages = _run(client_llm.call_tools(session, calls))
+
+        assert [message.tool_call_id for message in messages] == ["call-0", "call-1", "call-2", "call-3"]
+        assert [message.content for message in messages] == ["1", "2", "3", "4"]
+        assert session.max_in_flight == 4
+
+    def test_limits_calls_in_flight(self, client_llm):
+        session = FakeSession()
+        client_llm.MAX_CONCURRENT_TOOLS = 2
+        calls = [_tool_call(f"call-{i}", "add", a=i, b=0, delay=0.01) for i in range(6)]
+
+        _run(client_llm.call_tools(session, calls))
+
+        assert session.max_in_flight == 2
+
+    def test_failed_call_does_not_cancel_others(self, client_llm):
+        session = FakeSession()
+        calls = [
+            _tool_call("slow", "add", a=1, b=2, delay=0.05),
+            _tool_call("broken", "fail"),
+            _tool_call("denied", "refuse"),
+            _tool_call("fast", "add", a=2, b=2),
+        ]
+
+        messages = _run(client_llm.call_tools(session, calls))
+
+        assert [message.content for message in messages] == [
+            "3", "Error: server went away", "Error: not allowed", "4"
+        ]
+
+class TestRunAgent:
+    """Test cases for the multi-turn tool loop."""
+
+    def test_feeds_tool_results_back(self, client_llm):
+        calls = [_tool_call("first", "add", a=2, b=20, delay=0.02), _tool_call("second", "add", a=1, b=1)]
+        llm = FakeLLM(
+            SimpleNamespace(content=None, tool_calls=calls),
+            SimpleNamespace(content="22 and 2", tool_calls=None),
+        )
+        client_llm._llm_client = llm
+
+        answer = _run(client_llm.run_agent(FakeSession(), "Add 2 to 20 and 1 to 1", functions=[]))
+
+        assert answer == "22 and 2"
+        tool_messages = [message for message in llm.requests[1] if isinstance(message, ToolMessage)]
+        assert [(message.tool_call_id, message.content) for message in tool_messages] == [("first", "22"), ("second", "2")]
+
+    def test_stops_after_max_turns(self, client_llm):
+        llm = FakeLLM(*(SimpleNamespace(content=None, tool_calls=[_tool_call(f"call-{i}", "add", a=i, b=0)]) for i in range(2)))
+        client_llm._llm_client = llm
+
+        answer = _run(client_llm.run_agent(FakeSession(), "Keep adding", functions=[], max_turns=2))
+
+        assert answer == "Stopped after reaching the maximum number of turns."
+        assert len(llm.requests) == 2
@@ -0,0 +1,95 @@
+import asyncio
+import os
+import signal
+import sys
+from pathlib import Path
+
+from mcp import StdioServerParameters
+
+from session_pool import ServerSession
+
+STUB_SERVER = Path(__file__).resolve().parent / "stub_server.py"
+
+def _run(coroutine):
+    return asyncio.run(coroutine)
+
+def _session(**options):
+    return ServerSession("stub", StdioServerParameters(command=sys.executable, args=[str(STUB_SERVER), "stub"]), **options)
+
+def _text(result):
+    return result.content[0].text
+
+async def _wait_until(condition, timeout=10.0):
+    for _ in range(int(timeout / 0.01)):
+        if condition():
+            return True
+        await asyncio.sleep(0.01)
+    return False
+
+class TestServerSession:
+    """Test cases for a warm session to a stdio stub server."""
+
+    def test_reconnects_after_the_server_is_killed(self):
+        async def scenario():
+            async with _session() as session:
+                pid = int(_text(await session.call_tool("pid")))
+                os.kill(pid, signal.SIGKILL)
+                await asyncio.sleep(0.2)
+
+                # Nothing noticed the exit yet: this call finds the closed connection
+                result = await session.call_tool("add", {"a": 1, "b": 2})
+                return pid, result, int(_text(await session.call_tool("pid"))), session.restarts, session.healthy
+
+        old_pid, result, new_pid, restarts, healthy = _run(scenario())
+
+        assert _text(result) == "3"
+        assert new_pid != old_pid
+        assert (restarts, healthy) == (1, True)
+
+    def test_failed_ping_restarts_the_session(self):
+        async def scenario():
+            async with _session(ping_interval=0.1, ping_timeout=0.2) as session:
+                pid = int(_text(await session.call_tool("pid")))
+                # Blocks the server's event loop, so pings go unanswered
+                frozen = asyncio.ensure_future(session.call_tool("freeze", {"seconds": 1}))
+
+                went_down = await _wait_until(lambda: not session.healthy)
+                last_error = session.last_error
+                came_back = await _wait_until(lambda: session.healthy)
+                frozen_result = (await asyncio.gather(frozen, return_exceptions=True))[0]
+                return (
+                    went_down, came_back, last_error, frozen_result,
+                    pid, int(_text(await session.call_tool("pid"))), session.restarts
+                )
+
+        went_down, came_back, last_error, frozen_result, old_pid, new_pid, restarts = _run(scenario())
+
+        assert went_down and came_back
+        assert isinstance(last_error, asyncio.TimeoutError)
+        # In flight on the old session: failed, not retried
+        assert isinstance(frozen_result, Exception)
+        assert new_pid != old_pid
+        assert restarts == 1
+
+    def test_max_concurrency_limits_calls_in_flight(self):
+        async def scenario():
+            async with _session(max_concurrency=2) as session:
+                client = await session.session()
+                call_tool = client.call_tool
+                in_flight = []
+
+                async def counted_call_tool(*args, **kwargs):
+                    in_flight.append(in_flight[-1] + 1 if in_flight else 1)
+                    try:
+                        return await call_tool(*args, **kwargs)
+                    finally:
+                        in_flight.append(in_flight[-1] - 1)
+
+                client.call_tool = counted_call_tool
+                results = await asyncio.gather(*(session.call_tool("sleep", {"seconds": 0.1}) for _ in range(6)))
+                return results, max(in_flight)
+
+        results, max_in_flight = _run(scenario())
+
+        assert [_text(result) for result in results] == ["done"] * 6
+        assert max_in_flight == 2
@@ -0,0 +1,143 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+from mcp import StdioServerParameters
+
+from tool_router import ToolRouter
+
+STUB_SERVER = Path(__file__).resolve().parent / "stub_server.py"
+
+def _run(coroutine):
+    return asyncio.run(coroutine)
+
+def _stub(name, *flags):
+    return StdioServerParameters(command=sys.executable, args=[str(STUB_SERVER), name, *flags])
+
+def _text(result):
+    return result.content[0].text
+
+def _router(*servers):
+    router = ToolRouter()
+    for name, *flags in servers:
+        router.add_server(name, _stub(name, *flags))
+    return router
+
+class TestToolRouter:
+    """Test cases for one tool catalog over several stdio stub servers."""
+
+    def test_namespaces_shared_tool_names(self):
+        async def scenario():
+            async with _router(("alpha",), ("beta",)) as router:
+                names = [tool.name for tool in await router.list_tools()]
+                return (
+                    names,
+                    _text(await router.call_tool("alpha__whoami")),
+                    _text(await router.call_tool("beta__whoami")),
+                    _text(await router.call_tool("beta__add", {"a": 2, "b": 3}))
+                )
+
+        names, alpha, beta, total = _run(scenario())
+
+        assert {"alpha__add", "beta__add", "alpha__whoami", "beta__whoami"} <= set(names)
+        assert len(names) == len(set(names))
+        assert (alpha, beta, total) == ("alpha", "beta", "5")
+
+    def test_route(self):
+        router = _router(("alpha",), ("beta",))
+
+        assert router.route("alpha__add") == ("alpha", "add")
+        # Only the first separator splits, so tool names may contain it
+        assert router.route("beta__add__v2") == ("beta", "add__v2")
+
+        for name in ("gamma__add", "add", "alpha-add"):
+            with pytest.raises(ValueError, match="Unknown tool"):
+                router.route(name)
+
+        with pytest.raises(ValueError):
+            router.add_server("bad__name", _stub("bad"))
+
+    def test_list_changed_triggers_a_relist(self):
+        async def scenario():
+            async with _router(("alpha",), ("beta",)) as router:
+                listed = []
+                for name in ("alpha", "beta"):
+                    session = router.manager[name]
+
+                    async def list_tools(cursor=None, name=name, list_tools=session.list_tools):
+                        listed.append(name)
+                        return await list_tools(cursor=cursor)
+
+                    session.list_tools = list_tools
+
+                # Nothing changed: the cached catalog is served without asking the servers
+                before = [tool.name for tool in await router.list_tools()]
+                unchanged = list(listed)
+
+                assert _text(await router.call_tool("alpha__grow")) == "grown"
+                for _ in range(50):
+                    after = [tool.name for tool in await router.list_tools()]
+                    if "alpha__multiply" in after:
+                        break
+                    await asyncio.sleep(0.05)
+                return before, unchanged, after, listed, _text(await router.call_tool("alpha__multiply", {"a": 3, "b": 4}))
+
+        before, unchanged, after, listed, product = _run(scenario())
+
+        assert unchanged == []
+        assert "alpha__multiply" not in before
+        assert "alpha__multiply" in after and "beta__multiply" not in after
+        # Only the server that sent tools/list_changed is listed again
+        assert set(listed) == {"alpha"}
+        assert product == "12"
+
+    def test_server_that_cannot_list_is_dropped(self):
+        async def scenario():
+            async with _router(("alpha",), ("broken", "--broken-list")) as router:
+                first = [tool.name for tool in await router.list_tools()]
+                second = [tool.name for tool in await router.list_tools()]
+                return first, second, router.stats()["broken"]
+
+        first, second, broken = _run(scenario())
+
+        assert first and all(name.startswith("alpha__") for name in first)
+        assert second == first
+        # Still connected: only its tools are missing, and are asked for again each time
+        assert broken["healthy"]
+
+    def test_call_tools_returns_each_failure(self):
+        async def scenario():
+            async with _router(("alpha",), ("beta",)) as router:
+                return await router.call_tools([
+                    ("alpha__sleep", {"seconds": 0.3}),
+                    ("gamma__add", {"a": 1, "b": 1}),
+                    ("alpha__fail", {}),
+                    ("beta__add", {"a": 1, "b": 2})
+                ])
+
+        slow, unknown, failed, added = _run(scenario())
+
+        # The unknown tool raised without cancelling the slower call
+        assert not slow.isError and _text(slow) == "done"
+        assert isinstance(unknown, ValueError)
+        assert failed.isError and "tool failed" in _text(failed)
+        assert _text(added) == "3"
+
+    def test_stats_count_errors(self):
+        async def scenario():
+            async with _router(("alpha",), ("beta",)) as router:
+                await router.call_tools([
+                    ("alpha__add", {"a": 1, "b": 1}),
+                    ("alpha__fail", {}),
+                    ("alpha__add", {"a": "not a number", "b": 1}),
+                    ("beta__add", {"a": 1, "b": 2})
+                ])
+                return router.stats()
+
+        stats = _run(scenario())
+
+        assert (stats["alpha"]["calls"], stats["alpha"]["errors"]) == (3, 2)
+        assert (stats["beta"]["calls"], stats["beta"]["errors"]) == (1, 0)
+        assert stats["alpha"]["p50_ms"] is not None and stats["alpha"]["max_ms"] >= stats["alpha"]["p50_ms"]
+        assert stats["alpha"]["healthy"] and stats["alpha"]["restarts"] == 0
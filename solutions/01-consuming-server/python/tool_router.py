@@ -0,0 +1,186 @@
+import asyncio
+import logging
+import time
+from collections import deque
+
+from mcp import StdioServerParameters, types
+
+from session_pool import SessionManager
+
+logger = logging.getLogger(__name__)
+
+class LatencyStats:
+    """Call count, errors and latency percentiles over the most recent calls."""
+
+    def __init__(self, window=1000):
+        self.calls = 0
+        self.errors = 0
+        self._recent = deque(maxlen=window)
+
+    def record(self, seconds, error=False):
+        self.calls += 1
+        self.errors += int(error)
+        self._recent.append(seconds)
+
+    def summary(self):
+        ms = sorted(value * 1000 for value in self._recent)
+
+        def percentile(p):
+            return round(ms[min(len(ms) - 1, int(len(ms) * p / 100))], 2) if ms else None
+
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "p50_ms": percentile(50),
+            "p95_ms": percentile(95),
+            "max_ms": round(ms[-1], 2) if ms else None
+        }
+
+class ToolRouter:
+    """One tool catalog over several MCP servers.
+
+    Tools are exposed as ``<server><separator><tool>`` (``math__add``), so
+    servers with overlapping tool names can sit side by side, and each
+    ``call_tool`` goes to the server its name starts with. Servers connect
+    concurrently and stay warm (``session_pool.ServerSession``); each one
+    allows ``max_concurrency`` calls in flight, so calls to different
+    servers run in parallel while a slow server only queues its own.
+
+    A server's tools are listed once and again only after it sends
+    notifications/tools/list_changed or reconnects.
+    """
+
+    def __init__(self, separator="__", **options):
+        self.separator = separator
+        self.manager = SessionManager(**options)
+        self._tools = {}
+        self._stale = {}
+        self._stats = {}
+
+    def add_server(self, name, server, max_concurrency=8, **options):
+        if self.separator in name:
+            raise ValueError(f"Server name {name!r} must not contain {self.separator!r}")
+        self._stale[name] = True
+        self._stats[name] = LatencyStats()
+
+        async def message_handler(message):
+            if isinstance(message, types.ServerNotification) and isinstance(message.root, types.ToolListChangedNotification):
+                self._stale[name] = True
+
+        async def on_connect(session):
+            self._stale[name] = True
+
+        return self.manager.add(
+            name, server, max_concurrency=max_concurrency,
+            message_handler=message_handler, on_connect=on_connect, **options
+        )
+
+    async def start(self):
+        """Connect to every server and list their tools, all concurrently."""
+        await self.manager.start()
+        await self.list_tools()
+
+    async def close(self):
+        await self.manager.close()
+
+    async def __aenter__(self):
+        try:
+            await self.start()
+        except BaseException:
+            await self.close()
+            raise
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _list_server_tools(self, name):
+        session = self.manager[name]
+        # Cleared first: a notification that arrives while listing marks it stale again
+        self._stale[name] = False
+        tools = []
+        cursor = None
+        try:
+            while True:
+                result = await session.list_tools(cursor=cursor)
+                tools.extend(result.tools)
+                cursor = result.nextCursor
+                if not cursor:
+                    break
+        except BaseException:
+            self._stale[name] = True
+            raise
+        self._tools[name] = {tool.name: tool for tool in tools}
+
+    async def list_tools(self):
+        """Every server's tools under their namespaced names, re-listing only servers that changed.
+
+        A server whose tools cannot be listed is left out (and listed again
+        next time), so one unavailable server does not hide the others.
+        """
+        stale = [name for name, is_stale in self._stale.items() if is_stale]
+        results = await asyncio.gather(*(self._list_server_tools(name) for name in stale), return_exceptions=True)
+        for name, result in zip(stale, results):
+            if isinstance(result, Exception):
+                logger.warning("MCP server %s: could not list tools: %r", name, result)
+                self._tools.pop(name, None)
+            elif isinstance(result, BaseException):
+                raise result
+        return [
+            tool.model_copy(update={"name": f"{server}{self.separator}{tool.name}"})
+            for server, tools in self._tools.items()
+            for tool in tools.values()
+        ]
+
+    def route(self, name):
+        """Split a namespaced tool name into ``(server, tool)``."""
+        server, separator, tool = name.partition(self.separator)
+        if not separator or server not in self._stats:
+            raise ValueError(f"Unknown tool {name!r}: expected <server>{self.separator}<tool>, servers: {', '.join(self._stats)}")
+        return server, tool
+
+    async def call_tool(self, name, arguments=None):
+        server, tool = self.route(name)
+        start = time.perf_counter()
+        error = True
+        try:
+            result = await self.manager.call_tool(server, tool, arguments)
+            error = result.isError
+            return result
+        finally:
+            self._stats[server].record(time.perf_counter() - start, error)
+
+    async def call_tools(self, calls):
+        """Run ``(name, arguments)`` calls concurrently; a failed call returns its exception."""
+        return await asyncio.gather(*(self.call_tool(name, arguments) for name, arguments in calls), return_exceptions=True)
+
+    def stats(self):
+        """Latency and error counts per server, with each server's connection health."""
+        health = self.manager.health()
+        return {name: {**stats.summary(), **health[name]} for name, stats in self._stats.items()}
+
+async def main():
+    import os
+
+    router = ToolRouter()
+    router.add_server("math", StdioServerParameters(command="mcp", args=["run", "server.py"]))
+    # e.g. the products server: MCP_TRANSPORT=sse python solutions/flask-products/mcp/server.py
+    if os.environ.get("PRODUCTS_MCP_URL"):
+        router.add_server("products", os.environ["PRODUCTS_MCP_URL"], max_concurrency=4)
+
+    async with router:
+        print("LISTING TOOLS")
+        for tool in await router.list_tools():
+            print("Tool: ", tool.name)
+
+        calls = [("math__add", {"a": i, "b": 1}) for i in range(5)]
+        if "products" in router.manager.sessions:
+            calls.append(("products__get_categories", {}))
+
+        for (name, _), result in zip(calls, await router.call_tools(calls)):
+            print(name, "->", result if isinstance(result, Exception) else result.content)
+
+        print("STATS: ", router.stats())
+
+if __name__ == "__main__":
+    asyncio.run(main())
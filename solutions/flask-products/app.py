@@ -5,6 +5,10 @@ from flask_migrate import Migrate
 from models.product import db
 from routes.products import products_bp
 from utils.responses import error_response
+from utils.search import product_search, include_in_migrations
+from utils.cache import response_cache
+from utils.database import database_tuning
+from utils.counts import CountCache
 from marshmallow import ValidationError
 from config import config
 
@@ -20,7 +24,11 @@ def create_app(config_name=None):
     
     # Initialize extensions
     db.init_app(app)
-    migrate.init_app(app, db)
+    database_tuning.init_app(app)
+    migrate.init_app(app, db, include_object=include_in_migrations)
+    product_search.init_app(app)
+    response_cache.init_app(app)
+    app.extensions['count_cache'] = CountCache.from_config(app.config)
     CORS(app, origins=app.config['CORS_ORIGINS'])
     
     # Register blueprints
@@ -54,6 +62,11 @@ def create_app(config_name=None):
     def health_check():
         return {'status': 'healthy', 'message': 'Flask Product API is running'}, 200
     
+    # Response cache statistics
+    @app.route('/api/cache/stats')
+    def cache_stats():
+        return {'status': 'success', 'data': response_cache.stats()}, 200
+    
     # API info endpoint
     @app.route('/api')
     def api_info():
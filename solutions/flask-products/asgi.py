@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Flask Products API - ASGI variant
+
+Serves the product read and CRUD endpoints with async handlers on an async
+SQLAlchemy engine, so a slow query waits on the event loop instead of
+holding a worker thread. Bulk, import and export endpoints stay on the
+Flask app (app.py / run.py).
+
+    uvicorn asgi:create_asgi_app --factory --port 8000
+"""
+
+import os
+from contextlib import asynccontextmanager
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.routing import Mount, Route
+from config import config
+from models.product import db
+from routes.async_products import routes as product_routes, EnvelopeResponse, error_response
+from services.async_products import create_engine_for, create_session_factory
+from utils.cache import create_cache_backend
+from utils.counts import CountCache
+from utils.database import apply_sqlite_pragmas
+from utils.search import get_search_backend
+
+# Flask-SQLAlchemy resolves relative SQLite paths here; use the same database file
+INSTANCE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance')
+
+def create_asgi_app(config_name=None, routes=()):
+    """Create the ASGI application.
+
+    ``routes`` are appended after the API, which is how the MCP SSE app is
+    mounted next to it (see ``ProductMCPServer.sse_app``); the app's own
+    lifespan still runs, creating tables on startup and closing pooled
+    connections on shutdown.
+    """
+    config_name = config_name or os.environ.get('FLASK_ENV', 'default')
+    settings = config[config_name]
+    engine = create_engine_for(
+        settings.SQLALCHEMY_DATABASE_URI, INSTANCE_PATH, echo=settings.SQLALCHEMY_ECHO,
+        **getattr(settings, 'SQLALCHEMY_ENGINE_OPTIONS', {})
+    )
+    if engine.dialect.name == 'sqlite' and settings.SQLITE_TUNING:
+        apply_sqlite_pragmas(engine.sync_engine, settings.SQLITE_PRAGMAS)
+
+    @asynccontextmanager
+    async def lifespan(app):
+        async with engine.begin() as connection:
+            await connection.run_sync(db.metadata.create_all)
+        yield
+        await engine.dispose()
+
+    async def health_check(request):
+        return EnvelopeResponse({'status': 'healthy', 'message': 'Flask Product API is running'})
+
+    async def api_info(request):
+        return EnvelopeResponse({
+            'name': 'Flask Product Management API',
+            'version': '1.0.0',
+            'description': 'RESTful API for managing products with MCP integration',
+            'endpoints': {
+                'products': '/api/products',
+                'health': '/health'
+            }
+        })
+
+    async def handle_not_found(request, exc):
+        return error_response(message="Endpoint not found", status_code=404)
+
+    async def handle_internal_error(request, exc):
+        return error_response(message="Internal server error", status_code=500)
+
+    app = Starlette(
+        routes=[
+            Route('/health', health_check),
+            Route('/api', api_info),
+            Mount('/api', routes=product_routes),
+            *routes
+        ],
+        middleware=[
+            Middleware(
+                CORSMiddleware,
+                allow_origins=[origin.strip() for origin in settings.CORS_ORIGINS.split(',')],
+                allow_methods=['*'],
+                allow_headers=['*']
+            )
+        ],
+        exception_handlers={404: handle_not_found, 500: handle_internal_error},
+        lifespan=lifespan
+    )
+
+    app.state.config = settings
+    app.state.engine = engine
+    app.state.sessions = create_session_factory(engine)
+    app.state.search = get_search_backend(engine.dialect.name, settings.SEARCH_BACKEND)
+    app.state.count_cache = CountCache(settings.COUNT_ESTIMATE_TTL, settings.COUNT_ESTIMATE_MAX_ENTRIES)
+    # Nothing is cached here, but writes invalidate the Flask app's responses
+    # (only reaches other processes with CACHE_BACKEND=redis)
+    app.state.response_cache = create_cache_backend(
+        settings.CACHE_BACKEND, settings.CACHE_MAX_ENTRIES, settings.CACHE_REDIS_URL
+    )
+    return app
+
+if __name__ == '__main__':
+    import uvicorn
+
+    port = int(os.environ.get('PORT', 8000))
+    host = os.environ.get('HOST', '0.0.0.0')
+    uvicorn.run(create_asgi_app(), host=host, port=port)
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+WSGI vs ASGI Load Test
+
+Serves the same populated database with the Flask app (threaded Werkzeug
+server, as ``run.py`` does) and with the ASGI variant (``asgi.py`` on
+uvicorn), each in its own process, then drives both with the same mix of
+list / search / get requests from many concurrent keep-alive connections
+and reports throughput and latency percentiles.
+
+The Flask response cache is turned off (CACHE_BACKEND=null) so both servers
+do the database work for every request.
+
+Usage:
+    python -m benchmarks.bench_asgi --requests 3000 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def serve(kind, port):
+    """Run one server in this process until it is killed."""
+    import logging
+
+    if kind == 'wsgi':
+        from werkzeug.serving import make_server
+        from app import create_app
+
+        logging.getLogger('werkzeug').setLevel(logging.WARNING)
+        make_server('127.0.0.1', port, create_app('production'), threaded=True).serve_forever()
+    else:
+        import uvicorn
+        from asgi import create_asgi_app
+
+        uvicorn.run(create_asgi_app('production'), host='127.0.0.1', port=port, log_level='warning')
+
+def start_server(kind):
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'benchmarks.bench_asgi', '--serve', kind, '--port', str(port)],
+        cwd=ROOT
+    )
+    base_url = f'http://127.0.0.1:{port}'
+
+    import httpx
+    for _ in range(100):
+        try:
+            httpx.get(f'{base_url}/health', timeout=1)
+            return process, base_url
+        except httpx.TransportError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f'{kind} server did not start')
+
+def request_mix(count, rows):
+    """A repeatable mix of list, search and get requests."""
+    terms = ['laptop', 'wireless', 'desk', 'ergonomic chair']
+    for i in range(count):
+        kind = i % 3
+        if kind == 0:
+            yield f'/api/products/{1 + (i * 7919) % rows}', {}
+        elif kind == 1:
+            yield '/api/products', {'page': 1 + i % 50, 'per_page': 20}
+        else:
+            yield '/api/products/search', {'q': terms[i % len(terms)], 'page': 1 + i % 5}
+
+async def load(base_url, requests, concurrency):
+    """Send ``requests`` from ``concurrency`` keep-alive connections; return latencies in ms."""
+    import httpx
+
+    latencies = []
+    pending = iter(requests)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        async def worker():
+            for path, params in pending:
+                start = time.perf_counter()
+                response = await client.get(path, params=params)
+                response.raise_for_status()
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    return latencies
+
+def report(label, latencies, elapsed):
+    latencies.sort()
+    percentile = lambda p: latencies[min(len(latencies) - 1, int(len(latencies) * p))]
+    print(f"{label:<6} {len(latencies) / elapsed:8.0f} req/s   "
+          f"p50 {statistics.median(latencies):6.1f} ms   p95 {percentile(0.95):6.1f} ms   "
+          f"p99 {percentile(0.99):6.1f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=3000)
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--serve', choices=['wsgi', 'asgi'], help=argparse.SUPPRESS)
+    parser.add_argument('--port', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.port)
+        return
+
+    workdir = tempfile.mkdtemp(prefix='bench-asgi-')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ['CACHE_BACKEND'] = 'null'
+
+    from benchmarks.bench_search import populate
+    from app import create_app
+    populate(create_app('production'), args.rows)
+
+    requests = list(request_mix(args.requests, args.rows))
+    print(f"{args.requests} requests, concurrency {args.concurrency}, {args.rows} rows")
+
+    for kind in ('wsgi', 'asgi'):
+        process, base_url = start_server(kind)
+        try:
+            asyncio.run(load(base_url, requests[:100], args.concurrency))  # warm-up
+            start = time.perf_counter()
+            latencies = asyncio.run(load(base_url, requests, args.concurrency))
+            report(kind, latencies, time.perf_counter() - start)
+        finally:
+            process.kill()
+            process.wait()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Import Benchmark
+
+Streams a generated NDJSON feed into POST /api/products/import against a
+SQLite file database and reports throughput and peak memory growth.
+
+Usage:
+    python -m benchmarks.bench_import --rows 1000000
+"""
+
+import argparse
+import json
+import os
+import resource
+import tempfile
+import time
+
+from benchmarks.bench_search import generate_rows
+
+def write_feed(path, rows):
+    """Write a feed of generated products to an NDJSON file."""
+    with open(path, 'w', encoding='utf-8') as feed:
+        for row in generate_rows(rows):
+            feed.write(json.dumps(row))
+            feed.write('\n')
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (Linux reports KB)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--batch-size', type=int, default=1000)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench-import-')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+
+    from app import create_app
+    from models.product import db
+
+    app = create_app('production')
+    app.config['IMPORT_BATCH_SIZE'] = args.batch_size
+    with app.app_context():
+        db.create_all()
+
+    feed_path = os.path.join(workdir, 'feed.ndjson')
+    write_feed(feed_path, args.rows)
+    feed_size = os.path.getsize(feed_path)
+
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    with open(feed_path, 'rb') as feed:
+        response = app.test_client().post(
+            '/api/products/import',
+            input_stream=feed,
+            content_type='application/x-ndjson',
+            headers={'Content-Length': str(feed_size)}
+        )
+    elapsed = time.perf_counter() - start
+
+    summary = response.get_json()['data']['summary']
+    print(f"feed:        {args.rows} rows, {feed_size / 1e6:.1f} MB")
+    print(f"result:      {summary}")
+    print(f"elapsed:     {elapsed:.1f}s ({args.rows / elapsed:,.0f} rows/s)")
+    print(f"peak memory: {peak_rss_mb():.1f} MB (baseline before import {baseline:.1f} MB)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+MCP Tool Throughput Benchmark
+
+Starts the Flask API on a local port, then drives ProductMCPServer tools
+(get_product / list_products / search_products) against it and reports
+tool calls per second for:
+
+  - a fresh HTTP connection per call (what a bare ``requests.get`` does)
+  - the pooled keep-alive client, one call at a time
+  - the pooled client with concurrent calls
+  - direct mode (in-process queries on a thread pool), sequential and concurrent
+
+Run it as a script (not with -m) so the MCP SDK's ``mcp`` package is not
+shadowed by this project's ``mcp/`` directory:
+
+Usage:
+    python benchmarks/bench_mcp_tools.py --calls 500 --concurrency 10
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, 'mcp'))
+
+def start_api(rows):
+    """Serve a populated production app on a free local port."""
+    from werkzeug.serving import make_server
+    from benchmarks.bench_search import populate
+    from app import create_app
+
+    app = create_app('production')
+    populate(app, rows)
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return app, server, f'http://127.0.0.1:{server.server_port}/api'
+
+def tool_calls(count, rows):
+    """A repeatable mix of read tool calls."""
+    terms = ['laptop', 'wireless', 'desk', 'ergonomic chair']
+    for i in range(count):
+        kind = i % 3
+        if kind == 0:
+            yield 'get_product', {'product_id': 1 + (i * 7919) % rows}
+        elif kind == 1:
+            yield 'list_products', {'page': 1 + i % 50, 'per_page': 20}
+        else:
+            yield 'search_products', {'query': terms[i % len(terms)], 'page': 1 + i % 5}
+
+async def run_unpooled(base_url, calls):
+    """One new connection per call, closed afterwards."""
+    import httpx
+
+    paths = {
+        'get_product': lambda args: (f"/products/{args['product_id']}", {}),
+        'list_products': lambda args: ('/products', args),
+        'search_products': lambda args: ('/products/search', {'q': args['query'], 'page': args['page']})
+    }
+    for name, args in calls:
+        path, params = paths[name](args)
+        async with httpx.AsyncClient(base_url=base_url, timeout=10) as client:
+            (await client.get(path, params=params)).json()
+
+async def run_pooled(server, calls, concurrency):
+    """Call the MCP tools through the server's shared data client."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def call(name, args):
+        async with semaphore:
+            await server.mcp.call_tool(name, args)
+
+    await asyncio.gather(*(call(name, args) for name, args in calls))
+    await server.api.aclose()
+
+def measure(label, calls, coroutine):
+    start = time.perf_counter()
+    asyncio.run(coroutine)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<36} {calls / elapsed:8.0f} calls/s ({elapsed:.2f}s)")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--calls', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=10)
+    parser.add_argument('--rows', type=int, default=10000)
+    args = parser.parse_args()
+
+    # Per-request log lines from the client and the dev server would dominate the timings
+    for name in ('httpx', 'werkzeug', 'mcp'):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    workdir = tempfile.mkdtemp(prefix='bench-mcp-')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    app, http_server, base_url = start_api(args.rows)
+
+    from server import ProductMCPServer
+    from utils.api_client import ProductAPIClient
+    from services.direct import DirectProductClient
+
+    def new_server():
+        return ProductMCPServer(ProductAPIClient(base_url, max_concurrency=args.concurrency))
+
+    calls = list(tool_calls(args.calls, args.rows))
+
+    # Warm the response cache so every mode sees the same server-side cost
+    measure('warm-up (pooled, sequential)', len(calls), run_pooled(new_server(), calls, 1))
+
+    measure('new connection per call', len(calls), run_unpooled(base_url, calls))
+    measure('pooled keep-alive, sequential', len(calls), run_pooled(new_server(), calls, 1))
+    measure(f'pooled keep-alive, concurrency={args.concurrency}', len(calls),
+            run_pooled(new_server(), calls, args.concurrency))
+
+    measure('direct, sequential', len(calls), run_pooled(ProductMCPServer(DirectProductClient(app)), calls, 1))
+    measure(f'direct, concurrency={args.concurrency}', len(calls),
+            run_pooled(ProductMCPServer(DirectProductClient(app, max_workers=args.concurrency)), calls, args.concurrency))
+
+    http_server.shutdown()
+
+if __name__ == '__main__':
+    main()
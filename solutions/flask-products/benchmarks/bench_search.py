@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Search Benchmark
+
+Compares the ILIKE search used before with the FTS5 index on SQLite
+databases of increasing size.
+
+Usage:
+    python -m benchmarks.bench_search --sizes 10000 100000 1000000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+WORDS = [
+    'laptop', 'mouse', 'keyboard', 'monitor', 'stand', 'cable', 'charger', 'desk',
+    'chair', 'lamp', 'notebook', 'pen', 'mug', 'bottle', 'speaker', 'headset',
+    'wireless', 'ergonomic', 'portable', 'premium', 'compact', 'aluminium', 'gaming'
+]
+CATEGORIES = ['Electronics', 'Office Supplies', 'Books', 'Clothing', 'Furniture']
+TERMS = ['laptop', 'wire', 'ergonomic chair', 'zzz-no-match']
+
+def generate_rows(count, seed=42):
+    """Yield deterministic pseudo-random product rows."""
+    rng = random.Random(seed)
+    for i in range(count):
+        yield {
+            'name': ' '.join(rng.sample(WORDS, 2)).title(),
+            'description': ' '.join(rng.choices(WORDS, k=12)),
+            'price': round(rng.uniform(1, 2000), 2),
+            'category': rng.choice(CATEGORIES),
+            'stock_quantity': rng.randint(0, 500),
+            'sku': f'BENCH-{i:08d}'
+        }
+
+def populate(app, count, batch_size=10000):
+    """Fill the products table using batched executemany inserts."""
+    from sqlalchemy import insert
+    from models.product import db, Product
+
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        batch = []
+        for row in generate_rows(count):
+            batch.append(row)
+            if len(batch) == batch_size:
+                db.session.execute(insert(Product), batch)
+                batch = []
+        if batch:
+            db.session.execute(insert(Product), batch)
+        db.session.commit()
+
+def time_search(app, backend, term, per_page=20, repeat=5):
+    """Return the median latency in ms of one search page plus its count."""
+    from models.product import Product
+
+    samples = []
+    with app.app_context():
+        for _ in range(repeat):
+            start = time.perf_counter()
+            query = backend.filter(Product.query, term)
+            query.order_by(None).count()
+            query.order_by(Product.created_at.desc(), Product.id.desc()).limit(per_page).all()
+            samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', nargs='+', type=int, default=[10000, 100000, 1000000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench-search-')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+
+    from app import create_app
+    from utils.search import get_search_backend
+
+    app = create_app('production')
+    backends = [get_search_backend('sqlite', 'like'), get_search_backend('sqlite', 'fts5')]
+
+    print(f"{'rows':>10}  {'term':<16}" + ''.join(f"{backend.name + ' ms':>12}" for backend in backends))
+    for size in args.sizes:
+        populate(app, size)
+        for term in TERMS:
+            timings = [time_search(app, backend, term, repeat=args.repeat) for backend in backends]
+            print(f"{size:>10}  {term:<16}" + ''.join(f"{timing:>12.2f}" for timing in timings))
+
+if __name__ == '__main__':
+    main()
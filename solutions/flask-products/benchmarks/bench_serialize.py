@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Serialization Benchmark
+
+Compares rendering one list page with the ORM + marshmallow + jsonify path
+against the column tuples + RowSerializer + json_response path, and checks
+that both produce the same bytes.
+
+Usage:
+    python -m benchmarks.bench_serialize --per-page 100
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from benchmarks.bench_search import populate
+
+def median_ms(func, repeat):
+    """Median wall time of ``func`` in ms."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--per-page', type=int, default=100)
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench-serialize-')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+
+    from flask import jsonify
+    from app import create_app
+    from models.product import db, Product
+    from utils import serializers
+    from utils.serializers import product_columns, product_row_serializer, json_response
+    from utils.validators import ProductSchema
+
+    app = create_app('production')
+    populate(app, args.rows)
+    schema = ProductSchema(many=True)
+
+    def envelope(items):
+        return {'status': 'success', 'message': 'Success', 'data': {'items': items}}
+
+    def schema_path():
+        products = Product.query.order_by(Product.created_at.desc(), Product.id.desc()).limit(args.per_page).all()
+        return jsonify(envelope(schema.dump(products))).get_data()
+
+    def fast_path():
+        rows = (
+            db.session.query(*product_columns())
+            .order_by(Product.created_at.desc(), Product.id.desc())
+            .limit(args.per_page)
+            .all()
+        )
+        return json_response(envelope(product_row_serializer.dump(rows))).get_data()
+
+    with app.test_request_context():
+        identical = schema_path() == fast_path()
+
+        results = {
+            'marshmallow + jsonify': median_ms(schema_path, args.repeat),
+            f"rows + {'orjson' if serializers.orjson else 'stdlib json'}": median_ms(fast_path, args.repeat)
+        }
+
+        # Encoding only, on already-loaded data
+        products = Product.query.limit(args.per_page).all()
+        rows = db.session.query(*product_columns()).limit(args.per_page).all()
+        results['dump only: marshmallow'] = median_ms(lambda: jsonify(envelope(schema.dump(products))), args.repeat)
+        results['dump only: fast path'] = median_ms(lambda: json_response(envelope(product_row_serializer.dump(rows))), args.repeat)
+
+    print(f"per_page={args.per_page}, identical output: {identical}")
+    for name, elapsed in results.items():
+        print(f"{name:<28} {elapsed:8.3f} ms")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+SQLite Concurrency Benchmark
+
+Runs reader and writer threads against the API at the same time (through
+the real views, with the response cache off) under three SQLite profiles:
+
+  - rollback journal: SQLite defaults, one connection pool
+  - WAL + pragmas: SQLITE_PRAGMAS applied on connect
+  - WAL + pragmas + read pool: read-only views on a separate read-only pool
+
+and reports reads/s, writes/s, failed requests and p95 latencies.
+
+Usage:
+    python -m benchmarks.bench_sqlite --readers 8 --writers 2 --seconds 5
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+
+from benchmarks.bench_search import populate, TERMS
+
+PROFILES = {
+    'rollback journal': {'SQLITE_TUNING': False, 'SQLALCHEMY_READ_POOL': False},
+    'WAL + pragmas': {'SQLITE_TUNING': True, 'SQLALCHEMY_READ_POOL': False},
+    'WAL + pragmas + read pool': {'SQLITE_TUNING': True, 'SQLALCHEMY_READ_POOL': True},
+}
+
+class Stats:
+    """Latencies and failures collected by the worker threads."""
+
+    def __init__(self):
+        self.latencies = []
+        self.failed = 0
+        self._lock = threading.Lock()
+
+    def record(self, ok, elapsed_ms):
+        with self._lock:
+            self.latencies.append(elapsed_ms)
+            if not ok:
+                self.failed += 1
+
+    def p95(self):
+        if not self.latencies:
+            return float('nan')
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+def read_request(rng, rows):
+    kind = rng.randrange(3)
+    if kind == 0:
+        return 'GET', f'/api/products/{rng.randint(1, rows)}', None
+    if kind == 1:
+        return 'GET', f'/api/products?page={rng.randint(1, 50)}', None
+    return 'GET', f'/api/products/search?q={rng.choice(TERMS)}', None
+
+def write_request(rng, rows):
+    return 'PUT', f'/api/products/{rng.randint(1, rows)}', {'stock_quantity': rng.randint(0, 500)}
+
+def worker(app, make_request, rows, deadline, stats, seed):
+    client = app.test_client()
+    rng = random.Random(seed)
+    while time.perf_counter() < deadline:
+        method, url, body = make_request(rng, rows)
+        start = time.perf_counter()
+        response = client.open(url, method=method, json=body)
+        stats.record(response.status_code < 400, (time.perf_counter() - start) * 1000)
+
+def run_profile(name, settings, args, workdir):
+    from app import create_app
+    from config import config, ProductionConfig
+
+    config_name = f'bench-{len(config)}'
+    config[config_name] = type('BenchConfig', (ProductionConfig,), {
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(workdir, config_name + '.db')}",
+        'CACHE_BACKEND': 'null',
+        **settings
+    })
+    app = create_app(config_name)
+    populate(app, args.rows)
+
+    reads, writes = Stats(), Stats()
+    deadline = time.perf_counter() + args.seconds
+    threads = [
+        threading.Thread(target=worker, args=(app, read_request, args.rows, deadline, reads, i))
+        for i in range(args.readers)
+    ] + [
+        threading.Thread(target=worker, args=(app, write_request, args.rows, deadline, writes, 1000 + i))
+        for i in range(args.writers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    print(f"{name:<28} {len(reads.latencies) / args.seconds:7.0f} reads/s {len(writes.latencies) / args.seconds:6.0f} writes/s "
+          f"{reads.failed + writes.failed:5d} failed   p95 read {reads.p95():6.1f} ms   p95 write {writes.p95():6.1f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--rows', type=int, default=10000)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench-sqlite-')
+    print(f"{args.readers} readers, {args.writers} writers, {args.seconds:g}s each, {args.rows} rows")
+    for name, settings in PROFILES.items():
+        run_profile(name, settings, args, workdir)
+
+if __name__ == '__main__':
+    main()
@@ -10,11 +10,77 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_ECHO = os.environ.get('SQLALCHEMY_ECHO', 'False').lower() == 'true'
     
+    # SQLite tuning (ignored for other databases): pragmas run on every new connection
+    SQLITE_TUNING = os.environ.get('SQLITE_TUNING', 'True').lower() == 'true'
+    SQLITE_PRAGMAS = {
+        'journal_mode': os.environ.get('SQLITE_JOURNAL_MODE', 'wal'),
+        'synchronous': os.environ.get('SQLITE_SYNCHRONOUS', 'normal'),
+        'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+        'cache_size': int(os.environ.get('SQLITE_CACHE_SIZE', -64000)),
+        'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000))
+    }
+    
+    # Read-only views use their own connection pool: DATABASE_READ_URL (a replica)
+    # or, for a SQLite file, the same file opened read-only
+    SQLALCHEMY_READ_POOL = os.environ.get('SQLALCHEMY_READ_POOL', 'True').lower() == 'true'
+    SQLALCHEMY_READ_DATABASE_URI = os.environ.get('DATABASE_READ_URL')
+    
     # Pagination settings
     PRODUCTS_PER_PAGE = int(os.environ.get('PRODUCTS_PER_PAGE', 20))
+    # count=estimate: seconds a counted search total is reused, and how many are kept
+    COUNT_ESTIMATE_TTL = int(os.environ.get('COUNT_ESTIMATE_TTL', 60))
+    COUNT_ESTIMATE_MAX_ENTRIES = int(os.environ.get('COUNT_ESTIMATE_MAX_ENTRIES', 1024))
+    
+    # Bulk operation settings
+    BULK_MAX_ITEMS = int(os.environ.get('BULK_MAX_ITEMS', 1000))
+    
+    # Export settings: rows fetched and serialized per streamed chunk
+    EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', 1000))
+    
+    # Import settings: rows validated and committed per transaction
+    IMPORT_BATCH_SIZE = int(os.environ.get('IMPORT_BATCH_SIZE', 1000))
+    IMPORT_MAX_ERRORS = int(os.environ.get('IMPORT_MAX_ERRORS', 100))
+    
+    # Inventory stats: stock at or below this (and above zero) counts as low
+    LOW_STOCK_THRESHOLD = int(os.environ.get('LOW_STOCK_THRESHOLD', 10))
+    
+    # Search settings: auto, fts5, postgres or like
+    SEARCH_BACKEND = os.environ.get('SEARCH_BACKEND', 'auto')
+    
+    # Response cache settings: simple (in-process LRU), redis or null
+    CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'simple')
+    CACHE_DEFAULT_TTL = int(os.environ.get('CACHE_DEFAULT_TTL', 60))
+    CACHE_MAX_ENTRIES = int(os.environ.get('CACHE_MAX_ENTRIES', 1024))
+    CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+    
+    # Products API client used by the MCP server (pooled, with retries)
+    PRODUCTS_API_URL = os.environ.get('PRODUCTS_API_URL', 'http://localhost:5000/api')
+    PRODUCTS_API_TIMEOUT = float(os.environ.get('PRODUCTS_API_TIMEOUT', 10))
+    PRODUCTS_API_MAX_CONNECTIONS = int(os.environ.get('PRODUCTS_API_MAX_CONNECTIONS', 20))
+    PRODUCTS_API_MAX_KEEPALIVE = int(os.environ.get('PRODUCTS_API_MAX_KEEPALIVE', 10))
+    PRODUCTS_API_MAX_CONCURRENCY = int(os.environ.get('PRODUCTS_API_MAX_CONCURRENCY', 10))
+    PRODUCTS_API_RETRIES = int(os.environ.get('PRODUCTS_API_RETRIES', 3))
+    PRODUCTS_API_BACKOFF = float(os.environ.get('PRODUCTS_API_BACKOFF', 0.1))
+    
+    # MCP server data access: http (through the API above) or direct (in-process queries)
+    MCP_DATA_MODE = os.environ.get('MCP_DATA_MODE', 'http')
+    MCP_DIRECT_CONFIG = os.environ.get('MCP_DIRECT_CONFIG', 'production')
+    MCP_DIRECT_WORKERS = int(os.environ.get('MCP_DIRECT_WORKERS', 8))
+    
+    # MCP transport: stdio, or sse (the async products API and MCP's SSE app in one ASGI server)
+    MCP_TRANSPORT = os.environ.get('MCP_TRANSPORT', 'stdio')
+    MCP_HOST = os.environ.get('MCP_HOST', '127.0.0.1')
+    MCP_PORT = int(os.environ.get('MCP_PORT', 8000))
     
     # CORS settings
     CORS_ORIGINS = os.environ.get('CORS_ORIGINS', '*')
+    
+    # Production server (FLASK_ENV=production python run.py): preforked gunicorn workers x threads
+    WEB_WORKERS = int(os.environ.get('WEB_WORKERS', (os.cpu_count() or 1) * 2 + 1))
+    WEB_THREADS = int(os.environ.get('WEB_THREADS', 4))
+    WEB_TIMEOUT = int(os.environ.get('WEB_TIMEOUT', 30))
+    WEB_KEEPALIVE = int(os.environ.get('WEB_KEEPALIVE', 5))
+    WEB_MAX_REQUESTS = int(os.environ.get('WEB_MAX_REQUESTS', 0))
 
 class DevelopmentConfig(Config):
     """Development configuration."""
@@ -29,6 +95,18 @@ class TestingConfig(Config):
 class ProductionConfig(Config):
     """Production configuration."""
     DEBUG = False
+    
+    # The simple cache lives in each worker process, so a write would only invalidate
+    # the worker that handled it: preforked workers share redis or cache nothing
+    CACHE_BACKEND = os.environ.get('CACHE_BACKEND') or ('null' if Config.WEB_WORKERS > 1 else 'simple')
+    
+    # Connection pool of each worker process; size it for WEB_THREADS concurrent requests
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 5)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 10)),
+        'pool_pre_ping': os.environ.get('DB_POOL_PRE_PING', 'True').lower() == 'true',
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 1800))
+    }
 
 config = {
     'development': DevelopmentConfig,
@@ -1,32 +1,46 @@
-import asyncio
-import json
 from typing import Any, Dict, List, Optional
 from mcp.server.fastmcp import FastMCP
-from decimal import Decimal
 
 # Import Flask app components (these would be imported differently in a real app)
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
+from config import Config
+from utils.api_client import ProductAPIClient, multi_search as run_multi_search
+
+def create_data_client(mode=None, config=Config):
+    """Build the client the tools use: the HTTP API or in-process queries."""
+    mode = mode or config.MCP_DATA_MODE
+    if mode == 'http':
+        return ProductAPIClient.from_config(config)
+    if mode == 'direct':
+        from services.direct import DirectProductClient
+        return DirectProductClient.from_config(config)
+    raise ValueError(f"Unknown MCP data mode {mode!r}; expected 'http' or 'direct'")
+
 class ProductMCPServer:
     """MCP Server for Flask Product Management API integration."""
     
-    def __init__(self):
-        self.mcp = FastMCP("Flask Product Management API")
+    def __init__(self, api_client=None, mode=None):
+        # host/port only matter for SSE; a localhost host keeps DNS-rebinding protection on
+        self.mcp = FastMCP("Flask Product Management API", host=Config.MCP_HOST, port=Config.MCP_PORT)
+        # One client shared by every tool call
+        self.api = api_client or create_data_client(mode)
         self.setup_tools()
     
     def setup_tools(self):
         """Set up MCP tools for product management operations."""
         
         @self.mcp.tool()
-        def list_products(
+        async def list_products(
             page: int = 1,
             per_page: int = 20,
             search: Optional[str] = None,
             category: Optional[str] = None,
             sort_by: str = "created_at",
-            order: str = "desc"
+            order: str = "desc",
+            fields: Optional[str] = None
         ) -> Dict[str, Any]:
             """
             List products with pagination, search, and filtering options.
@@ -38,46 +52,26 @@ class ProductMCPServer:
                 category: Filter by product category
                 sort_by: Sort field (name, price, created_at, updated_at)
                 order: Sort order (asc, desc)
+                fields: Comma-separated fields to return, e.g. "id,name,price" (default: all)
             
             Returns:
                 Dictionary containing products list and pagination info
             """
             try:
-                # This would call the Flask API endpoint
-                # For demo purposes, returning mock data
-                products = [
-                    {
-                        "id": 1,
-                        "name": "Laptop",
-                        "description": "High-performance laptop for developers",
-                        "price": 999.99,
-                        "category": "Electronics",
-                        "stock_quantity": 10,
-                        "sku": "LAP-001",
-                        "created_at": "2024-01-01T10:00:00",
-                        "updated_at": "2024-01-01T10:00:00"
-                    }
-                ]
-                
-                return {
-                    "status": "success",
-                    "data": {
-                        "items": products,
-                        "pagination": {
-                            "page": page,
-                            "per_page": per_page,
-                            "total": len(products),
-                            "pages": 1,
-                            "has_prev": False,
-                            "has_next": False
-                        }
-                    }
-                }
+                return await self.api.list_products({
+                    'page': page,
+                    'per_page': per_page,
+                    'q': search,
+                    'category': category,
+                    'sort_by': sort_by,
+                    'order': order,
+                    'fields': fields
+                })
             except Exception as e:
                 return {"status": "error", "message": str(e)}
         
         @self.mcp.tool()
-        def get_product(product_id: int) -> Dict[str, Any]:
+        async def get_product(product_id: int) -> Dict[str, Any]:
             """
             Get a single product by ID.
             
@@ -88,34 +82,36 @@ class ProductMCPServer:
                 Dictionary containing product details
             """
             try:
-                # Mock product data for demo
-                if product_id == 1:
-                    product = {
-                        "id": 1,
-                        "name": "Laptop",
-                        "description": "High-performance laptop for developers",
-                        "price": 999.99,
-                        "category": "Electronics",
-                        "stock_quantity": 10,
-                        "sku": "LAP-001",
-                        "created_at": "2024-01-01T10:00:00",
-                        "updated_at": "2024-01-01T10:00:00"
-                    }
-                    return {
-                        "status": "success",
-                        "data": product,
-                        "message": "Product retrieved successfully"
-                    }
-                else:
+                return await self.api.get_product(product_id)
+            except Exception as e:
+                return {"status": "error", "message": str(e)}
+        
+        @self.mcp.tool()
+        async def get_products(product_ids: List[int], fields: Optional[str] = None) -> Dict[str, Any]:
+            """
+            Get many products by ID in one call.
+            
+            Args:
+                product_ids: IDs of the products to retrieve
+                fields: Comma-separated fields to return, e.g. "id,name,price" (default: all)
+            
+            Returns:
+                Dictionary with one item per requested ID in the same order (null when
+                the product does not exist), the IDs not found and a summary
+            """
+            try:
+                if not product_ids:
                     return {
                         "status": "error",
-                        "message": "Product not found"
+                        "message": "At least one product ID is required"
                     }
+                
+                return await self.api.get_products(product_ids, fields)
             except Exception as e:
                 return {"status": "error", "message": str(e)}
         
         @self.mcp.tool()
-        def create_product(
+        async def create_product(
             name: str,
             price: float,
             category: str,
@@ -169,37 +165,28 @@ class ProductMCPServer:
                         "message": "Stock quantity must be non-negative"
                     }
                 
-                # Mock created product for demo
-                product = {
-                    "id": 999,  # Mock ID
+                return await self.api.create_product({
                     "name": name,
                     "description": description,
                     "price": price,
                     "category": category,
                     "stock_quantity": stock_quantity,
-                    "sku": sku,
-                    "created_at": "2024-01-01T10:00:00",
-                    "updated_at": "2024-01-01T10:00:00"
-                }
-                
-                return {
-                    "status": "success",
-                    "data": product,
-                    "message": "Product created successfully"
-                }
+                    "sku": sku
+                })
             
             except Exception as e:
                 return {"status": "error", "message": str(e)}
         
         @self.mcp.tool()
-        def update_product(
+        async def update_product(
             product_id: int,
             name: Optional[str] = None,
             price: Optional[float] = None,
             category: Optional[str] = None,
             sku: Optional[str] = None,
             description: Optional[str] = None,
-            stock_quantity: Optional[int] = None
+            stock_quantity: Optional[int] = None,
+            expected_version: Optional[int] = None
         ) -> Dict[str, Any]:
             """
             Update an existing product.
@@ -211,7 +198,9 @@ class ProductMCPServer:
                 category: New product category (optional)
                 sku: New SKU (optional)
                 description: New product description (optional)
-                stock_quantity: New stock quantity (optional)
+                stock_quantity: New stock quantity (optional; use adjust_stock to add or remove)
+                expected_version: The product version the change is based on; the update
+                                  is rejected if the product has changed since (optional)
             
             Returns:
                 Dictionary containing updated product details
@@ -248,36 +237,26 @@ class ProductMCPServer:
                         "message": "Stock quantity must be non-negative"
                     }
                 
-                # Mock updated product for demo
-                if product_id == 1:
-                    product = {
-                        "id": product_id,
-                        "name": name or "Laptop",
-                        "description": description or "High-performance laptop for developers",
-                        "price": price or 999.99,
-                        "category": category or "Electronics",
-                        "stock_quantity": stock_quantity if stock_quantity is not None else 10,
-                        "sku": sku or "LAP-001",
-                        "created_at": "2024-01-01T10:00:00",
-                        "updated_at": "2024-01-01T10:30:00"
-                    }
-                    
-                    return {
-                        "status": "success",
-                        "data": product,
-                        "message": "Product updated successfully"
-                    }
-                else:
-                    return {
-                        "status": "error",
-                        "message": "Product not found"
-                    }
+                changes = {
+                    "name": name,
+                    "price": price,
+                    "category": category,
+                    "sku": sku,
+                    "description": description,
+                    "stock_quantity": stock_quantity,
+                    "version": expected_version
+                }
+                
+                return await self.api.update_product(
+                    product_id,
+                    {field: value for field, value in changes.items() if value is not None}
+                )
             
             except Exception as e:
                 return {"status": "error", "message": str(e)}
         
         @self.mcp.tool()
-        def delete_product(product_id: int) -> Dict[str, Any]:
+        async def delete_product(product_id: int) -> Dict[str, Any]:
             """
             Delete a product by ID.
             
@@ -288,27 +267,72 @@ class ProductMCPServer:
                 Dictionary containing deletion status
             """
             try:
-                # Mock deletion for demo
-                if product_id == 1:
+                return await self.api.delete_product(product_id)
+            except Exception as e:
+                return {"status": "error", "message": str(e)}
+        
+        @self.mcp.tool()
+        async def adjust_stock(
+            product_id: int,
+            delta: int,
+            expected_version: Optional[int] = None
+        ) -> Dict[str, Any]:
+            """
+            Add to or remove from a product's stock in one atomic step.
+            
+            Safe to run concurrently: each adjustment applies on top of the
+            current stock, and one that would take it below zero is rejected.
+            
+            Args:
+                product_id: The ID of the product
+                delta: Units to add (positive) or remove (negative)
+                expected_version: Only adjust this version of the product (optional)
+            
+            Returns:
+                Dictionary containing the updated product details
+            """
+            try:
+                if delta == 0:
                     return {
-                        "status": "success",
-                        "message": "Product deleted successfully"
+                        "status": "error",
+                        "message": "Delta must not be zero"
                     }
-                else:
+                
+                return await self.api.adjust_stock(product_id, delta, expected_version)
+            except Exception as e:
+                return {"status": "error", "message": str(e)}
+        
+        @self.mcp.tool()
+        async def bulk_upsert_products(products: List[Dict[str, Any]]) -> Dict[str, Any]:
+            """
+            Create or update many products in a single call, matched by SKU.
+            
+            Args:
+                products: List of products, each with name, price, category, sku
+                          and optional description and stock_quantity
+            
+            Returns:
+                Dictionary with a summary plus per-item created/updated ids and errors
+            """
+            try:
+                if not products:
                     return {
                         "status": "error",
-                        "message": "Product not found"
+                        "message": "At least one product is required"
                     }
+                
+                return await self.api.upsert_products(products)
             except Exception as e:
                 return {"status": "error", "message": str(e)}
         
         @self.mcp.tool()
-        def search_products(
+        async def search_products(
             query: str,
             page: int = 1,
             per_page: int = 20,
             sort_by: str = "created_at",
-            order: str = "desc"
+            order: str = "desc",
+            fields: Optional[str] = None
         ) -> Dict[str, Any]:
             """
             Search products by name, description, or SKU.
@@ -317,8 +341,9 @@ class ProductMCPServer:
                 query: Search term
                 page: Page number (default: 1)
                 per_page: Items per page (default: 20)
-                sort_by: Sort field (name, price, created_at, updated_at)
+                sort_by: Sort field (name, price, created_at, updated_at, relevance)
                 order: Sort order (asc, desc)
+                fields: Comma-separated fields to return, e.g. "id,name,price" (default: all)
             
             Returns:
                 Dictionary containing search results and pagination info
@@ -330,45 +355,44 @@ class ProductMCPServer:
                         "message": "Search query is required"
                     }
                 
-                # Mock search results for demo
-                products = [
-                    {
-                        "id": 1,
-                        "name": "Laptop",
-                        "description": "High-performance laptop for developers",
-                        "price": 999.99,
-                        "category": "Electronics",
-                        "stock_quantity": 10,
-                        "sku": "LAP-001",
-                        "created_at": "2024-01-01T10:00:00",
-                        "updated_at": "2024-01-01T10:00:00"
-                    }
-                ] if "laptop" in query.lower() else []
-                
-                return {
-                    "status": "success",
-                    "data": {
-                        "items": products,
-                        "pagination": {
-                            "page": page,
-                            "per_page": per_page,
-                            "total": len(products),
-                            "pages": 1 if products else 0,
-                            "has_prev": False,
-                            "has_next": False
-                        }
-                    }
-                }
+                return await self.api.search_products({
+                    'q': query,
+                    'page': page,
+                    'per_page': per_page,
+                    'sort_by': sort_by,
+                    'order': order,
+                    'fields': fields
+                })
             except Exception as e:
                 return {"status": "error", "message": str(e)}
         
         @self.mcp.tool()
-        def get_products_by_category(
+        async def multi_search(queries: List[Dict[str, Any]]) -> Dict[str, Any]:
+            """
+            Run several product searches and category lookups concurrently.
+            
+            Args:
+                queries: List of queries (at most 20), each with "query" (search term)
+                         and/or "category", plus optional "page", "per_page",
+                         "sort_by", "order" and "fields"
+            
+            Returns:
+                Dictionary with one result per query in the same order, each with
+                its index, a "found" flag and the usual products list and pagination
+            """
+            try:
+                return await run_multi_search(self.api, queries)
+            except Exception as e:
+                return {"status": "error", "message": str(e)}
+        
+        @self.mcp.tool()
+        async def get_products_by_category(
             category: str,
             page: int = 1,
             per_page: int = 20,
             sort_by: str = "created_at",
-            order: str = "desc"
+            order: str = "desc",
+            fields: Optional[str] = None
         ) -> Dict[str, Any]:
             """
             Get products filtered by category.
@@ -379,77 +403,103 @@ class ProductMCPServer:
                 per_page: Items per page (default: 20)
                 sort_by: Sort field (name, price, created_at, updated_at)
                 order: Sort order (asc, desc)
+                fields: Comma-separated fields to return, e.g. "id,name,price" (default: all)
             
             Returns:
                 Dictionary containing products in the category and pagination info
             """
             try:
-                # Mock category filtering for demo
-                products = [
-                    {
-                        "id": 1,
-                        "name": "Laptop",
-                        "description": "High-performance laptop for developers",
-                        "price": 999.99,
-                        "category": "Electronics",
-                        "stock_quantity": 10,
-                        "sku": "LAP-001",
-                        "created_at": "2024-01-01T10:00:00",
-                        "updated_at": "2024-01-01T10:00:00"
-                    }
-                ] if category.lower() == "electronics" else []
-                
-                return {
-                    "status": "success",
-                    "data": {
-                        "items": products,
-                        "pagination": {
-                            "page": page,
-                            "per_page": per_page,
-                            "total": len(products),
-                            "pages": 1 if products else 0,
-                            "has_prev": False,
-                            "has_next": False
-                        }
-                    }
-                }
+                return await self.api.get_products_by_category(category, {
+                    'page': page,
+                    'per_page': per_page,
+                    'sort_by': sort_by,
+                    'order': order,
+                    'fields': fields
+                })
             except Exception as e:
                 return {"status": "error", "message": str(e)}
         
         @self.mcp.tool()
-        def get_categories() -> Dict[str, Any]:
+        async def get_categories(include_stats: bool = False) -> Dict[str, Any]:
             """
             Get all unique product categories.
             
+            Args:
+                include_stats: Also return product count, total stock and
+                               min/max price for each category
+            
             Returns:
-                Dictionary containing list of categories
+                Dictionary containing list of categories (and per-category stats)
             """
             try:
-                # Mock categories for demo
-                categories = ["Electronics", "Office Supplies", "Books", "Clothing"]
-                
-                return {
-                    "status": "success",
-                    "data": {"categories": categories},
-                    "message": "Categories retrieved successfully"
-                }
+                return await self.api.get_categories(stats=include_stats)
+            except Exception as e:
+                return {"status": "error", "message": str(e)}
+        
+        @self.mcp.tool()
+        async def get_inventory_stats(
+            category: Optional[str] = None,
+            low_stock_threshold: Optional[int] = None
+        ) -> Dict[str, Any]:
+            """
+            Get inventory statistics computed in the database.
+            
+            Args:
+                category: Limit the stats to one category (optional)
+                low_stock_threshold: Stock at or below this counts as low (optional)
+            
+            Returns:
+                Inventory value, product and stock counts, price percentiles and
+                out-of-stock / low-stock / in-stock counts, per category and overall
+            """
+            try:
+                return await self.api.get_inventory_stats({
+                    'category': category,
+                    'low_stock': low_stock_threshold
+                })
             except Exception as e:
                 return {"status": "error", "message": str(e)}
     
-    def run(self):
+    def sse_app(self, config_name=None):
+        """ASGI app serving the async products API and this server's SSE endpoints.
+        
+        Mounted like solutions/02-sse-server: the API under /api, then
+        ``mcp.sse_app()`` at the root (/sse and /messages/).
+        """
+        from starlette.routing import Mount
+        from asgi import create_asgi_app
+        
+        return create_asgi_app(config_name, routes=[Mount('/', app=self.mcp.sse_app())])
+    
+    def run(self, transport=None):
         """Run the MCP server."""
+        transport = transport or Config.MCP_TRANSPORT
         print("🚀 Starting Flask Product Management MCP Server...")
+        if isinstance(self.api, ProductAPIClient):
+            print(f"Data access: HTTP via {self.api.base_url}")
+        else:
+            print("Data access: direct (in-process)")
         print("Available tools:")
         print("- list_products: List products with pagination and filtering")
         print("- get_product: Get a single product by ID")
+        print("- get_products: Get many products by ID in one call")
         print("- create_product: Create a new product")
         print("- update_product: Update an existing product")
         print("- delete_product: Delete a product")
+        print("- adjust_stock: Atomically add to or remove from a product's stock")
+        print("- bulk_upsert_products: Create or update many products by SKU")
         print("- search_products: Search products by name, description, or SKU")
+        print("- multi_search: Run several searches / category queries concurrently")
         print("- get_products_by_category: Get products by category")
         print("- get_categories: Get all product categories")
+        print("- get_inventory_stats: Inventory value, price percentiles and stock levels")
         print()
-        self.mcp.run()
+        if transport == 'sse':
+            import uvicorn
+            print(f"Serving the products API and MCP over SSE on http://{Config.MCP_HOST}:{Config.MCP_PORT}")
+            uvicorn.run(self.sse_app(), host=Config.MCP_HOST, port=Config.MCP_PORT)
+        else:
+            self.mcp.run()
 
 if __name__ == "__main__":
     server = ProductMCPServer()
@@ -0,0 +1,20 @@
+from models.product import db
+
+class CategorySummary(db.Model):
+    """Per-category totals over ``products``, one row per category in use.
+
+    Rows are maintained by database triggers on ``products`` (see
+    utils/categories.py), so every write path - ORM, bulk Core statements,
+    the async engine - keeps them current without a scan.
+    """
+
+    __tablename__ = 'category_summary'
+
+    name = db.Column(db.String(50), primary_key=True)
+    product_count = db.Column(db.Integer, nullable=False, default=0)
+    total_stock = db.Column(db.Integer, nullable=False, default=0)
+    min_price = db.Column(db.Numeric(10, 2), nullable=True)
+    max_price = db.Column(db.Numeric(10, 2), nullable=True)
+
+    def __repr__(self):
+        return f'<CategorySummary {self.name} ({self.product_count} products)>'
@@ -1,12 +1,26 @@
 from datetime import datetime
 from flask_sqlalchemy import SQLAlchemy
+from models.session import RoutingSession
 
-db = SQLAlchemy()
+# RoutingSession sends read_only() work to the read pool (see utils/database.py)
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 class Product(db.Model):
     """Product model representing a product in the inventory."""
     
     __tablename__ = 'products'
+    __table_args__ = (
+        # Composite indexes matching the list endpoints' query shapes:
+        # optional category filter, ordered by a sort column with id as tie-breaker
+        db.Index('ix_products_created_at_id', 'created_at', 'id'),
+        db.Index('ix_products_updated_at_id', 'updated_at', 'id'),
+        db.Index('ix_products_price_id', 'price', 'id'),
+        db.Index('ix_products_name_id', 'name', 'id'),
+        db.Index('ix_products_category_created_at_id', 'category', 'created_at', 'id'),
+        db.Index('ix_products_category_updated_at_id', 'category', 'updated_at', 'id'),
+        db.Index('ix_products_category_price_id', 'category', 'price', 'id'),
+        db.Index('ix_products_category_name_id', 'category', 'name', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     name = db.Column(db.String(100), nullable=False)
@@ -17,6 +31,12 @@ class Product(db.Model):
     sku = db.Column(db.String(50), unique=True, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Optimistic concurrency: the ORM adds "AND version = <loaded>" to every
+    # UPDATE and DELETE of a product and bumps it, failing with StaleDataError
+    # when another writer got there first
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    
+    __mapper_args__ = {'version_id_col': version}
     
     def __repr__(self):
         return f'<Product {self.name} (SKU: {self.sku})>'
@@ -32,7 +52,8 @@ class Product(db.Model):
             'stock_quantity': self.stock_quantity,
             'sku': self.sku,
             'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'version': self.version
         }
     
     @classmethod
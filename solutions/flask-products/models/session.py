@@ -0,0 +1,34 @@
+from contextlib import contextmanager
+from flask import current_app, g, has_app_context
+from flask_sqlalchemy.session import Session
+
+# app.extensions key holding the engine read-only work is sent to (or None)
+READ_ENGINE_KEY = 'read_engine'
+
+@contextmanager
+def read_only():
+    """Send the session's queries to the read-only pool while the block runs.
+
+    Usable as a decorator (``@read_only()``) on views that never write.
+    Without a read pool configured it changes nothing.
+    """
+    previous = g.get('db_read_only', False)
+    g.db_read_only = True
+    try:
+        yield
+    finally:
+        g.db_read_only = previous
+
+class RoutingSession(Session):
+    """Session that reads from the read-only engine inside ``read_only()``.
+
+    Flushes always go to the primary engine, so a stray write in a
+    read-only block still lands on the writer.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and has_app_context() and g.get('db_read_only'):
+            engine = current_app.extensions.get(READ_ENGINE_KEY)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
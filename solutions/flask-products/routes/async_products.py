@@ -0,0 +1,320 @@
+import logging
+from urllib.parse import urlencode
+from marshmallow import ValidationError
+from starlette.responses import Response
+from starlette.routing import Route
+from werkzeug.http import parse_etags, quote_etag
+from services import async_products as product_service
+from services.products import DuplicateSKUError, VersionConflictError, InsufficientStockError
+from utils.conditional import product_etag, if_match_failed
+from utils.responses import success_body, error_body, pagination_info, paginated_body, add_navigation_urls, navigation_params
+from utils.serializers import compact_json, product_row_serializer
+from utils.validators import (
+    ProductSchema, ProductUpdateSchema, ProductQuerySchema, CategoryQuerySchema, StockAdjustmentSchema
+)
+
+logger = logging.getLogger(__name__)
+
+# Initialize schemas
+product_schema = ProductSchema()
+product_update_schema = ProductUpdateSchema()
+query_schema = ProductQuerySchema()
+category_query_schema = CategoryQuerySchema()
+stock_adjustment_schema = StockAdjustmentSchema()
+
+# Characters url_for leaves unescaped in query strings, so both apps build the same URLs
+_QUERY_SAFE = "!$'()*,/:;?@"
+
+class EnvelopeResponse(Response):
+    """JSON response encoded byte-for-byte like the Flask app's responses."""
+
+    media_type = 'application/json'
+
+    def render(self, content):
+        return compact_json(content)
+
+def success_response(data=None, message="Success", status_code=200):
+    return EnvelopeResponse(success_body(data, message), status_code=status_code)
+
+def error_response(message="An error occurred", errors=None, status_code=400):
+    return EnvelopeResponse(error_body(message, errors), status_code=status_code)
+
+def validation_error_response(validation_error):
+    return error_response(message="Validation error", errors=validation_error.messages, status_code=400)
+
+def not_found_response(resource="Resource"):
+    return error_response(message=f"{resource} not found", status_code=404)
+
+def _duplicate_sku_response():
+    return error_response(
+        message="Product with this SKU already exists",
+        errors={'sku': ['SKU must be unique']},
+        status_code=409
+    )
+
+def _version_conflict_response(error):
+    return error_response(
+        message="Product has been modified",
+        errors={'version': [str(error)]},
+        status_code=412
+    )
+
+def _with_product_etag(response, product):
+    """Tag a response with the product's ETag, as the Flask routes do."""
+    response.headers['ETag'] = quote_etag(product_etag(product))
+    return response
+
+async def _if_match_version(request, session, product_id):
+    """The product's version if the request's If-Match names it, ``None`` without one."""
+    if_match = parse_etags(request.headers.get('if-match'))
+    if not if_match:
+        return None
+    product = await product_service.get_product(session, product_id)
+    if product is None:
+        return None
+    if if_match_failed(if_match, product_etag(product)):
+        raise VersionConflictError(None, product.version)
+    return product.version
+
+def _sessions(request):
+    return request.app.state.sessions()
+
+def _cache(request):
+    return request.app.state.response_cache
+
+async def _json_body(request):
+    try:
+        return await request.json() or {}
+    except ValueError:
+        return {}
+
+async def _paginated_products_response(request, filters, query_params, route_name, search_term=None, path_params=None, **url_params):
+    """Paginate a filtered product statement and build the response, as the Flask routes do."""
+    async with _sessions(request) as session:
+        page, items = await product_service.paginate_products(
+            session, filters, query_params, request.app.state.search, search_term=search_term,
+            counts=request.app.state.count_cache
+        )
+
+    path = request.app.url_path_for(route_name, **(path_params or {}))
+
+    def build_url(**params):
+        params = {key: value for key, value in params.items() if value is not None}
+        return f'{path}?{urlencode(params, safe=_QUERY_SAFE)}'
+
+    info = pagination_info(
+        page.page, page.per_page, page.total, page.next_cursor, page.prev_cursor,
+        page.has_next, page.total_estimated
+    )
+    add_navigation_urls(info, build_url, **navigation_params(query_params, **url_params))
+    return EnvelopeResponse(paginated_body(items, info))
+
+async def list_products(request):
+    """List all products with pagination, search, and filtering."""
+    try:
+        query_params = query_schema.load(request.query_params)
+    except ValidationError as e:
+        return validation_error_response(e)
+
+    try:
+        return await _paginated_products_response(
+            request, query_params, query_params, 'list_products',
+            search_term=query_params.get('q')
+        )
+    except Exception as e:
+        logger.error(f"Error listing products: {e}")
+        return error_response("Failed to retrieve products", status_code=500)
+
+async def search_products(request):
+    """Search products by name, description, or SKU."""
+    search_term = request.query_params.get('q', '').strip()
+
+    if not search_term:
+        return error_response(
+            message="Search term is required",
+            errors={'q': ['Query parameter q is required']},
+            status_code=400
+        )
+
+    try:
+        query_params = query_schema.load(request.query_params)
+    except ValidationError as e:
+        return validation_error_response(e)
+
+    try:
+        return await _paginated_products_response(
+            request, {'q': search_term}, query_params, 'search_products',
+            search_term=search_term, q=search_term
+        )
+    except Exception as e:
+        logger.error(f"Error searching products: {e}")
+        return error_response("Failed to search products", status_code=500)
+
+async def get_products_by_category(request):
+    """Get products filtered by category."""
+    category = request.path_params['category']
+    try:
+        query_params = query_schema.load(request.query_params)
+    except ValidationError as e:
+        return validation_error_response(e)
+
+    try:
+        return await _paginated_products_response(
+            request, {'category': category}, query_params, 'get_products_by_category',
+            path_params={'category': category}
+        )
+    except Exception as e:
+        logger.error(f"Error retrieving products by category {category}: {e}")
+        return error_response("Failed to retrieve products by category", status_code=500)
+
+async def get_categories(request):
+    """Get all unique product categories, optionally with per-category stats."""
+    try:
+        query_params = category_query_schema.load(request.query_params)
+    except ValidationError as e:
+        return validation_error_response(e)
+
+    try:
+        async with _sessions(request) as session:
+            if query_params['stats']:
+                stats = await product_service.category_stats(session)
+                data = {'categories': [row['name'] for row in stats], 'stats': stats}
+            else:
+                data = {'categories': await product_service.list_categories(session)}
+        return success_response(data=data, message="Categories retrieved successfully")
+    except Exception as e:
+        logger.error(f"Error retrieving categories: {e}")
+        return error_response("Failed to retrieve categories", status_code=500)
+
+async def get_product(request):
+    """Get a single product by ID."""
+    product_id = request.path_params['product_id']
+    try:
+        async with _sessions(request) as session:
+            product = await product_service.get_product(session, product_id)
+
+        if not product:
+            return not_found_response("Product")
+
+        return _with_product_etag(success_response(
+            data=product_row_serializer.dump_object(product),
+            message="Product retrieved successfully"
+        ), product)
+    except Exception as e:
+        logger.error(f"Error retrieving product {product_id}: {e}")
+        return error_response("Failed to retrieve product", status_code=500)
+
+async def create_product(request):
+    """Create a new product."""
+    try:
+        product_data = product_schema.load(await _json_body(request))
+    except ValidationError as e:
+        return validation_error_response(e)
+
+    try:
+        async with _sessions(request) as session:
+            product = await product_service.create_product(session, product_data, cache=_cache(request))
+
+        return success_response(
+            data=product_row_serializer.dump_object(product),
+            message="Product created successfully",
+            status_code=201
+        )
+    except DuplicateSKUError:
+        return _duplicate_sku_response()
+    except Exception as e:
+        logger.error(f"Error creating product: {e}")
+        return error_response("Failed to create product", status_code=500)
+
+async def update_product(request):
+    """Update an existing product."""
+    product_id = request.path_params['product_id']
+    try:
+        update_data = product_update_schema.load(await _json_body(request))
+    except ValidationError as e:
+        return validation_error_response(e)
+
+    try:
+        async with _sessions(request) as session:
+            if update_data.get('version') is None:
+                update_data['version'] = await _if_match_version(request, session, product_id)
+            product = await product_service.update_product(session, product_id, update_data, cache=_cache(request))
+
+        if not product:
+            return not_found_response("Product")
+
+        return _with_product_etag(success_response(
+            data=product_row_serializer.dump_object(product),
+            message="Product updated successfully"
+        ), product)
+    except DuplicateSKUError:
+        return _duplicate_sku_response()
+    except VersionConflictError as e:
+        return _version_conflict_response(e)
+    except Exception as e:
+        logger.error(f"Error updating product {product_id}: {e}")
+        return error_response("Failed to update product", status_code=500)
+
+async def delete_product(request):
+    """Delete a product."""
+    product_id = request.path_params['product_id']
+    try:
+        async with _sessions(request) as session:
+            deleted = await product_service.delete_product(
+                session, product_id, await _if_match_version(request, session, product_id), cache=_cache(request)
+            )
+
+        if not deleted:
+            return not_found_response("Product")
+
+        return success_response(message="Product deleted successfully")
+    except VersionConflictError as e:
+        return _version_conflict_response(e)
+    except Exception as e:
+        logger.error(f"Error deleting product {product_id}: {e}")
+        return error_response("Failed to delete product", status_code=500)
+
+async def adjust_stock(request):
+    """Add to (or with a negative delta, remove from) a product's stock atomically."""
+    product_id = request.path_params['product_id']
+    try:
+        stock_data = stock_adjustment_schema.load(await _json_body(request))
+    except ValidationError as e:
+        return validation_error_response(e)
+
+    try:
+        async with _sessions(request) as session:
+            expected_version = await _if_match_version(request, session, product_id)
+            if stock_data.get('version') is not None:
+                expected_version = stock_data['version']
+            row = await product_service.adjust_stock(
+                session, product_id, stock_data['delta'], expected_version, cache=_cache(request)
+            )
+
+        if row is None:
+            return not_found_response("Product")
+
+        return _with_product_etag(success_response(
+            data=product_row_serializer.dump_row(row),
+            message="Stock adjusted successfully"
+        ), row)
+    except VersionConflictError as e:
+        return _version_conflict_response(e)
+    except InsufficientStockError as e:
+        return error_response(message="Insufficient stock", errors={'delta': [str(e)]}, status_code=409)
+    except Exception as e:
+        logger.error(f"Error adjusting stock of product {product_id}: {e}")
+        return error_response("Failed to adjust stock", status_code=500)
+
+# Same paths as the products blueprint; mounted under /api by asgi.create_asgi_app
+routes = [
+    Route('/products', list_products, methods=['GET']),
+    Route('/products', create_product, methods=['POST']),
+    Route('/products/search', search_products, methods=['GET']),
+    Route('/products/categories', get_categories, methods=['GET']),
+    Route('/products/category/{category}', get_products_by_category, methods=['GET']),
+    Route('/products/{product_id:int}', get_product, methods=['GET']),
+    Route('/products/{product_id:int}', update_product, methods=['PUT']),
+    Route('/products/{product_id:int}', delete_product, methods=['DELETE']),
+    Route('/products/{product_id:int}/stock', adjust_stock, methods=['POST']),
+]
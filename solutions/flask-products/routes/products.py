@@ -1,23 +1,111 @@
-from flask import Blueprint, request, current_app
-from sqlalchemy import or_, and_
+import csv
+import io
+from flask import Blueprint, Response, request, current_app, g, make_response, stream_with_context
 from marshmallow import ValidationError
+from sqlalchemy import func, select
+from sqlalchemy.orm.exc import StaleDataError
 from models.product import db, Product
-from utils.validators import ProductSchema, ProductUpdateSchema, ProductQuerySchema
+from models.session import read_only
+from utils.validators import (
+    ProductSchema, ProductUpdateSchema, ProductQuerySchema,
+    ProductBulkDeleteSchema, ProductExportSchema, ProductBatchQuerySchema,
+    CategoryQuerySchema, InventoryStatsQuerySchema, StockAdjustmentSchema
+)
+from utils.cache import response_cache
+from utils.counts import summary_total_statement
+from utils.conditional import conditional, product_etag, if_match_failed
+from utils.serializers import PRODUCT_FIELDS, product_row_serializer
+from services import products as product_service
+from services.stats import inventory_stats
+from services.products import (
+    CATALOG_TAG, CATEGORIES_TAG, CATEGORY_STATS_TAG, product_tag, category_tag,
+    DuplicateSKUError, VersionConflictError, InsufficientStockError
+)
+from services.bulk import bulk_update_products, bulk_delete_products
+from services.importer import import_products, iter_ndjson_records, iter_csv_records
 from utils.responses import (
     success_response, error_response, validation_error_response,
     paginated_response, not_found_response, created_response,
-    updated_response, deleted_response
+    updated_response, deleted_response, navigation_params
 )
 
 products_bp = Blueprint('products', __name__)
 
 # Initialize schemas
 product_schema = ProductSchema()
-product_list_schema = ProductSchema(many=True)
 product_update_schema = ProductUpdateSchema()
 query_schema = ProductQuerySchema()
+bulk_delete_schema = ProductBulkDeleteSchema()
+export_schema = ProductExportSchema()
+batch_query_schema = ProductBatchQuerySchema()
+category_query_schema = CategoryQuerySchema()
+stats_query_schema = InventoryStatsQuerySchema()
+stock_adjustment_schema = StockAdjustmentSchema()
+
+EXPORT_FIELDS = list(PRODUCT_FIELDS)
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv'
+}
+
+def _product_validator(params, product_id):
+    """ETag for one product (its version, see ``product_etag``) and last modification time."""
+    row = db.session.query(Product.id, Product.version, Product.created_at, Product.updated_at).filter(
+        Product.id == product_id
+    ).first()
+    if row is None:
+        return None
+    return product_etag(row), row.updated_at
+
+def _collection_validator(query, params):
+    """ETag source for a filtered collection: newest modification time and row count.
+
+    The count catches deletions, which leave no newer timestamp behind.
+    Pages that skip the exact count (``count=estimate|none``) would lose
+    their saving to this one, so they validate against the whole catalog
+    instead: its newest ``updated_at`` (an index lookup) and its size from
+    the category summary. That tag changes on any write, never too rarely.
+    An exact count is kept for the page (``g.collection_total``), which then
+    does not count the same rows again.
+    """
+    if product_service.count_mode(params) != 'exact':
+        last_modified = db.session.scalar(select(func.max(Product.updated_at)))
+        total = db.session.scalar(summary_total_statement(db.engine.dialect.name))
+    else:
+        last_modified, total = query.with_entities(func.max(Product.updated_at), func.count(Product.id)).one()
+        g.collection_total = total
+    return (last_modified.isoformat() if last_modified else None, total), last_modified
+
+def _paginated_products_response(query, query_params, endpoint, search_term=None, **url_params):
+    """Paginate a product query by page number or cursor and build the response."""
+    page, items = product_service.paginate_products(
+        query, query_params, search_term=search_term, filters={**query_params, **url_params},
+        total=g.pop('collection_total', None)
+    )
+    
+    # Carry the remaining filters into the navigation URLs
+    url_params = navigation_params(query_params, **url_params)
+    
+    return paginated_response(
+        items=items,
+        page=page.page,
+        per_page=page.per_page,
+        total=page.total,
+        endpoint=endpoint,
+        next_cursor=page.next_cursor,
+        prev_cursor=page.prev_cursor,
+        has_next=page.has_next,
+        total_estimated=page.total_estimated,
+        **url_params
+    )
 
 @products_bp.route('/products', methods=['GET'])
+@read_only()
+@response_cache.cached(
+    tags=lambda params: [category_tag(params['category']) if params.get('category') else CATALOG_TAG],
+    schema=query_schema
+)
+@conditional(lambda params: _collection_validator(product_service.filtered_products_query(params), params), schema=query_schema)
 def list_products():
     """List all products with pagination, search, and filtering."""
     try:
@@ -27,63 +115,46 @@ def list_products():
         return validation_error_response(e)
     
     # Build query
-    query = Product.query
-    
-    # Apply search filter
-    if query_params.get('q'):
-        search_term = query_params['q']
-        query = query.filter(or_(
-            Product.name.contains(search_term),
-            Product.description.contains(search_term),
-            Product.sku.contains(search_term)
-        ))
-    
-    # Apply category filter
-    if query_params.get('category'):
-        query = query.filter(Product.category == query_params['category'])
-    
-    # Apply sorting
-    sort_by = query_params.get('sort_by', 'created_at')
-    order = query_params.get('order', 'desc')
-    
-    if hasattr(Product, sort_by):
-        sort_column = getattr(Product, sort_by)
-        if order == 'desc':
-            query = query.order_by(sort_column.desc())
-        else:
-            query = query.order_by(sort_column.asc())
-    
-    # Paginate results
-    page = query_params.get('page', 1)
-    per_page = query_params.get('per_page', current_app.config.get('PRODUCTS_PER_PAGE', 20))
+    query = product_service.filtered_products_query(query_params)
     
     try:
-        paginated_products = query.paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
-        )
-        
-        products = product_list_schema.dump(paginated_products.items)
-        
-        return paginated_response(
-            items=products,
-            page=page,
-            per_page=per_page,
-            total=paginated_products.total,
-            endpoint='products.list_products',
-            **{k: v for k, v in query_params.items() if k not in ['page', 'per_page']}
+        return _paginated_products_response(
+            query, query_params, 'products.list_products',
+            search_term=query_params.get('q')
         )
     
     except Exception as e:
         current_app.logger.error(f"Error listing products: {e}")
         return error_response("Failed to retrieve products", status_code=500)
 
+@products_bp.route('/products/stats', methods=['GET'])
+@read_only()
+@response_cache.cached(tags=lambda params: [CATEGORIES_TAG, CATEGORY_STATS_TAG], schema=stats_query_schema)
+def get_inventory_stats():
+    """Inventory value, counts, price percentiles and stock levels by category."""
+    try:
+        query_params = stats_query_schema.load(request.args)
+    except ValidationError as e:
+        return validation_error_response(e)
+    
+    try:
+        return success_response(
+            data=inventory_stats(query_params.get('category'), query_params.get('low_stock')),
+            message="Inventory stats retrieved successfully"
+        )
+    
+    except Exception as e:
+        current_app.logger.error(f"Error computing inventory stats: {e}")
+        return error_response("Failed to compute inventory stats", status_code=500)
+
 @products_bp.route('/products/<int:product_id>', methods=['GET'])
+@read_only()
+@response_cache.cached(tags=lambda params, product_id: [product_tag(product_id)])
+@conditional(_product_validator, scoped=False)
 def get_product(product_id):
     """Get a single product by ID."""
     try:
-        product = Product.query.get(product_id)
+        product = product_service.get_product(product_id)
         
         if not product:
             return not_found_response("Product")
@@ -97,6 +168,40 @@ def get_product(product_id):
         current_app.logger.error(f"Error retrieving product {product_id}: {e}")
         return error_response("Failed to retrieve product", status_code=500)
 
+def _duplicate_sku_response():
+    return error_response(
+        message="Product with this SKU already exists",
+        errors={'sku': ['SKU must be unique']},
+        status_code=409
+    )
+
+def _version_conflict_response(error):
+    return error_response(
+        message="Product has been modified",
+        errors={'version': [str(error)]},
+        status_code=412
+    )
+
+def _if_match_version(product_id):
+    """The product's version if the request's If-Match names it, ``None`` without one.
+
+    Raises VersionConflictError when If-Match matches no current tag.
+    """
+    if not request.if_match:
+        return None
+    product = product_service.get_product(product_id)
+    if product is None:
+        return None
+    if if_match_failed(request.if_match, product_etag(product)):
+        raise VersionConflictError(None, product.version)
+    return product.version
+
+def _with_product_etag(result, product):
+    """Tag a write's response with the product's new ETag, for the next If-Match."""
+    response = make_response(result)
+    response.set_etag(product_etag(product))
+    return response
+
 @products_bp.route('/products', methods=['POST'])
 def create_product():
     """Create a new product."""
@@ -107,25 +212,16 @@ def create_product():
         return validation_error_response(e)
     
     try:
-        # Check if SKU already exists
-        existing_product = Product.query.filter_by(sku=product_data['sku']).first()
-        if existing_product:
-            return error_response(
-                message="Product with this SKU already exists",
-                errors={'sku': ['SKU must be unique']},
-                status_code=409
-            )
-        
-        # Create new product
-        product = Product.from_dict(product_data)
-        db.session.add(product)
-        db.session.commit()
+        product = product_service.create_product(product_data)
         
         return created_response(
             data=product_schema.dump(product),
             message="Product created successfully"
         )
     
+    except DuplicateSKUError:
+        return _duplicate_sku_response()
+    
     except Exception as e:
         db.session.rollback()
         current_app.logger.error(f"Error creating product: {e}")
@@ -141,32 +237,26 @@ def update_product(product_id):
         return validation_error_response(e)
     
     try:
-        product = Product.query.get(product_id)
+        if update_data.get('version') is None:
+            update_data['version'] = _if_match_version(product_id)
+        
+        product = product_service.update_product(product_id, update_data)
         
         if not product:
             return not_found_response("Product")
         
-        # Check SKU uniqueness if being updated
-        if 'sku' in update_data and update_data['sku'] != product.sku:
-            existing_product = Product.query.filter_by(sku=update_data['sku']).first()
-            if existing_product:
-                return error_response(
-                    message="Product with this SKU already exists",
-                    errors={'sku': ['SKU must be unique']},
-                    status_code=409
-                )
-        
-        # Update product fields
-        for field, value in update_data.items():
-            if value is not None:  # Only update fields that are provided
-                setattr(product, field, value)
-        
-        db.session.commit()
-        
-        return updated_response(
+        return _with_product_etag(updated_response(
             data=product_schema.dump(product),
             message="Product updated successfully"
-        )
+        ), product)
+    
+    except DuplicateSKUError:
+        db.session.rollback()
+        return _duplicate_sku_response()
+    
+    except VersionConflictError as e:
+        db.session.rollback()
+        return _version_conflict_response(e)
     
     except Exception as e:
         db.session.rollback()
@@ -175,24 +265,283 @@ def update_product(product_id):
 
 @products_bp.route('/products/<int:product_id>', methods=['DELETE'])
 def delete_product(product_id):
-    """Delete a product."""
+    """Delete a product; honours If-Match."""
     try:
-        product = Product.query.get(product_id)
-        
-        if not product:
+        if not product_service.delete_product(product_id, _if_match_version(product_id)):
             return not_found_response("Product")
         
-        db.session.delete(product)
-        db.session.commit()
-        
         return deleted_response("Product deleted successfully")
     
+    except VersionConflictError as e:
+        db.session.rollback()
+        return _version_conflict_response(e)
+    
     except Exception as e:
         db.session.rollback()
         current_app.logger.error(f"Error deleting product {product_id}: {e}")
         return error_response("Failed to delete product", status_code=500)
 
+@products_bp.route('/products/<int:product_id>/stock', methods=['POST'])
+def adjust_stock(product_id):
+    """Add to (or with a negative delta, remove from) a product's stock atomically."""
+    try:
+        stock_data = stock_adjustment_schema.load(request.get_json(silent=True) or {})
+    except ValidationError as e:
+        return validation_error_response(e)
+    
+    try:
+        expected_version = _if_match_version(product_id)
+        if stock_data.get('version') is not None:
+            expected_version = stock_data['version']
+        
+        row = product_service.adjust_stock(product_id, stock_data['delta'], expected_version)
+        
+        if row is None:
+            return not_found_response("Product")
+        
+        return _with_product_etag(success_response(
+            data=product_row_serializer.dump_row(row),
+            message="Stock adjusted successfully"
+        ), row)
+    
+    except VersionConflictError as e:
+        return _version_conflict_response(e)
+    
+    except InsufficientStockError as e:
+        return error_response(
+            message="Insufficient stock",
+            errors={'delta': [str(e)]},
+            status_code=409
+        )
+    
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error adjusting stock of product {product_id}: {e}")
+        return error_response("Failed to adjust stock", status_code=500)
+
+def _bulk_items():
+    """Read the list of items from a bulk request body, enforcing the batch limit."""
+    payload = request.get_json(silent=True)
+    if isinstance(payload, dict):
+        payload = payload.get('items')
+    
+    if not isinstance(payload, list) or not payload:
+        raise ValidationError({'items': ['Request body must be a non-empty JSON array of products.']})
+    
+    max_items = current_app.config.get('BULK_MAX_ITEMS', 1000)
+    if len(payload) > max_items:
+        raise ValidationError({'items': [f'A bulk request may contain at most {max_items} items.']})
+    
+    return payload
+
+def _bulk_response(result, action, success_status=200):
+    """Report a bulk write, using 207 when only some items succeeded."""
+    data = result.to_dict()
+    
+    if result.errors and not result.succeeded:
+        return error_response(
+            message=f"No products were {action}",
+            errors={'items': data['errors']},
+            status_code=400
+        )
+    
+    return success_response(
+        data=data,
+        message=f"{result.succeeded} of {result.received} products {action}",
+        status_code=207 if result.errors else success_status
+    )
+
+@products_bp.route('/products/bulk', methods=['GET'])
+@read_only()
+def bulk_get():
+    """Fetch many products by id (?ids=3,1,2) with one query, in the order requested."""
+    try:
+        lookup_params = batch_query_schema.load(request.args)
+    except ValidationError as e:
+        return validation_error_response(e)
+    
+    try:
+        data = product_service.lookup_products(lookup_params['ids'], lookup_params.get('fieldset'))
+        return success_response(
+            data=data,
+            message=f"{data['summary']['found']} of {data['summary']['requested']} products found"
+        )
+    
+    except Exception as e:
+        current_app.logger.error(f"Error looking up products: {e}")
+        return error_response("Failed to retrieve products", status_code=500)
+
+@products_bp.route('/products/bulk', methods=['POST'])
+def bulk_create():
+    """Create many products in one transaction; ?upsert=true updates existing SKUs."""
+    try:
+        items = _bulk_items()
+    except ValidationError as e:
+        return validation_error_response(e)
+    
+    upsert = request.args.get('upsert', 'false').lower() == 'true'
+    
+    try:
+        result = product_service.create_products(items, upsert=upsert)
+        return _bulk_response(result, 'upserted' if upsert else 'created', success_status=201)
+    
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error bulk creating products: {e}")
+        return error_response("Failed to create products", status_code=500)
+
+@products_bp.route('/products/bulk', methods=['PATCH'])
+def bulk_update():
+    """Update many products by id in one transaction."""
+    try:
+        items = _bulk_items()
+    except ValidationError as e:
+        return validation_error_response(e)
+    
+    try:
+        result = bulk_update_products(items)
+        db.session.commit()
+        if result.succeeded:
+            response_cache.invalidate_all()
+        return _bulk_response(result, 'updated')
+    
+    except StaleDataError:
+        db.session.rollback()
+        return error_response(
+            message="Products were modified during the update; nothing was changed",
+            status_code=409
+        )
+    
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error bulk updating products: {e}")
+        return error_response("Failed to update products", status_code=500)
+
+@products_bp.route('/products/bulk', methods=['DELETE'])
+def bulk_delete():
+    """Delete many products by id in one statement."""
+    try:
+        delete_data = bulk_delete_schema.load(request.get_json(silent=True) or {})
+    except ValidationError as e:
+        return validation_error_response(e)
+    
+    max_items = current_app.config.get('BULK_MAX_ITEMS', 1000)
+    if len(delete_data['ids']) > max_items:
+        return error_response(
+            message="Validation error",
+            errors={'ids': [f'A bulk request may contain at most {max_items} items.']},
+            status_code=400
+        )
+    
+    try:
+        result = bulk_delete_products(delete_data['ids'])
+        db.session.commit()
+        if result.succeeded:
+            response_cache.invalidate_all()
+        return _bulk_response(result, 'deleted')
+    
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error bulk deleting products: {e}")
+        return error_response("Failed to delete products", status_code=500)
+
+def _export_chunks(rows, export_format, batch_size):
+    """Serialize exported rows, yielding one text chunk per batch."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if export_format == 'csv' else None
+    
+    if writer:
+        writer.writerow(EXPORT_FIELDS)
+    
+    pending = 0
+    for row in rows:
+        item = product_row_serializer.dump_row(row)
+        if writer:
+            writer.writerow([item[field] if item[field] is not None else '' for field in EXPORT_FIELDS])
+        else:
+            buffer.write(current_app.json.dumps(item))
+            buffer.write('\n')
+        
+        pending += 1
+        if pending >= batch_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    
+    if buffer.tell():
+        yield buffer.getvalue()
+
+@products_bp.route('/products/export', methods=['GET'])
+def export_products():
+    """Stream the (optionally filtered) catalog as NDJSON or CSV."""
+    try:
+        export_params = export_schema.load(request.args)
+    except ValidationError as e:
+        return validation_error_response(e)
+    
+    export_format = export_params['format']
+    batch_size = current_app.config.get('EXPORT_BATCH_SIZE', 1000)
+    
+    # Plain column tuples streamed from the cursor: no identity map, no full result list
+    rows = (
+        product_service.filtered_products_query(export_params)
+        .with_entities(*(getattr(Product, field) for field in EXPORT_FIELDS))
+        .order_by(Product.id)
+        .yield_per(batch_size)
+    )
+    
+    response = Response(
+        stream_with_context(_export_chunks(rows, export_format, batch_size)),
+        mimetype=EXPORT_FORMATS[export_format]
+    )
+    response.headers['Content-Disposition'] = f'attachment; filename=products.{export_format}'
+    return response
+
+@products_bp.route('/products/import', methods=['POST'])
+def import_products_feed():
+    """Upsert products by SKU from an NDJSON or CSV request body, read as a stream."""
+    import_format = request.args.get('format')
+    if import_format is None:
+        import_format = 'csv' if request.mimetype == 'text/csv' else 'ndjson'
+    
+    if import_format not in EXPORT_FORMATS:
+        return error_response(
+            message="Validation error",
+            errors={'format': ['Must be one of: ndjson, csv.']},
+            status_code=400
+        )
+    
+    readers = {'ndjson': iter_ndjson_records, 'csv': iter_csv_records}
+    
+    try:
+        summary = import_products(
+            readers[import_format](request.stream),
+            batch_size=current_app.config.get('IMPORT_BATCH_SIZE', 1000),
+            max_errors=current_app.config.get('IMPORT_MAX_ERRORS', 100)
+        )
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error importing products: {e}")
+        return error_response("Failed to import products", status_code=500)
+    finally:
+        # Batches commit independently, so even a failed import may have written rows
+        response_cache.invalidate_all()
+    
+    return success_response(
+        data=summary.to_dict(),
+        message=f"Imported {summary.created + summary.updated} of {summary.received} products",
+        status_code=207 if summary.failed else 200
+    )
+
 @products_bp.route('/products/search', methods=['GET'])
+@read_only()
+@response_cache.cached(tags=lambda params: [CATALOG_TAG], schema=query_schema)
+@conditional(
+    lambda params: _collection_validator(product_service.filtered_products_query({'q': params['q'].strip()}), params)
+    if (params.get('q') or '').strip() else None,
+    schema=query_schema
+)
 def search_products():
     """Search products by name, description, or SKU."""
     search_term = request.args.get('q', '').strip()
@@ -212,43 +561,11 @@ def search_products():
     
     try:
         # Search across name, description, and SKU
-        query = Product.query.filter(or_(
-            Product.name.ilike(f'%{search_term}%'),
-            Product.description.ilike(f'%{search_term}%'),
-            Product.sku.ilike(f'%{search_term}%')
-        ))
-        
-        # Apply sorting
-        sort_by = query_params.get('sort_by', 'created_at')
-        order = query_params.get('order', 'desc')
-        
-        if hasattr(Product, sort_by):
-            sort_column = getattr(Product, sort_by)
-            if order == 'desc':
-                query = query.order_by(sort_column.desc())
-            else:
-                query = query.order_by(sort_column.asc())
+        query = product_service.filtered_products_query({'q': search_term})
         
-        # Paginate results
-        page = query_params.get('page', 1)
-        per_page = query_params.get('per_page', current_app.config.get('PRODUCTS_PER_PAGE', 20))
-        
-        paginated_products = query.paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
-        )
-        
-        products = product_list_schema.dump(paginated_products.items)
-        
-        return paginated_response(
-            items=products,
-            page=page,
-            per_page=per_page,
-            total=paginated_products.total,
-            endpoint='products.search_products',
-            q=search_term,
-            **{k: v for k, v in query_params.items() if k not in ['page', 'per_page', 'q']}
+        return _paginated_products_response(
+            query, query_params, 'products.search_products',
+            search_term=search_term, q=search_term
         )
     
     except Exception as e:
@@ -256,6 +573,12 @@ def search_products():
         return error_response("Failed to search products", status_code=500)
 
 @products_bp.route('/products/category/<string:category>', methods=['GET'])
+@read_only()
+@response_cache.cached(tags=lambda params, category: [category_tag(category)], schema=query_schema)
+@conditional(
+    lambda params, category: _collection_validator(product_service.filtered_products_query({'category': category}), params),
+    schema=query_schema
+)
 def get_products_by_category(category):
     """Get products filtered by category."""
     try:
@@ -266,54 +589,36 @@ def get_products_by_category(category):
     
     try:
         # Query products by category
-        query = Product.query.filter(Product.category == category)
-        
-        # Apply sorting
-        sort_by = query_params.get('sort_by', 'created_at')
-        order = query_params.get('order', 'desc')
-        
-        if hasattr(Product, sort_by):
-            sort_column = getattr(Product, sort_by)
-            if order == 'desc':
-                query = query.order_by(sort_column.desc())
-            else:
-                query = query.order_by(sort_column.asc())
-        
-        # Paginate results
-        page = query_params.get('page', 1)
-        per_page = query_params.get('per_page', current_app.config.get('PRODUCTS_PER_PAGE', 20))
+        query = product_service.filtered_products_query({'category': category})
         
-        paginated_products = query.paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
-        )
-        
-        products = product_list_schema.dump(paginated_products.items)
-        
-        return paginated_response(
-            items=products,
-            page=page,
-            per_page=per_page,
-            total=paginated_products.total,
-            endpoint='products.get_products_by_category',
-            category=category,
-            **{k: v for k, v in query_params.items() if k not in ['page', 'per_page']}
-        )
+        return _paginated_products_response(query, query_params, 'products.get_products_by_category', category=category)
     
     except Exception as e:
         current_app.logger.error(f"Error retrieving products by category {category}: {e}")
         return error_response("Failed to retrieve products by category", status_code=500)
 
 @products_bp.route('/products/categories', methods=['GET'])
+@read_only()
+@response_cache.cached(
+    tags=lambda params: [CATEGORIES_TAG, CATEGORY_STATS_TAG] if params['stats'] else [CATEGORIES_TAG],
+    schema=category_query_schema
+)
 def get_categories():
-    """Get all unique product categories."""
+    """Get all unique product categories, optionally with per-category stats."""
     try:
-        categories = db.session.query(Product.category).distinct().all()
-        category_list = [category[0] for category in categories]
+        query_params = category_query_schema.load(request.args)
+    except ValidationError as e:
+        return validation_error_response(e)
+    
+    try:
+        if query_params['stats']:
+            stats = product_service.category_stats()
+            data = {'categories': [row['name'] for row in stats], 'stats': stats}
+        else:
+            data = {'categories': product_service.list_categories()}
         
         return success_response(
-            data={'categories': category_list},
+            data=data,
             message="Categories retrieved successfully"
         )
     
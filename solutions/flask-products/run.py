@@ -2,11 +2,87 @@
 """
 Flask Products API - Entry Point
 
-This script runs the Flask Product Management API server.
+This script runs the Flask Product Management API server: the Werkzeug
+development server, or with FLASK_ENV=production a preforked gunicorn
+server (WEB_WORKERS processes x WEB_THREADS threads).
 """
 
 import os
 from app import create_app
+from models.product import db
+from models.session import READ_ENGINE_KEY
+
+def reset_db_connections(app):
+    """Replace the connection pool a worker inherited from the master process.
+    
+    Called in each worker right after fork. Connections the master opened
+    (e.g. for create_all) must not be shared between processes, so the
+    child drops them without closing them; the master still owns them.
+    """
+    with app.app_context():
+        db.engine.dispose(close=False)
+    
+    read_engine = app.extensions.get(READ_ENGINE_KEY)
+    if read_engine is not None:
+        read_engine.dispose(close=False)
+
+def gunicorn_options(app, host, port):
+    """gunicorn settings for the production server, from the app's WEB_* config."""
+    config = app.config
+    return {
+        'bind': f'{host}:{port}',
+        'workers': config['WEB_WORKERS'],
+        'threads': config['WEB_THREADS'],
+        'worker_class': 'gthread',
+        'timeout': config['WEB_TIMEOUT'],
+        'keepalive': config['WEB_KEEPALIVE'],
+        'max_requests': config['WEB_MAX_REQUESTS'],
+        'max_requests_jitter': config['WEB_MAX_REQUESTS'] // 10,
+        # Load the app once in the master, then fork it
+        'preload_app': True,
+        'accesslog': '-',
+        'post_fork': lambda server, worker: reset_db_connections(app)
+    }
+
+def production_errors(app):
+    """Settings that serve wrong results across preforked workers; the server refuses to start."""
+    config = app.config
+    errors = []
+    
+    if config['WEB_WORKERS'] > 1 and config.get('CACHE_BACKEND') == 'simple':
+        errors.append("CACHE_BACKEND=simple keeps a separate cache per worker, so writes only "
+                      "invalidate the worker that handled them; use redis or null, or WEB_WORKERS=1")
+    
+    return errors
+
+def production_warnings(app):
+    """Settings that work, but poorly, across preforked workers."""
+    config = app.config
+    warnings = []
+    
+    pool = config.get('SQLALCHEMY_ENGINE_OPTIONS', {})
+    if 'pool_size' in pool and pool['pool_size'] + pool.get('max_overflow', 0) < config['WEB_THREADS']:
+        warnings.append("DB_POOL_SIZE + DB_MAX_OVERFLOW is smaller than WEB_THREADS; "
+                        "requests will wait for database connections")
+    
+    return warnings
+
+def serve_production(app, host, port):
+    """Run the app under gunicorn (optional dependency, Unix only)."""
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        raise RuntimeError("The production server requires the 'gunicorn' package (pip install gunicorn)")
+    
+    class ProductionServer(BaseApplication):
+        def load_config(self):
+            for key, value in gunicorn_options(app, host, port).items():
+                self.cfg.set(key, value)
+        
+        def load(self):
+            return app
+    
+    ProductionServer().run()
 
 if __name__ == '__main__':
     # Get configuration from environment
@@ -27,13 +103,22 @@ if __name__ == '__main__':
     
     # Initialize database tables
     with app.app_context():
-        from models.product import db
         db.create_all()
         print("✅ Database tables initialized")
     
-    # Run the application
-    app.run(
-        host=host,
-        port=port,
-        debug=debug
-    )
\ No newline at end of file
+    if config_name == 'production':
+        print(f"⚙️  Workers: {app.config['WEB_WORKERS']} x {app.config['WEB_THREADS']} threads")
+        print(f"🗄️  Response cache: {app.config['CACHE_BACKEND']}")
+        errors = production_errors(app)
+        if errors:
+            raise SystemExit("\n".join(f"❌ {error}" for error in errors))
+        for warning in production_warnings(app):
+            print(f"⚠️  {warning}")
+        serve_production(app, host, port)
+    else:
+        # Run the application
+        app.run(
+            host=host,
+            port=port,
+            debug=debug
+        )
\ No newline at end of file
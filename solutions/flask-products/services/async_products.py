@@ -0,0 +1,200 @@
+import os
+from sqlalchemy import select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm.exc import StaleDataError
+from sqlalchemy.pool import StaticPool
+from models.product import Product
+from utils.cache import invalidate_tags
+from utils.pagination import async_offset_paginate, async_keyset_paginate, count_statement
+from utils.categories import category_summary_source, serialize_category_stats
+from utils.counts import summary_total_statement, planner_estimate_sql, planner_rows, bound_estimate
+from services.products import (
+    DuplicateSKUError, apply_product_filters, page_layout, order_by_relevance, uses_cursor, count_mode,
+    created_tags, deleted_tags, stock_tags, check_version, current_version_statement, stale_write,
+    apply_product_changes, stock_adjustment_statement, stock_state_statement, rejected_stock_adjustment
+)
+
+# Async DBAPI driver used for each database the sync app supports
+ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'postgresql': 'postgresql+asyncpg',
+    'mysql': 'mysql+aiomysql'
+}
+
+def async_database_url(uri, instance_path=None):
+    """Turn the app's SQLALCHEMY_DATABASE_URI into the matching async URL.
+
+    Relative SQLite paths are resolved against ``instance_path``, as
+    Flask-SQLAlchemy does, so both apps open the same database file.
+    """
+    url = make_url(uri)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend!r} databases")
+    url = url.set(drivername=ASYNC_DRIVERS[backend])
+
+    if backend == 'sqlite' and url.database not in (None, '', ':memory:') and instance_path:
+        if not os.path.isabs(url.database):
+            os.makedirs(instance_path, exist_ok=True)
+            url = url.set(database=os.path.join(instance_path, url.database))
+    return url
+
+def create_engine_for(uri, instance_path=None, echo=False, **engine_options):
+    """Create the async engine; an in-memory SQLite database is shared by every session.
+
+    ``engine_options`` are the app's SQLALCHEMY_ENGINE_OPTIONS (pool settings).
+    """
+    url = async_database_url(uri, instance_path)
+    if url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+        return create_async_engine(url, echo=echo, poolclass=StaticPool, connect_args={'check_same_thread': False})
+    return create_async_engine(url, echo=echo, **engine_options)
+
+def create_session_factory(engine):
+    # Objects stay usable after commit: reloading them would need another await
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+def filtered_products_statement(params, search, columns=None):
+    """Build a ``select()`` applying the optional search and category filters."""
+    return apply_product_filters(select(*(columns or [Product])), params, search)
+
+async def paginate_products(session, filters, params, search, search_term=None, counts=None):
+    """Async ``services.products.paginate_products``: the page and its serialized items.
+
+    ``counts`` is the app's ``CountCache``, used by ``count=estimate``.
+    """
+    order = params.get('order', 'desc')
+    per_page = params.get('per_page', 20)
+
+    sort_by, columns, serializer = page_layout(params, search_term)
+    statement = filtered_products_statement(filters, search, columns)
+    statement, sort_by = order_by_relevance(statement, sort_by, search_term, search)
+
+    count = count_mode(params)
+    if uses_cursor(params):
+        page = await async_keyset_paginate(
+            session, statement, Product, sort_by, order, per_page,
+            cursor=params.get('cursor'),
+            with_total=count == 'exact'
+        )
+    else:
+        page = await async_offset_paginate(
+            session, statement, Product, sort_by, order, params.get('page', 1), per_page,
+            with_total=count == 'exact'
+        )
+
+    if count == 'estimate':
+        page.total, page.total_estimated = bound_estimate(page, await estimate_total(session, filters, statement, counts))
+
+    return page, serializer.dump(page.items)
+
+async def estimate_total(session, filters, statement, counts=None):
+    """Async ``services.products.estimate_total``."""
+    dialect = session.bind.dialect
+    if not filters.get('q'):
+        return await session.scalar(summary_total_statement(dialect.name, filters.get('category')))
+
+    total = counts.get(filters) if counts is not None else None
+    if total is None:
+        explain = planner_estimate_sql(statement, dialect)
+        if explain is not None:
+            connection = await session.connection()
+            total = planner_rows((await connection.exec_driver_sql(*explain)).scalar())
+        else:
+            total = await session.scalar(count_statement(statement))
+        if counts is not None:
+            counts.set(filters, total)
+    return total
+
+async def get_product(session, product_id):
+    return await session.get(Product, product_id)
+
+async def list_categories(session):
+    summary = category_summary_source(session.bind.dialect.name)
+    return list(await session.scalars(select(summary.c.name).order_by(summary.c.name)))
+
+async def category_stats(session):
+    summary = category_summary_source(session.bind.dialect.name)
+    rows = await session.execute(select(summary).order_by(summary.c.name))
+    return [serialize_category_stats(row) for row in rows]
+
+async def _ensure_unique_sku(session, sku, product_id=None):
+    existing = await session.scalar(select(Product.id).filter(Product.sku == sku).limit(1))
+    if existing is not None and existing != product_id:
+        raise DuplicateSKUError(sku)
+
+# ``cache`` below is the app's response cache backend (see ``asgi.py``): writes
+# invalidate the same tags as ``services.products``, so Flask workers sharing
+# it stop serving pages from before the write.
+
+async def create_product(session, data, cache=None):
+    """Create and commit a product from validated data."""
+    await _ensure_unique_sku(session, data['sku'])
+
+    product = Product.from_dict(data)
+    session.add(product)
+    await session.commit()
+
+    invalidate_tags(cache, created_tags(product))
+    return product
+
+async def _commit_versioned(session, product_id, expected_version):
+    """Commit a versioned change; returns ``False`` if the product was deleted meanwhile."""
+    try:
+        await session.commit()
+    except StaleDataError:
+        await session.rollback()
+        return stale_write(expected_version, await session.scalar(current_version_statement(product_id)))
+    return True
+
+async def update_product(session, product_id, data, cache=None):
+    """Apply validated changes to a product; returns ``None`` if it does not exist.
+
+    A ``version`` in ``data`` must be the product's current one, as in
+    ``services.products.update_product``.
+    """
+    product = await get_product(session, product_id)
+    if product is None:
+        return None
+
+    expected_version = data.get('version')
+    check_version(product, expected_version)
+
+    if 'sku' in data and data['sku'] != product.sku:
+        await _ensure_unique_sku(session, data['sku'], product_id)
+
+    tags = apply_product_changes(product, data)
+    if not await _commit_versioned(session, product_id, expected_version or product.version):
+        return None
+
+    invalidate_tags(cache, tags)
+    return product
+
+async def delete_product(session, product_id, expected_version=None, cache=None):
+    """Delete a product; returns ``False`` if it does not exist."""
+    product = await get_product(session, product_id)
+    if product is None:
+        return False
+
+    check_version(product, expected_version)
+
+    tags = deleted_tags(product)
+    await session.delete(product)
+    if not await _commit_versioned(session, product_id, expected_version or product.version):
+        return False
+
+    invalidate_tags(cache, tags)
+    return True
+
+async def adjust_stock(session, product_id, delta, expected_version=None, cache=None):
+    """Add ``delta`` to a product's stock in one guarded UPDATE, as ``services.products.adjust_stock``."""
+    row = (await session.execute(stock_adjustment_statement(product_id, delta, expected_version))).first()
+    if row is None:
+        current = (await session.execute(stock_state_statement(product_id))).first()
+        await session.rollback()
+        return rejected_stock_adjustment(current, delta, expected_version)
+
+    await session.commit()
+
+    invalidate_tags(cache, stock_tags(row))
+    return row
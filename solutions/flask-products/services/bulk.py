@@ -0,0 +1,206 @@
+from sqlalchemy import select, insert, update, delete, bindparam
+from sqlalchemy.orm.exc import StaleDataError
+from marshmallow import ValidationError
+from models.product import db, Product
+from utils.validators import ProductSchema, ProductBulkUpdateSchema
+
+product_batch_schema = ProductSchema(many=True)
+product_bulk_update_schema = ProductBulkUpdateSchema(many=True)
+
+class BulkResult:
+    """Per-item outcome of a bulk write."""
+
+    def __init__(self, received=0):
+        self.received = received
+        self.created = []
+        self.updated = []
+        self.deleted = []
+        self.errors = []
+
+    def add_error(self, index, errors):
+        self.errors.append({'index': index, 'errors': errors})
+
+    @property
+    def succeeded(self):
+        return len(self.created) + len(self.updated) + len(self.deleted)
+
+    def to_dict(self):
+        self.errors.sort(key=lambda error: error['index'])
+        return {
+            'summary': {
+                'received': self.received,
+                'created': len(self.created),
+                'updated': len(self.updated),
+                'deleted': len(self.deleted),
+                'failed': len(self.errors)
+            },
+            'created': self.created,
+            'updated': self.updated,
+            'deleted': self.deleted,
+            'errors': self.errors
+        }
+
+def validate_batch(schema, items, result):
+    """Validate a batch with a ``many=True`` schema.
+
+    Returns ``(index, data)`` pairs for the valid items and records the
+    invalid ones on ``result`` instead of rejecting the whole batch.
+    """
+    try:
+        return list(enumerate(schema.load(items)))
+    except ValidationError as e:
+        if not isinstance(e.messages, dict) or '_schema' in e.messages:
+            raise
+        for index, messages in e.messages.items():
+            result.add_error(index, messages)
+        return [(index, data) for index, data in enumerate(e.valid_data) if index not in e.messages]
+
+def _drop_duplicates(pairs, key, result, message):
+    """Keep the first item for each key, reporting later repeats as errors."""
+    seen = set()
+    unique = []
+    for index, data in pairs:
+        if data[key] in seen:
+            result.add_error(index, {key: [message]})
+            continue
+        seen.add(data[key])
+        unique.append((index, data))
+    return unique
+
+def _existing_skus(skus):
+    """Map SKU to product id for the given SKUs with a single IN query."""
+    if not skus:
+        return {}
+    rows = db.session.execute(select(Product.sku, Product.id).where(Product.sku.in_(skus)))
+    return {sku: product_id for sku, product_id in rows}
+
+def _versions(ids):
+    """Map product id to its current version with a single IN query."""
+    if not ids:
+        return {}
+    return dict(db.session.execute(select(Product.id, Product.version).where(Product.id.in_(ids))).all())
+
+def _apply_updates(pairs, result, versions):
+    """Run one executemany UPDATE per set of provided fields, for pairs keyed by id.
+
+    Each row matches on its version from ``versions`` and bumps it, as the
+    ORM does for single updates; written as Core statements because the ORM
+    checks versioned rows one statement at a time. Raises StaleDataError if
+    a product changed since, which fails the batch (where the driver
+    reports executemany row counts).
+    """
+    if not pairs:
+        return
+    table = Product.__table__
+    groups = {}
+    for _, data in pairs:
+        fields = tuple(sorted(data.keys() - {'id', 'version'}))
+        groups.setdefault(fields, []).append({'b_id': data['id'], 'b_version': versions[data['id']], **data})
+
+    for fields, rows in groups.items():
+        statement = (
+            update(table)
+            .where(table.c.id == bindparam('b_id'), table.c.version == bindparam('b_version'))
+            .values(version=table.c.version + 1, **{field: bindparam(field) for field in fields})
+        )
+        matched = db.session.execute(statement, rows).rowcount
+        if db.engine.dialect.supports_sane_multi_rowcount and matched != len(rows):
+            raise StaleDataError(f'Bulk update expected to update {len(rows)} product(s); {matched} were matched.')
+
+    for index, data in pairs:
+        result.updated.append({'index': index, 'id': data['id']})
+
+def bulk_create_products(items, upsert=False):
+    """Insert a batch of products in one statement.
+
+    SKU uniqueness is checked for the whole batch with one IN query. With
+    ``upsert`` set, items whose SKU already exists update that product
+    instead of being reported as conflicts. The caller owns the transaction.
+    """
+    result = BulkResult(received=len(items))
+    pairs = validate_batch(product_batch_schema, items, result)
+    pairs = _drop_duplicates(pairs, 'sku', result, 'Duplicate SKU in this batch.')
+
+    existing = _existing_skus([data['sku'] for _, data in pairs])
+    to_insert, to_update = [], []
+    for index, data in pairs:
+        if data['sku'] not in existing:
+            to_insert.append((index, data))
+        elif upsert:
+            # Only the fields the item provided: schema defaults such as
+            # stock_quantity=0 must not overwrite the existing product
+            provided = {field: value for field, value in data.items() if field in items[index]}
+            to_update.append((index, {'id': existing[data['sku']], **provided}))
+        else:
+            result.add_error(index, {'sku': ['SKU must be unique']})
+
+    if to_insert:
+        # SKUs are unique, so RETURNING rows are matched back by SKU rather than
+        # forcing parameter ordering, which would cost one statement per row
+        created = dict(db.session.execute(
+            insert(Product).returning(Product.sku, Product.id),
+            [data for _, data in to_insert]
+        ).all())
+        for index, data in to_insert:
+            result.created.append({'index': index, 'id': created[data['sku']], 'sku': data['sku']})
+
+    _apply_updates(to_update, result, _versions([data['id'] for _, data in to_update]))
+    return result
+
+def bulk_update_products(items):
+    """Update a batch of products by id with one executemany UPDATE.
+
+    Missing ids, SKUs that would collide with another product and items
+    whose ``version`` is not the product's current one are reported per
+    item. The caller owns the transaction.
+    """
+    result = BulkResult(received=len(items))
+    pairs = validate_batch(product_bulk_update_schema, items, result)
+    pairs = _drop_duplicates(pairs, 'id', result, 'Duplicate product id in this batch.')
+
+    # Only fields that were provided are written, as with the single update
+    pairs = [(index, {field: value for field, value in data.items() if value is not None}) for index, data in pairs]
+
+    versions = _versions([data['id'] for _, data in pairs])
+    existing = _existing_skus([data['sku'] for _, data in pairs if 'sku' in data])
+    claimed = {}
+
+    to_update = []
+    for index, data in pairs:
+        if data['id'] not in versions:
+            result.add_error(index, {'id': ['Product not found']})
+            continue
+        if data.get('version', versions[data['id']]) != versions[data['id']]:
+            result.add_error(index, {'version': ['Product has been modified since this version.']})
+            continue
+        sku = data.get('sku')
+        if sku is not None:
+            owner = claimed.get(sku, existing.get(sku, data['id']))
+            if owner != data['id']:
+                result.add_error(index, {'sku': ['SKU must be unique']})
+                continue
+            claimed[sku] = data['id']
+        if data.keys() - {'id', 'version'}:
+            to_update.append((index, data))
+        else:
+            result.updated.append({'index': index, 'id': data['id']})
+
+    _apply_updates(to_update, result, versions)
+    return result
+
+def bulk_delete_products(ids):
+    """Delete products by id with a single DELETE ... IN statement."""
+    result = BulkResult(received=len(ids))
+    known_ids = set(db.session.scalars(select(Product.id).where(Product.id.in_(ids))))
+
+    seen = set()
+    for index, product_id in enumerate(ids):
+        if product_id not in known_ids or product_id in seen:
+            result.add_error(index, {'id': ['Product not found']})
+            continue
+        seen.add(product_id)
+        result.deleted.append({'index': index, 'id': product_id})
+
+    if seen:
+        db.session.execute(delete(Product).where(Product.id.in_(seen)), execution_options={'synchronize_session': False})
+    return result
@@ -0,0 +1,243 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from marshmallow import ValidationError
+from models.session import read_only
+from services import products as product_service
+from services.products import DuplicateSKUError, VersionConflictError, InsufficientStockError
+from services.stats import inventory_stats
+from utils.responses import success_body, error_body, pagination_info, paginated_body
+from utils.serializers import product_row_serializer
+from utils.validators import (
+    ProductSchema, ProductUpdateSchema, ProductQuerySchema, ProductBatchQuerySchema, InventoryStatsQuerySchema,
+    StockAdjustmentSchema
+)
+
+product_schema = ProductSchema()
+product_update_schema = ProductUpdateSchema()
+query_schema = ProductQuerySchema()
+batch_query_schema = ProductBatchQuerySchema()
+stats_query_schema = InventoryStatsQuerySchema()
+stock_adjustment_schema = StockAdjustmentSchema()
+
+def _validation_error(e):
+    return error_body("Validation error", e.messages)
+
+def _version_conflict(e):
+    return error_body("Product has been modified", {'version': [str(e)]})
+
+def _load_query(params):
+    return query_schema.load({key: value for key, value in (params or {}).items() if value is not None})
+
+class DirectProductClient:
+    """Serves MCP tool calls from the database in-process, without HTTP.
+
+    Offers the same coroutines as ``utils.api_client.ProductAPIClient`` and
+    returns the same envelopes the API would, built by the same service
+    functions the routes use. Each call runs on a worker thread inside its
+    own app context (and so its own session), so blocking database work
+    never stalls the MCP event loop.
+    """
+
+    def __init__(self, app, max_workers=8):
+        self.app = app
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='products-db')
+
+    @classmethod
+    def from_config(cls, config):
+        """Create the Flask app named by MCP_DIRECT_CONFIG and make sure its tables exist."""
+        from app import create_app
+        from models.product import db
+
+        app = create_app(config.MCP_DIRECT_CONFIG)
+        with app.app_context():
+            db.create_all()
+        return cls(app, max_workers=config.MCP_DIRECT_WORKERS)
+
+    async def aclose(self):
+        self._executor.shutdown(wait=False)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    def _call_in_context(self, func, *args, read=False):
+        with self.app.app_context():
+            if read:
+                with read_only():
+                    return func(*args)
+            return func(*args)
+
+    async def _run(self, func, *args, read=False):
+        """Run ``func`` on the worker pool; ``read=True`` uses the read-only connection pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(self._call_in_context, func, *args, read=read))
+
+    def _paginated(self, query, params, search_term=None, filters=None):
+        page, items = product_service.paginate_products(query, params, search_term=search_term, filters=filters)
+        return paginated_body(items, pagination_info(
+            page.page, page.per_page, page.total, page.next_cursor, page.prev_cursor,
+            page.has_next, page.total_estimated
+        ))
+
+    def _list_products(self, params):
+        try:
+            params = _load_query(params)
+        except ValidationError as e:
+            return _validation_error(e)
+        return self._paginated(product_service.filtered_products_query(params), params, search_term=params.get('q'))
+
+    def _search_products(self, params):
+        search_term = (params.get('q') or '').strip()
+        if not search_term:
+            return error_body("Search term is required", {'q': ['Query parameter q is required']})
+        try:
+            params = _load_query(params)
+        except ValidationError as e:
+            return _validation_error(e)
+        filters = {'q': search_term}
+        return self._paginated(product_service.filtered_products_query(filters), params, search_term=search_term, filters=filters)
+
+    def _get_products_by_category(self, category, params):
+        try:
+            params = _load_query(params)
+        except ValidationError as e:
+            return _validation_error(e)
+        filters = {'category': category}
+        return self._paginated(product_service.filtered_products_query(filters), params, filters=filters)
+
+    def _get_product(self, product_id):
+        product = product_service.get_product(product_id)
+        if product is None:
+            return error_body("Product not found")
+        return success_body(product_row_serializer.dump_object(product), "Product retrieved successfully")
+
+    def _get_products(self, product_ids, fields):
+        params = {'ids': ','.join(str(product_id) for product_id in product_ids)}
+        if fields:
+            params['fields'] = fields
+        try:
+            params = batch_query_schema.load(params)
+        except ValidationError as e:
+            return _validation_error(e)
+        data = product_service.lookup_products(params['ids'], params.get('fieldset'))
+        return success_body(data, f"{data['summary']['found']} of {data['summary']['requested']} products found")
+
+    def _create_product(self, data):
+        try:
+            data = product_schema.load(data or {})
+        except ValidationError as e:
+            return _validation_error(e)
+        try:
+            product = product_service.create_product(data)
+        except DuplicateSKUError:
+            return error_body("Product with this SKU already exists", {'sku': ['SKU must be unique']})
+        return success_body(product_row_serializer.dump_object(product), "Product created successfully")
+
+    def _update_product(self, product_id, data):
+        try:
+            data = product_update_schema.load(data or {})
+        except ValidationError as e:
+            return _validation_error(e)
+        try:
+            product = product_service.update_product(product_id, data)
+        except DuplicateSKUError:
+            return error_body("Product with this SKU already exists", {'sku': ['SKU must be unique']})
+        except VersionConflictError as e:
+            return _version_conflict(e)
+        if product is None:
+            return error_body("Product not found")
+        return success_body(product_row_serializer.dump_object(product), "Product updated successfully")
+
+    def _delete_product(self, product_id):
+        if not product_service.delete_product(product_id):
+            return error_body("Product not found")
+        return success_body(message="Product deleted successfully")
+
+    def _adjust_stock(self, product_id, delta, version):
+        body = {'delta': delta}
+        if version is not None:
+            body['version'] = version
+        try:
+            data = stock_adjustment_schema.load(body)
+        except ValidationError as e:
+            return _validation_error(e)
+        try:
+            row = product_service.adjust_stock(product_id, data['delta'], data.get('version'))
+        except VersionConflictError as e:
+            return _version_conflict(e)
+        except InsufficientStockError as e:
+            return error_body("Insufficient stock", {'delta': [str(e)]})
+        if row is None:
+            return error_body("Product not found")
+        return success_body(product_row_serializer.dump_row(row), "Stock adjusted successfully")
+
+    def _upsert_products(self, items):
+        max_items = self.app.config.get('BULK_MAX_ITEMS', 1000)
+        if not isinstance(items, list) or not items:
+            return error_body("Validation error", {'items': ['Request body must be a non-empty JSON array of products.']})
+        if len(items) > max_items:
+            return error_body("Validation error", {'items': [f'A bulk request may contain at most {max_items} items.']})
+
+        result = product_service.create_products(items, upsert=True)
+        data = result.to_dict()
+        if result.errors and not result.succeeded:
+            return error_body("No products were upserted", {'items': data['errors']})
+        return success_body(data, f"{result.succeeded} of {result.received} products upserted")
+
+    def _get_categories(self):
+        return success_body({'categories': product_service.list_categories()}, "Categories retrieved successfully")
+
+    def _get_category_stats(self):
+        stats = product_service.category_stats()
+        return success_body(
+            {'categories': [row['name'] for row in stats], 'stats': stats},
+            "Categories retrieved successfully"
+        )
+
+    def _get_inventory_stats(self, params):
+        try:
+            params = stats_query_schema.load({key: value for key, value in (params or {}).items() if value is not None})
+        except ValidationError as e:
+            return _validation_error(e)
+        data = inventory_stats(params.get('category'), params.get('low_stock'))
+        return success_body(data, "Inventory stats retrieved successfully")
+
+    async def list_products(self, params):
+        return await self._run(self._list_products, params, read=True)
+
+    async def get_product(self, product_id):
+        return await self._run(self._get_product, product_id, read=True)
+
+    async def get_products(self, product_ids, fields=None):
+        return await self._run(self._get_products, product_ids, fields, read=True)
+
+    async def create_product(self, data):
+        return await self._run(self._create_product, data)
+
+    async def update_product(self, product_id, data):
+        return await self._run(self._update_product, product_id, data)
+
+    async def delete_product(self, product_id):
+        return await self._run(self._delete_product, product_id)
+
+    async def adjust_stock(self, product_id, delta, version=None):
+        return await self._run(self._adjust_stock, product_id, delta, version)
+
+    async def upsert_products(self, items):
+        return await self._run(self._upsert_products, items)
+
+    async def search_products(self, params):
+        return await self._run(self._search_products, params, read=True)
+
+    async def get_products_by_category(self, category, params):
+        return await self._run(self._get_products_by_category, category, params, read=True)
+
+    async def get_categories(self, stats=False):
+        return await self._run(self._get_category_stats if stats else self._get_categories, read=True)
+
+    async def get_inventory_stats(self, params):
+        return await self._run(self._get_inventory_stats, params, read=True)
@@ -0,0 +1,144 @@
+import csv
+import io
+import json
+from itertools import islice
+from flask import current_app
+from models.product import db
+from services.bulk import bulk_create_products
+
+# Columns produced by the export that cannot be written back
+READ_ONLY_FIELDS = ('id', 'created_at', 'updated_at', 'version')
+
+class ImportSummary:
+    """Running totals of a streaming import; keeps only the first errors."""
+
+    def __init__(self, max_errors=100):
+        self.max_errors = max_errors
+        self.received = 0
+        self.created = 0
+        self.updated = 0
+        self.failed = 0
+        self.batches = 0
+        self.errors = []
+        self.errors_truncated = False
+
+    def add_error(self, index, errors):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({'index': index, 'errors': errors})
+        else:
+            self.errors_truncated = True
+
+    def to_dict(self):
+        return {
+            'summary': {
+                'received': self.received,
+                'created': self.created,
+                'updated': self.updated,
+                'failed': self.failed,
+                'batches': self.batches
+            },
+            'errors': self.errors,
+            'errors_truncated': self.errors_truncated
+        }
+
+class _InvalidRecord:
+    """Placeholder for a line that could not be parsed."""
+
+    def __init__(self, message):
+        self.message = message
+
+def _clean(record):
+    """Drop read-only and blank columns so exported files import cleanly."""
+    if not isinstance(record, dict):
+        return record
+    return {
+        key: value for key, value in record.items()
+        if key not in READ_ONLY_FIELDS and value is not None and value != ''
+    }
+
+def _is_utf8(text):
+    """False if ``text`` holds bytes that were not valid UTF-8 (decoded with surrogateescape)."""
+    try:
+        text.encode('utf-8')
+    except UnicodeEncodeError:
+        return False
+    return True
+
+def iter_ndjson_records(stream):
+    """Yield one record per non-blank line of a binary NDJSON stream."""
+    for line in stream:
+        try:
+            line = line.decode('utf-8')
+        except UnicodeDecodeError:
+            yield _InvalidRecord('Line is not valid UTF-8.')
+            continue
+        if not line.strip():
+            continue
+        try:
+            yield _clean(json.loads(line))
+        except ValueError:
+            yield _InvalidRecord('Line is not valid JSON.')
+
+def iter_csv_records(stream):
+    """Yield one record per data row of a binary CSV stream with a header row."""
+    # Undecodable bytes are kept as surrogates so only the rows containing them fail
+    text = io.TextIOWrapper(stream, encoding='utf-8', errors='surrogateescape', newline='')
+    for row in csv.DictReader(text):
+        if not all(_is_utf8(str(value)) for value in row.values()):
+            yield _InvalidRecord('Row is not valid UTF-8.')
+            continue
+        yield _clean(row)
+
+def import_products(records, batch_size=1000, max_errors=100):
+    """Upsert products by SKU from an iterable of records, one transaction per batch.
+
+    Records are pulled lazily, so memory depends on ``batch_size`` rather than
+    on the size of the input.
+    """
+    summary = ImportSummary(max_errors=max_errors)
+    records = iter(records)
+
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            break
+
+        offset = summary.received
+        summary.received += len(batch)
+        summary.batches += 1
+
+        items, positions = [], []
+        for position, record in enumerate(batch):
+            if isinstance(record, _InvalidRecord):
+                summary.add_error(offset + position, {'_schema': [record.message]})
+            else:
+                items.append(record)
+                positions.append(offset + position)
+
+        if not items:
+            continue
+
+        try:
+            result = bulk_create_products(items, upsert=True)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.error(f"Error importing batch {summary.batches}: {e}")
+            for position in positions:
+                summary.add_error(position, {'_batch': ['Batch could not be saved.']})
+            continue
+
+        summary.created += len(result.created)
+        summary.updated += len(result.updated)
+        for error in result.errors:
+            summary.add_error(positions[error['index']], error['errors'])
+
+        # Drop the batch's objects before pulling the next one
+        db.session.expunge_all()
+        current_app.logger.info(
+            f"Imported batch {summary.batches}: {summary.received} rows read, "
+            f"{summary.created} created, {summary.updated} updated, {summary.failed} failed"
+        )
+
+    return summary
@@ -0,0 +1,370 @@
+from flask import current_app
+from sqlalchemy import select, update
+from sqlalchemy.orm.exc import StaleDataError
+from models.product import db, Product
+from utils.pagination import offset_paginate, keyset_paginate
+from utils.search import product_search
+from utils.cache import response_cache
+from utils.serializers import PRODUCT_FIELDS, RowSerializer, product_columns, product_row_serializer
+from utils.categories import category_summary_source, serialize_category_stats
+from utils.counts import summary_total_statement, planner_estimate_sql, planner_rows, bound_estimate
+from services.bulk import bulk_create_products
+
+# Cache tags: list/search pages span the whole catalog, the rest are narrower
+CATALOG_TAG = 'catalog'
+CATEGORIES_TAG = 'categories'
+CATEGORY_STATS_TAG = 'category-stats'
+
+# Product fields that feed the per-category totals
+CATEGORY_STATS_FIELDS = ('category', 'price', 'stock_quantity')
+
+def product_tag(product_id):
+    return f'product:{product_id}'
+
+def category_tag(category):
+    return f'category:{category}'
+
+class DuplicateSKUError(Exception):
+    """Raised when a write would give two products the same SKU."""
+
+class VersionConflictError(Exception):
+    """Raised when a write is based on a version of a product that is no longer current."""
+
+    def __init__(self, expected_version, current_version):
+        super().__init__(f'Product is now at version {current_version}')
+        self.expected_version = expected_version
+        self.current_version = current_version
+
+class InsufficientStockError(Exception):
+    """Raised when a stock adjustment would take a product's stock below zero."""
+
+    def __init__(self, stock_quantity, delta):
+        super().__init__(f'Cannot remove {-delta} from a stock of {stock_quantity}')
+        self.stock_quantity = stock_quantity
+        self.delta = delta
+
+def apply_product_filters(query, params, search=product_search):
+    """Apply the optional search and category filters to a query or ``select()``."""
+    # Apply search filter
+    if params.get('q'):
+        query = search.filter(query, params['q'])
+
+    # Apply category filter
+    if params.get('category'):
+        query = query.filter(Product.category == params['category'])
+
+    return query
+
+def filtered_products_query(params):
+    """Build a product query applying the optional search and category filters."""
+    return apply_product_filters(Product.query, params)
+
+def page_layout(params, search_term=None):
+    """How a page of products is sorted and which columns it reads.
+
+    Returns ``(sort_by, columns, serializer)``. ``sort_by`` is only
+    ``'relevance'`` for a search (see ``order_by_relevance``); the columns
+    are the requested ``fields`` plus the id and sort column cursors need.
+    """
+    sort_by = params.get('sort_by', 'created_at')
+
+    # Relevance only means something for a search; otherwise use the default order
+    if sort_by == 'relevance' and not search_term:
+        sort_by = 'created_at'
+
+    fieldset = params.get('fieldset')
+    if not fieldset:
+        return sort_by, product_columns(), product_row_serializer
+
+    extra = [name for name in ('id', sort_by) if name != 'relevance' and name not in fieldset]
+    return sort_by, product_columns(fieldset + tuple(dict.fromkeys(extra))), RowSerializer(fieldset)
+
+def order_by_relevance(query, sort_by, search_term, search=product_search):
+    """Rank a search by relevance when asked to; returns the query and the column the paginator sorts by."""
+    if sort_by == 'relevance':
+        return search.order_by_relevance(query, search_term), None
+    return query, sort_by
+
+def uses_cursor(params):
+    return bool(params.get('cursor')) or params.get('pagination') == 'cursor'
+
+def paginate_products(query, params, search_term=None, filters=None, total=None):
+    """Paginate a product query by page number or cursor.
+
+    ``params`` are validated ``ProductQuerySchema`` values. Rows are read as
+    column tuples (only the requested ``fields``, plus the id and sort column
+    that cursors need) and returned already serialized, with the page.
+    ``filters`` are the search/category filters applied to ``query`` (by
+    default those in ``params``), used to estimate the total. ``total`` is an
+    exact count of ``query`` the caller already has, so it is not counted again.
+    """
+    order = params.get('order', 'desc')
+    per_page = params.get('per_page', current_app.config.get('PRODUCTS_PER_PAGE', 20))
+
+    sort_by, columns, serializer = page_layout(params, search_term)
+    query, sort_by = order_by_relevance(query.with_entities(*columns), sort_by, search_term)
+
+    count = count_mode(params)
+    if uses_cursor(params):
+        page = keyset_paginate(
+            query, Product, sort_by, order, per_page,
+            cursor=params.get('cursor'),
+            with_total=count == 'exact',
+            total=total
+        )
+    else:
+        page = offset_paginate(
+            query, Product, sort_by, order, params.get('page', 1), per_page,
+            with_total=count == 'exact',
+            total=total
+        )
+
+    if count == 'estimate':
+        page.total, page.total_estimated = bound_estimate(page, estimate_total(filters or params, query))
+
+    return page, serializer.dump(page.items)
+
+def count_mode(params):
+    """``count`` for a list request: exact by default for page numbers, none for cursors."""
+    if params.get('count'):
+        return params['count']
+    return 'none' if uses_cursor(params) else 'exact'
+
+def estimate_total(filters, query):
+    """Approximate how many products match ``filters`` without counting them.
+
+    Without a search term the category summary has the figure. Searches
+    reuse a count cached for COUNT_ESTIMATE_TTL seconds; on a miss PostgreSQL
+    asks the planner and other databases count once.
+    """
+    dialect = db.engine.dialect
+    if not filters.get('q'):
+        return db.session.scalar(summary_total_statement(dialect.name, filters.get('category')))
+
+    counts = current_app.extensions['count_cache']
+    total = counts.get(filters)
+    if total is None:
+        explain = planner_estimate_sql(query.statement, dialect)
+        if explain is not None:
+            total = planner_rows(db.session.connection().exec_driver_sql(*explain).scalar())
+        else:
+            total = query.order_by(None).count()
+        counts.set(filters, total)
+    return total
+
+def get_product(product_id):
+    return db.session.get(Product, product_id)
+
+def lookup_products(ids, fieldset=None):
+    """Fetch products by id with a single IN query.
+
+    Returns one entry per requested id, in the order given (``None`` where
+    no product exists), plus the ids that were not found.
+    """
+    fieldset = fieldset or PRODUCT_FIELDS
+    serializer = product_row_serializer if fieldset == PRODUCT_FIELDS else RowSerializer(fieldset)
+    columns = fieldset if 'id' in fieldset else fieldset + ('id',)
+
+    rows = db.session.query(*product_columns(columns)).filter(Product.id.in_(set(ids)))
+    found = {row.id: serializer.dump_row(row) for row in rows}
+
+    items = [found.get(product_id) for product_id in ids]
+    not_found = [product_id for product_id in ids if product_id not in found]
+    return {
+        'items': items,
+        'not_found': not_found,
+        'summary': {
+            'requested': len(ids),
+            'found': len(ids) - len(not_found),
+            'not_found': len(not_found)
+        }
+    }
+
+def list_categories():
+    """Category names, read from the category summary rather than scanning products."""
+    summary = category_summary_source(db.engine.dialect.name)
+    return list(db.session.scalars(select(summary.c.name).order_by(summary.c.name)))
+
+def category_stats():
+    """Product count, total stock and price range for every category."""
+    summary = category_summary_source(db.engine.dialect.name)
+    rows = db.session.execute(select(summary).order_by(summary.c.name))
+    return [serialize_category_stats(row) for row in rows]
+
+def _ensure_unique_sku(sku, product_id=None):
+    existing = Product.query.filter_by(sku=sku).first()
+    if existing is not None and existing.id != product_id:
+        raise DuplicateSKUError(sku)
+
+def create_product(data):
+    """Create and commit a product from validated data."""
+    _ensure_unique_sku(data['sku'])
+
+    product = Product.from_dict(data)
+    db.session.add(product)
+    db.session.commit()
+
+    response_cache.invalidate(*created_tags(product))
+    return product
+
+def created_tags(product):
+    """Cache tags a new product invalidates."""
+    return CATALOG_TAG, CATEGORIES_TAG, category_tag(product.category)
+
+def deleted_tags(product):
+    """Cache tags a deleted product invalidates."""
+    return CATALOG_TAG, CATEGORIES_TAG, product_tag(product.id), category_tag(product.category)
+
+def stock_tags(row):
+    """Cache tags a stock adjustment (the updated product ``row``) invalidates."""
+    return CATALOG_TAG, product_tag(row.id), category_tag(row.category), CATEGORY_STATS_TAG
+
+def check_version(product, expected_version):
+    if expected_version is not None and expected_version != product.version:
+        raise VersionConflictError(expected_version, product.version)
+
+def current_version_statement(product_id):
+    return select(Product.version).where(Product.id == product_id)
+
+def stale_write(expected_version, current_version):
+    """Outcome of a versioned write that matched no row: ``False`` if the
+    product is gone, otherwise VersionConflictError."""
+    if current_version is None:
+        return False
+    raise VersionConflictError(expected_version, current_version)
+
+def apply_product_changes(product, data):
+    """Set the fields provided in validated ``data`` on ``product``.
+
+    Returns the cache tags the change invalidates once committed.
+    """
+    old_category = product.category
+    old_stats = [getattr(product, field) for field in CATEGORY_STATS_FIELDS]
+
+    # Only update fields that are provided
+    for field, value in data.items():
+        if value is not None and field != 'version':
+            setattr(product, field, value)
+
+    stats_changed = old_stats != [getattr(product, field) for field in CATEGORY_STATS_FIELDS]
+    return (
+        CATALOG_TAG, product_tag(product.id),
+        category_tag(old_category), category_tag(product.category),
+        CATEGORIES_TAG if product.category != old_category else None,
+        CATEGORY_STATS_TAG if stats_changed else None
+    )
+
+def stock_adjustment_statement(product_id, delta, expected_version=None):
+    """The guarded ``UPDATE ... RETURNING`` behind ``adjust_stock``."""
+    statement = (
+        update(Product)
+        .where(Product.id == product_id, Product.stock_quantity + delta >= 0)
+        .values(stock_quantity=Product.stock_quantity + delta, version=Product.version + 1)
+        .returning(*product_columns())
+        .execution_options(synchronize_session=False)
+    )
+    if expected_version is not None:
+        statement = statement.where(Product.version == expected_version)
+    return statement
+
+def stock_state_statement(product_id):
+    return select(Product.stock_quantity, Product.version).where(Product.id == product_id)
+
+def rejected_stock_adjustment(current, delta, expected_version=None):
+    """Explain why ``stock_adjustment_statement`` matched no row.
+
+    ``current`` is the ``stock_state_statement`` row: ``None`` (returned
+    as is) when the product does not exist; otherwise this raises
+    VersionConflictError or InsufficientStockError.
+    """
+    if current is None:
+        return None
+    if expected_version is not None and expected_version != current.version:
+        raise VersionConflictError(expected_version, current.version)
+    raise InsufficientStockError(current.stock_quantity, delta)
+
+def _commit_versioned(product_id, expected_version):
+    """Commit a versioned change; returns ``False`` if the product was deleted meanwhile.
+
+    A concurrent update surfaces as VersionConflictError.
+    """
+    try:
+        db.session.commit()
+    except StaleDataError:
+        db.session.rollback()
+        return stale_write(expected_version, db.session.scalar(current_version_statement(product_id)))
+    return True
+
+def update_product(product_id, data):
+    """Apply validated changes to a product; returns ``None`` if it does not exist.
+
+    A ``version`` in ``data`` must be the product's current one. Either way
+    the UPDATE only matches the version that was read, so a concurrent
+    write raises VersionConflictError instead of being overwritten.
+    """
+    product = get_product(product_id)
+    if product is None:
+        return None
+
+    expected_version = data.get('version')
+    check_version(product, expected_version)
+
+    if 'sku' in data and data['sku'] != product.sku:
+        _ensure_unique_sku(data['sku'], product_id)
+
+    tags = apply_product_changes(product, data)
+    if not _commit_versioned(product_id, expected_version or product.version):
+        return None
+
+    response_cache.invalidate(*tags)
+    return product
+
+def delete_product(product_id, expected_version=None):
+    """Delete a product; returns ``False`` if it does not exist.
+
+    Raises VersionConflictError if ``expected_version`` is given and not
+    current, or if the product changes before the DELETE runs.
+    """
+    product = get_product(product_id)
+    if product is None:
+        return False
+
+    check_version(product, expected_version)
+
+    tags = deleted_tags(product)
+    db.session.delete(product)
+    if not _commit_versioned(product_id, expected_version or product.version):
+        return False
+
+    response_cache.invalidate(*tags)
+    return True
+
+def adjust_stock(product_id, delta, expected_version=None):
+    """Add ``delta`` (negative to remove) to a product's stock atomically.
+
+    One ``UPDATE ... SET stock_quantity = stock_quantity + :delta`` guarded
+    by ``stock_quantity + :delta >= 0`` (and the version, if given), so
+    concurrent adjustments never overwrite each other and a successful one
+    costs a single round trip. Returns the updated product row, or ``None``
+    if it does not exist; raises InsufficientStockError or
+    VersionConflictError when the guard rejects the change.
+    """
+    row = db.session.execute(stock_adjustment_statement(product_id, delta, expected_version)).first()
+    if row is None:
+        # Only a rejected change pays for a second query, to say why
+        current = db.session.execute(stock_state_statement(product_id)).first()
+        db.session.rollback()
+        return rejected_stock_adjustment(current, delta, expected_version)
+
+    db.session.commit()
+
+    response_cache.invalidate(*stock_tags(row))
+    return row
+
+def create_products(items, upsert=False):
+    """Bulk-create (or upsert by SKU) products and commit the successful ones."""
+    result = bulk_create_products(items, upsert=upsert)
+    db.session.commit()
+    if result.succeeded:
+        response_cache.invalidate_all()
+    return result
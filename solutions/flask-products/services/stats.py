@@ -0,0 +1,87 @@
+from flask import current_app
+from sqlalchemy import select, func, case, literal
+from models.product import db, Product
+
+# Price percentiles reported per group (nearest-rank method)
+PRICE_PERCENTILES = (25, 50, 75, 90)
+
+def _stats_statement(category=None, threshold=10, by_category=True):
+    """Build one aggregate query over products, grouped by category or not at all.
+
+    Percentiles use window functions (row number and group size per row),
+    which SQLite and PostgreSQL both support, so nothing but the result
+    rows leaves the database.
+    """
+    partition = [Product.category] if by_category else []
+    ranked = select(
+        Product.category,
+        Product.price,
+        Product.stock_quantity,
+        func.row_number().over(partition_by=partition, order_by=Product.price).label('price_rank'),
+        func.count().over(partition_by=partition).label('group_size')
+    )
+    if category:
+        ranked = ranked.where(Product.category == category)
+    ranked = ranked.subquery()
+
+    def percentile(p):
+        # Nearest rank: ceil(p / 100 * n) in integer arithmetic
+        rank = (ranked.c.group_size * p + 99) // 100
+        return func.min(case((ranked.c.price_rank == rank, ranked.c.price))).label(f'p{p}')
+
+    def bucket(condition, name):
+        return func.coalesce(func.sum(case((condition, 1), else_=0)), 0).label(name)
+
+    stock = ranked.c.stock_quantity
+    statement = select(
+        (ranked.c.category if by_category else literal(None)).label('category'),
+        func.count().label('product_count'),
+        func.coalesce(func.sum(stock), 0).label('total_stock'),
+        func.coalesce(func.sum(ranked.c.price * stock), 0).label('inventory_value'),
+        func.avg(ranked.c.price).label('avg_price'),
+        func.min(ranked.c.price).label('min_price'),
+        func.max(ranked.c.price).label('max_price'),
+        *[percentile(p) for p in PRICE_PERCENTILES],
+        bucket(stock == 0, 'out_of_stock'),
+        bucket((stock > 0) & (stock <= threshold), 'low_stock'),
+        bucket(stock > threshold, 'in_stock')
+    )
+    if by_category:
+        statement = statement.group_by(ranked.c.category).order_by(ranked.c.category)
+    return statement
+
+def _price(value):
+    return round(float(value), 2) if value is not None else None
+
+def _serialize(row):
+    return {
+        'product_count': row.product_count,
+        'total_stock': int(row.total_stock),
+        'inventory_value': _price(row.inventory_value),
+        'avg_price': _price(row.avg_price),
+        'min_price': _price(row.min_price),
+        'max_price': _price(row.max_price),
+        'price_percentiles': {f'p{p}': _price(getattr(row, f'p{p}')) for p in PRICE_PERCENTILES},
+        'stock_levels': {
+            'out_of_stock': int(row.out_of_stock),
+            'low_stock': int(row.low_stock),
+            'in_stock': int(row.in_stock)
+        }
+    }
+
+def inventory_stats(category=None, low_stock=None):
+    """Inventory value, counts, price percentiles and stock levels per category and overall.
+
+    Products with ``0 < stock_quantity <= low_stock`` count as low stock
+    (``LOW_STOCK_THRESHOLD`` by default).
+    """
+    threshold = low_stock if low_stock is not None else current_app.config.get('LOW_STOCK_THRESHOLD', 10)
+
+    groups = db.session.execute(_stats_statement(category, threshold))
+    totals = db.session.execute(_stats_statement(category, threshold, by_category=False)).one()
+
+    return {
+        'low_stock_threshold': threshold,
+        'totals': _serialize(totals),
+        'categories': [{'category': row.category, **_serialize(row)} for row in groups]
+    }
@@ -1,35 +1,7 @@
 import pytest
 import json
-from app import create_app
 from models.product import db, Product
 
-@pytest.fixture
-def app():
-    """Create and configure a test app."""
-    app = create_app('testing')
-    
-    with app.app_context():
-        db.create_all()
-        yield app
-        db.drop_all()
-
-@pytest.fixture
-def client(app):
-    """Create a test client."""
-    return app.test_client()
-
-@pytest.fixture
-def sample_product():
-    """Create a sample product for testing."""
-    return {
-        'name': 'Test Laptop',
-        'description': 'A high-performance test laptop',
-        'price': 999.99,
-        'category': 'Electronics',
-        'stock_quantity': 5,
-        'sku': 'TEST-LAP-001'
-    }
-
 class TestProductAPI:
     """Test cases for Product API endpoints."""
     
@@ -0,0 +1,85 @@
+import asyncio
+import httpx
+from utils.api_client import ProductAPIClient
+
+def _client(handler, **kwargs):
+    kwargs.setdefault('backoff', 0)
+    return ProductAPIClient('http://api.test/api', transport=httpx.MockTransport(handler), **kwargs)
+
+def _run(coroutine):
+    return asyncio.run(coroutine)
+
+class TestProductAPIClient:
+    """Test cases for the pooled async client used by the MCP server."""
+
+    def test_returns_json_envelope(self):
+        seen = []
+
+        def handler(request):
+            seen.append(request.url)
+            return httpx.Response(404, json={'status': 'error', 'message': 'Product not found'})
+
+        async def scenario():
+            async with _client(handler) as api:
+                return await api.get('/products', params={'q': 'lap', 'category': None})
+
+        assert _run(scenario()) == {'status': 'error', 'message': 'Product not found'}
+        # None parameters are left out of the query string
+        assert str(seen[0]) == 'http://api.test/api/products?q=lap'
+
+    def test_retries_idempotent_requests(self):
+        responses = iter([httpx.Response(503), httpx.Response(502), httpx.Response(200, json={'status': 'success'})])
+
+        async def scenario():
+            async with _client(lambda request: next(responses), retries=2) as api:
+                return await api.get('/products/1')
+
+        assert _run(scenario()) == {'status': 'success'}
+
+    def test_does_not_retry_post(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(503, text='Service Unavailable')
+
+        async def scenario():
+            async with _client(handler, retries=3) as api:
+                return await api.post('/products', json={'name': 'x'})
+
+        result = _run(scenario())
+        assert len(calls) == 1
+        assert result == {'status': 'error', 'message': 'Products API returned HTTP 503'}
+
+    def test_transport_errors_become_error_envelopes(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            raise httpx.ConnectError('connection refused', request=request)
+
+        async def scenario():
+            async with _client(handler, retries=2) as api:
+                return await api.get('/products')
+
+        result = _run(scenario())
+        assert len(calls) == 3
+        assert result['status'] == 'error'
+        assert 'unavailable' in result['message']
+
+    def test_concurrency_limit(self):
+        in_flight = {'now': 0, 'peak': 0}
+
+        async def handler(request):
+            in_flight['now'] += 1
+            in_flight['peak'] = max(in_flight['peak'], in_flight['now'])
+            await asyncio.sleep(0.01)
+            in_flight['now'] -= 1
+            return httpx.Response(200, json={'status': 'success'})
+
+        async def scenario():
+            async with _client(handler, max_concurrency=3) as api:
+                return await asyncio.gather(*(api.get(f'/products/{i}') for i in range(10)))
+
+        assert len(_run(scenario())) == 10
+        assert in_flight['peak'] == 3
@@ -0,0 +1,133 @@
+import pytest
+import json
+from starlette.testclient import TestClient
+from asgi import create_asgi_app
+from services.async_products import async_database_url
+from services.products import CATALOG_TAG, CATEGORIES_TAG, CATEGORY_STATS_TAG, product_tag, category_tag
+from utils.cache import SimpleCacheBackend
+
+# Timestamps differ between the two databases; compare everything else
+COMPARED_FIELDS = 'id,name,description,price,category,stock_quantity,sku'
+
+@pytest.fixture
+def asgi_client():
+    """A client for the ASGI app on its own in-memory database."""
+    with TestClient(create_asgi_app('testing')) as client:
+        yield client
+
+def _seed(post):
+    for i, category in enumerate(['Electronics', 'Electronics', 'Books']):
+        post('/api/products', json={
+            'name': f'Widget {i}', 'description': 'Café grade', 'price': 10.5 + i,
+            'category': category, 'sku': f'ASGI-{i}'
+        })
+
+class TestASGIProducts:
+    """Test cases for the async (ASGI) variant of the products API."""
+
+    def test_matches_the_flask_app(self, client, asgi_client):
+        _seed(client.post)
+        _seed(asgi_client.post)
+
+        for url in [
+            f'/api/products?per_page=2&page=2&sort_by=name&order=asc&fields={COMPARED_FIELDS}',
+            f'/api/products?q=widget&category=Electronics&fields={COMPARED_FIELDS}',
+            f'/api/products/search?q=widget&sort_by=relevance&fields={COMPARED_FIELDS}',
+            f'/api/products/category/Electronics?per_page=1&sort_by=price&pagination=cursor&fields={COMPARED_FIELDS}',
+            f'/api/products?q=widget&per_page=2&count=none&sort_by=name&fields={COMPARED_FIELDS}',
+            f'/api/products/search?q=widget&per_page=2&count=estimate&sort_by=price&fields={COMPARED_FIELDS}',
+            f'/api/products/category/Electronics?per_page=1&count=estimate&sort_by=name&fields={COMPARED_FIELDS}',
+            '/api/products/categories',
+            '/api/products/categories?stats=true',
+            '/api/products/search',
+            '/api/products?per_page=1000',
+            '/api/products/999',
+            '/api/unknown',
+            '/health',
+        ]:
+            expected = client.get(url)
+            response = asgi_client.get(url)
+            assert (response.status_code, response.content) == (expected.status_code, expected.data), url
+
+    def test_crud(self, asgi_client):
+        created = asgi_client.post('/api/products', json={
+            'name': 'Lamp', 'price': 20, 'category': 'Home', 'sku': 'LAMP-1'
+        })
+        assert created.status_code == 201
+        product = created.json()['data']
+        assert product['price'] == '20.00'
+
+        duplicate = asgi_client.post('/api/products', json={
+            'name': 'Lamp', 'price': 20, 'category': 'Home', 'sku': 'LAMP-1'
+        })
+        assert duplicate.status_code == 409
+
+        assert asgi_client.post('/api/products', json={'name': 'No price'}).status_code == 400
+
+        updated = asgi_client.put(f"/api/products/{product['id']}", json={'stock_quantity': 3})
+        assert updated.json()['data']['stock_quantity'] == 3
+        assert asgi_client.get(f"/api/products/{product['id']}").json()['data']['stock_quantity'] == 3
+
+        assert asgi_client.delete(f"/api/products/{product['id']}").status_code == 200
+        assert asgi_client.delete(f"/api/products/{product['id']}").status_code == 404
+
+    def test_versions_and_stock(self, asgi_client):
+        product = asgi_client.post('/api/products', json={
+            'name': 'Lamp', 'price': 20, 'category': 'Home', 'sku': 'LAMP-1', 'stock_quantity': 2
+        }).json()['data']
+        url = f"/api/products/{product['id']}"
+        etag = asgi_client.get(url).headers['etag']
+
+        assert asgi_client.put(url, json={'name': 'Desk lamp'}, headers={'If-Match': etag}).status_code == 200
+        assert asgi_client.put(url, json={'name': 'Floor lamp'}, headers={'If-Match': etag}).status_code == 412
+
+        adjusted = asgi_client.post(f'{url}/stock', json={'delta': -2})
+        assert adjusted.json()['data']['stock_quantity'] == 0
+        assert adjusted.json()['data']['version'] == 3
+        assert adjusted.headers['etag'] == asgi_client.get(url).headers['etag']
+        assert asgi_client.post(f'{url}/stock', json={'delta': -1}).status_code == 409
+
+    def test_writes_invalidate_the_shared_cache(self, asgi_client):
+        """ASGI writes bump the tags the Flask app caches its pages under."""
+        backend = asgi_client.app.state.response_cache = SimpleCacheBackend()
+        product = asgi_client.post('/api/products', json={
+            'name': 'Lamp', 'price': 20, 'category': 'Home', 'sku': 'LAMP-1', 'stock_quantity': 2
+        }).json()['data']
+        url = f"/api/products/{product['id']}"
+        tags = [CATALOG_TAG, CATEGORIES_TAG, CATEGORY_STATS_TAG, product_tag(product['id']), category_tag('Home')]
+        assert backend.get_versions(tags) == [1, 1, 0, 0, 1]
+
+        asgi_client.put(url, json={'name': 'Desk lamp'})
+        assert backend.get_versions(tags) == [2, 1, 0, 1, 2]
+
+        # Rejected writes leave the cache alone
+        asgi_client.put(url, json={'name': 'Floor lamp'}, headers={'If-Match': '"stale"'})
+        asgi_client.post(f'{url}/stock', json={'delta': -5})
+        assert backend.get_versions(tags) == [2, 1, 0, 1, 2]
+
+        asgi_client.post(f'{url}/stock', json={'delta': -1})
+        assert backend.get_versions(tags) == [3, 1, 1, 2, 3]
+
+        asgi_client.delete(url)
+        assert backend.get_versions(tags) == [4, 2, 1, 3, 4]
+
+    def test_cursor_navigation(self, asgi_client):
+        _seed(asgi_client.post)
+
+        url = '/api/products?per_page=2&pagination=cursor&sort_by=name&order=asc&fields=sku'
+        skus = []
+        while url:
+            body = asgi_client.get(url).json()['data']
+            skus.extend(item['sku'] for item in body['items'])
+            url = body['pagination']['next_url']
+
+        assert skus == ['ASGI-0', 'ASGI-1', 'ASGI-2']
+
+    def test_async_database_url(self, tmp_path):
+        memory = async_database_url('sqlite:///:memory:')
+        assert (memory.drivername, memory.database) == ('sqlite+aiosqlite', ':memory:')
+        assert async_database_url('postgresql://u@db/products').drivername == 'postgresql+asyncpg'
+        # Relative SQLite paths live in the instance folder, as with Flask-SQLAlchemy
+        assert async_database_url('sqlite:///products.db', str(tmp_path)).database == str(tmp_path / 'products.db')
+        with pytest.raises(ValueError):
+            async_database_url('oracle://db/products')
@@ -0,0 +1,181 @@
+import pytest
+import json
+from sqlalchemy import event
+from models.product import db, Product
+
+def _product(sku, **overrides):
+    data = {
+        'name': f'Product {sku}',
+        'price': 19.99,
+        'category': 'Electronics',
+        'stock_quantity': 3,
+        'sku': sku
+    }
+    data.update(overrides)
+    return data
+
+def _send(client, method, payload, url='/api/products/bulk'):
+    response = client.open(url, method=method, data=json.dumps(payload), content_type='application/json')
+    return response, json.loads(response.data)
+
+class TestBulkProducts:
+    """Test cases for the bulk create/update/delete endpoints."""
+
+    def test_bulk_create(self, client, app):
+        """All valid items are inserted and reported with their ids."""
+        response, data = _send(client, 'POST', [_product(f'BULK-{i}') for i in range(5)])
+
+        assert response.status_code == 201
+        assert data['data']['summary']['created'] == 5
+        assert [item['index'] for item in data['data']['created']] == list(range(5))
+
+        with app.app_context():
+            assert Product.query.count() == 5
+            product = db.session.get(Product, data['data']['created'][0]['id'])
+            assert product.sku == 'BULK-0'
+            assert product.created_at is not None
+
+    def test_bulk_create_reports_item_errors(self, client):
+        """Invalid, duplicate and conflicting items fail alone."""
+        _send(client, 'POST', [_product('TAKEN')])
+
+        response, data = _send(client, 'POST', [
+            _product('NEW-1'),
+            _product('NEW-2', price=-5),
+            _product('NEW-1'),
+            _product('TAKEN'),
+        ])
+
+        assert response.status_code == 207
+        errors = {error['index']: error['errors'] for error in data['data']['errors']}
+        assert set(errors) == {1, 2, 3}
+        assert 'price' in errors[1]
+        assert 'sku' in errors[2] and 'sku' in errors[3]
+        assert data['data']['summary'] == {'received': 4, 'created': 1, 'updated': 0, 'deleted': 0, 'failed': 3}
+
+    def test_bulk_create_all_invalid(self, client):
+        response, data = _send(client, 'POST', [{'name': ''}])
+        assert response.status_code == 400
+        assert data['errors']['items'][0]['index'] == 0
+
+    def test_bulk_create_rejects_non_list(self, client):
+        response, _ = _send(client, 'POST', {'name': 'not a list'})
+        assert response.status_code == 400
+
+    def test_bulk_create_uses_one_sku_query(self, client, app):
+        """SKU uniqueness is checked with one IN query, not one per item."""
+        statements = []
+        with app.app_context():
+            listener = lambda conn, cursor, statement, *args: statements.append(statement)
+            event.listen(db.engine, 'before_cursor_execute', listener)
+            try:
+                _send(client, 'POST', [_product(f'Q-{i}') for i in range(20)])
+            finally:
+                event.remove(db.engine, 'before_cursor_execute', listener)
+
+        sku_lookups = [s for s in statements if s.startswith('SELECT') and 'products.sku IN' in s]
+        inserts = [s for s in statements if s.startswith('INSERT INTO products')]
+        assert len(sku_lookups) == 1
+        assert len(inserts) == 1
+
+    def test_bulk_upsert(self, client, app):
+        """With upsert=true existing SKUs are updated instead of rejected."""
+        _send(client, 'POST', [_product('UP-1', stock_quantity=1)])
+
+        response, data = _send(
+            client, 'POST',
+            [_product('UP-1', stock_quantity=40), _product('UP-2')],
+            url='/api/products/bulk?upsert=true'
+        )
+
+        assert response.status_code == 201
+        assert data['data']['summary']['created'] == 1
+        assert data['data']['summary']['updated'] == 1
+        with app.app_context():
+            assert Product.query.filter_by(sku='UP-1').one().stock_quantity == 40
+
+    def test_bulk_upsert_keeps_omitted_stock(self, client, app):
+        """An upsert row without stock_quantity leaves the existing stock alone."""
+        _send(client, 'POST', [_product('UP-3', stock_quantity=9)])
+        row = _product('UP-3', price=12.5)
+        del row['stock_quantity']
+
+        response, data = _send(client, 'POST', [row], url='/api/products/bulk?upsert=true')
+
+        assert response.status_code == 201
+        assert data['data']['summary']['updated'] == 1
+        with app.app_context():
+            product = Product.query.filter_by(sku='UP-3').one()
+            assert product.stock_quantity == 9
+            assert float(product.price) == 12.5
+
+    def test_bulk_update(self, client, app):
+        _, created = _send(client, 'POST', [_product('U-1'), _product('U-2')])
+        first, second = (item['id'] for item in created['data']['created'])
+
+        response, data = _send(client, 'PATCH', [
+            {'id': first, 'price': 25.5},
+            {'id': second, 'sku': 'U-1'},
+            {'id': 99999, 'name': 'Ghost'},
+        ])
+
+        assert response.status_code == 207
+        assert [item['id'] for item in data['data']['updated']] == [first]
+        errors = {error['index']: error['errors'] for error in data['data']['errors']}
+        assert 'sku' in errors[1]
+        assert 'id' in errors[2]
+
+        with app.app_context():
+            product = db.session.get(Product, first)
+            assert float(product.price) == 25.5
+            assert product.name == 'Product U-1'
+
+    def test_bulk_delete(self, client, app):
+        _, created = _send(client, 'POST', [_product(f'D-{i}') for i in range(3)])
+        ids = [item['id'] for item in created['data']['created']]
+
+        response, data = _send(client, 'DELETE', {'ids': ids[:2] + [424242]})
+
+        assert response.status_code == 207
+        assert data['data']['summary']['deleted'] == 2
+        assert data['data']['errors'][0]['index'] == 2
+        with app.app_context():
+            assert [product.id for product in Product.query.all()] == ids[2:]
+
+    def test_bulk_get_preserves_order(self, client, app):
+        """Products come back in the requested order, with nulls for missing ids."""
+        _, created = _send(client, 'POST', [_product(f'G-{i}') for i in range(3)])
+        first, second, third = (item['id'] for item in created['data']['created'])
+
+        statements = []
+        with app.app_context():
+            listener = lambda conn, cursor, statement, *args: statements.append(statement)
+            event.listen(db.engine, 'before_cursor_execute', listener)
+            try:
+                response = client.get(f'/api/products/bulk?ids={third},424242,{first},{third}')
+            finally:
+                event.remove(db.engine, 'before_cursor_execute', listener)
+
+        data = json.loads(response.data)['data']
+        assert response.status_code == 200
+        assert [item and item['id'] for item in data['items']] == [third, None, first, third]
+        assert data['not_found'] == [424242]
+        assert data['summary'] == {'requested': 4, 'found': 3, 'not_found': 1}
+        assert len([s for s in statements if s.startswith('SELECT')]) == 1
+
+    def test_bulk_get_fields(self, client):
+        _, created = _send(client, 'POST', [_product('F-1')])
+        product_id = created['data']['created'][0]['id']
+
+        data = json.loads(client.get(f'/api/products/bulk?ids={product_id}&fields=sku,price').data)
+        assert data['data']['items'] == [{'sku': 'F-1', 'price': '19.99'}]
+
+    def test_bulk_get_validation(self, client, app):
+        assert client.get('/api/products/bulk').status_code == 400
+        assert client.get('/api/products/bulk?ids=1,abc').status_code == 400
+        assert client.get('/api/products/bulk?ids=0').status_code == 400
+
+        app.config['BULK_MAX_ITEMS'] = 2
+        response = client.get('/api/products/bulk?ids=1,2,3')
+        assert response.status_code == 400
+        assert 'ids' in json.loads(response.data)['errors']
@@ -0,0 +1,129 @@
+import pytest
+import json
+import time
+from models.product import db, Product
+from utils.cache import SimpleCacheBackend
+
+@pytest.fixture
+def two_categories(app):
+    """Create one product in each of two categories."""
+    with app.app_context():
+        laptop = Product(name="Laptop", price=999.99, category="Electronics", stock_quantity=1, sku="C-LAP")
+        novel = Product(name="Novel", price=12.50, category="Books", stock_quantity=4, sku="C-NOV")
+        db.session.add_all([laptop, novel])
+        db.session.commit()
+        return {'laptop': laptop.id, 'novel': novel.id}
+
+def _get(client, url):
+    response = client.get(url)
+    return response.headers.get('X-Cache'), json.loads(response.data)
+
+def _update(client, product_id, **fields):
+    return client.put(f'/api/products/{product_id}', data=json.dumps(fields), content_type='application/json')
+
+class TestResponseCache:
+    """Test cases for cached read endpoints and write-driven invalidation."""
+
+    def test_repeated_reads_hit(self, client, two_categories):
+        assert _get(client, '/api/products')[0] == 'MISS'
+        assert _get(client, '/api/products')[0] == 'HIT'
+
+        # Defaults are normalized, so explicit defaults share the entry
+        assert _get(client, '/api/products?page=1&sort_by=created_at&order=desc')[0] == 'HIT'
+
+    def test_update_invalidates_affected_entries_only(self, client, two_categories):
+        urls = [
+            f"/api/products/{two_categories['laptop']}",
+            f"/api/products/{two_categories['novel']}",
+            '/api/products/category/Electronics',
+            '/api/products/category/Books',
+            '/api/products/categories',
+            '/api/products',
+        ]
+        for url in urls:
+            _get(client, url)
+
+        _update(client, two_categories['laptop'], price=899.99)
+
+        states = {url: _get(client, url)[0] for url in urls}
+        assert states[f"/api/products/{two_categories['laptop']}"] == 'MISS'
+        assert states['/api/products/category/Electronics'] == 'MISS'
+        assert states['/api/products'] == 'MISS'
+        assert states[f"/api/products/{two_categories['novel']}"] == 'HIT'
+        assert states['/api/products/category/Books'] == 'HIT'
+        assert states['/api/products/categories'] == 'HIT'
+
+        _, data = _get(client, f"/api/products/{two_categories['laptop']}")
+        assert float(data['data']['price']) == 899.99
+
+    def test_category_change_invalidates_both_categories(self, client, two_categories):
+        _get(client, '/api/products/category/Books')
+        _get(client, '/api/products/categories')
+
+        _update(client, two_categories['laptop'], category='Books')
+
+        state, data = _get(client, '/api/products/category/Books')
+        assert state == 'MISS'
+        assert len(data['data']['items']) == 2
+        assert _get(client, '/api/products/categories')[0] == 'MISS'
+
+    def test_create_and_delete_invalidate(self, client, two_categories, sample_product):
+        _get(client, '/api/products/categories')
+        client.post('/api/products', data=json.dumps(sample_product), content_type='application/json')
+        assert _get(client, '/api/products/categories')[0] == 'MISS'
+
+        _get(client, f"/api/products/{two_categories['novel']}")
+        client.delete(f"/api/products/{two_categories['novel']}")
+        response = client.get(f"/api/products/{two_categories['novel']}")
+        assert response.status_code == 404
+
+    def test_bulk_write_invalidates_everything(self, client, two_categories):
+        _get(client, f"/api/products/{two_categories['novel']}")
+        client.patch(
+            '/api/products/bulk',
+            data=json.dumps([{'id': two_categories['novel'], 'stock_quantity': 0}]),
+            content_type='application/json'
+        )
+        state, data = _get(client, f"/api/products/{two_categories['novel']}")
+        assert state == 'MISS'
+        assert data['data']['stock_quantity'] == 0
+
+    def test_errors_are_not_cached(self, client):
+        client.get('/api/products/12345')
+        assert client.get('/api/products/12345').headers.get('X-Cache') == 'MISS'
+
+    def test_stats(self, client, two_categories):
+        _get(client, '/api/products')
+        _get(client, '/api/products')
+
+        stats = json.loads(client.get('/api/cache/stats').data)['data']
+        assert stats['backend'] == 'simple'
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['hit_rate'] == 0.5
+
+class TestSimpleCacheBackend:
+    """Test cases for the in-process LRU backend."""
+
+    def test_lru_eviction(self):
+        backend = SimpleCacheBackend(max_entries=2)
+        backend.set('a', 1, ttl=60)
+        backend.set('b', 2, ttl=60)
+        backend.get('a')
+        backend.set('c', 3, ttl=60)
+
+        assert backend.get('a') == 1
+        assert backend.get('b') is None
+        assert len(backend) == 2
+
+    def test_ttl_expiry(self):
+        backend = SimpleCacheBackend()
+        backend.set('a', 1, ttl=0.01)
+        time.sleep(0.02)
+        assert backend.get('a') is None
+
+    def test_tag_versions(self):
+        backend = SimpleCacheBackend()
+        assert backend.get_versions(['x', 'y']) == [0, 0]
+        backend.bump(['x'])
+        assert backend.get_versions(['x', 'y']) == [1, 0]
@@ -0,0 +1,103 @@
+import pytest
+import json
+from sqlalchemy import select
+from models.product import db, Product
+from models.category import CategorySummary
+from utils.categories import category_summary_source, rebuild_category_summary, _summary_select
+
+def _post(client, sku, category, price, stock):
+    return client.post('/api/products', data=json.dumps({
+        'name': f'Item {sku}', 'price': price, 'category': category, 'stock_quantity': stock, 'sku': sku
+    }), content_type='application/json')
+
+def _stats(client):
+    return json.loads(client.get('/api/products/categories?stats=true').data)['data']['stats']
+
+def _recomputed(app):
+    """The stats as a GROUP BY over products would give them."""
+    with app.app_context():
+        rows = db.session.execute(_summary_select().order_by(Product.category))
+        return [(row.name, row.product_count, row.total_stock, float(row.min_price), float(row.max_price)) for row in rows]
+
+def _stored(app):
+    with app.app_context():
+        rows = db.session.scalars(select(CategorySummary).order_by(CategorySummary.name))
+        return [(row.name, row.product_count, row.total_stock, float(row.min_price), float(row.max_price)) for row in rows]
+
+@pytest.fixture
+def catalog(client):
+    """Three products in Books, one in Garden."""
+    ids = [json.loads(_post(client, sku, category, price, stock).data)['data']['id'] for sku, category, price, stock in [
+        ('B-1', 'Books', 12.5, 4), ('B-2', 'Books', 30, 1), ('B-3', 'Books', 7.25, 10), ('G-1', 'Garden', 99, 2)
+    ]]
+    return ids
+
+class TestCategorySummary:
+    """Test cases for the trigger-maintained category summary."""
+
+    def test_stats_follow_single_writes(self, client, app, catalog):
+        assert _stats(client) == [
+            {'name': 'Books', 'product_count': 3, 'total_stock': 15, 'min_price': 7.25, 'max_price': 30.0},
+            {'name': 'Garden', 'product_count': 1, 'total_stock': 2, 'min_price': 99.0, 'max_price': 99.0},
+        ]
+
+        # Removing the cheapest book re-reads the price range
+        client.delete(f'/api/products/{catalog[2]}')
+        # Moving the only Garden product empties (and drops) that category
+        client.put(f'/api/products/{catalog[3]}', json={'category': 'Tools', 'stock_quantity': 5})
+        client.put(f'/api/products/{catalog[1]}', json={'price': 5, 'stock_quantity': 1})
+
+        data = json.loads(client.get('/api/products/categories?stats=true').data)['data']
+        assert data['categories'] == ['Books', 'Tools']
+        assert data['stats'][0] == {'name': 'Books', 'product_count': 2, 'total_stock': 5, 'min_price': 5.0, 'max_price': 12.5}
+        assert _stored(app) == _recomputed(app)
+
+    def test_bulk_and_import_writes_are_tracked(self, client, app, catalog):
+        client.post('/api/products/bulk?upsert=true', json=[
+            {'name': 'Rake', 'price': 15, 'category': 'Garden', 'stock_quantity': 3, 'sku': 'G-2'},
+            {'name': 'Moved', 'price': 1, 'category': 'Garden', 'stock_quantity': 1, 'sku': 'B-1'},
+        ])
+        client.put('/api/products/bulk', json=[{'id': catalog[1], 'stock_quantity': 40, 'price': 31}])
+        client.delete('/api/products/bulk', json={'ids': [catalog[2]]})
+        client.post('/api/products/import', data='{"name": "Saw", "price": 20, "category": "Tools", "sku": "T-1"}\n',
+                    content_type='application/x-ndjson')
+
+        assert [name for name, *_ in _stored(app)] == ['Books', 'Garden', 'Tools']
+        assert _stored(app) == _recomputed(app)
+
+    def test_categories_are_read_from_the_summary(self, client, app, catalog):
+        with app.app_context():
+            # Rows the triggers did not write are what the endpoint returns
+            db.session.add(CategorySummary(name='Hidden', product_count=1, total_stock=0, min_price=1, max_price=1))
+            db.session.commit()
+        assert 'Hidden' in json.loads(client.get('/api/products/categories').data)['data']['categories']
+
+    def test_rebuild_fills_a_new_summary_table(self, client, app, catalog):
+        with app.app_context():
+            CategorySummary.__table__.drop(db.engine)
+            # create_all on a database that predates the summary table
+            db.create_all()
+            assert _stored(app) == _recomputed(app)
+
+            db.session.execute(CategorySummary.__table__.delete())
+            db.session.commit()
+            with db.engine.begin() as connection:
+                rebuild_category_summary(connection)
+            assert _stored(app) == _recomputed(app)
+
+    def test_fallback_source_for_databases_without_triggers(self, app, catalog):
+        with app.app_context():
+            summary = category_summary_source('mysql')
+            rows = db.session.execute(select(summary.c.name, summary.c.total_stock).order_by(summary.c.name)).all()
+        assert rows == [('Books', 15), ('Garden', 2)]
+
+    def test_stats_cache_follows_stock_and_price(self, client, catalog):
+        client.get('/api/products/categories')
+        client.get('/api/products/categories?stats=true')
+
+        client.put(f'/api/products/{catalog[0]}', json={'stock_quantity': 0})
+
+        assert client.get('/api/products/categories').headers['X-Cache'] == 'HIT'
+        response = client.get('/api/products/categories?stats=true')
+        assert response.headers['X-Cache'] == 'MISS'
+        assert json.loads(response.data)['data']['stats'][0]['total_stock'] == 11
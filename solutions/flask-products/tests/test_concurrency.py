@@ -0,0 +1,126 @@
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from app import create_app
+from config import config, ProductionConfig
+from models.product import db
+
+@pytest.fixture
+def file_app(tmp_path, monkeypatch):
+    """An app on a SQLite file, so concurrent requests use separate connections."""
+    monkeypatch.setitem(config, 'sqlite-file', type('FileConfig', (ProductionConfig,), {
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'products.db'}",
+        'SQLITE_TUNING': True,
+        'CACHE_BACKEND': 'null'
+    }))
+    app = create_app('sqlite-file')
+    with app.app_context():
+        db.create_all()
+    yield app
+    with app.app_context():
+        db.engine.dispose()
+
+def _create(client, sample_product, **overrides):
+    response = client.post('/api/products', json={**sample_product, **overrides})
+    assert response.status_code == 201
+    return response.get_json()['data']
+
+class TestOptimisticLocking:
+    """Test cases for product versions and If-Match."""
+
+    def test_writes_bump_the_version_and_etag(self, client, sample_product):
+        product = _create(client, sample_product)
+        assert product['version'] == 1
+
+        etag = client.get(f"/api/products/{product['id']}").headers['ETag']
+        response = client.put(f"/api/products/{product['id']}", json={'name': 'Renamed'}, headers={'If-Match': etag})
+
+        assert response.status_code == 200
+        assert response.get_json()['data']['version'] == 2
+        # Partial updates leave the stock alone
+        assert response.get_json()['data']['stock_quantity'] == sample_product['stock_quantity']
+        assert response.headers['ETag'] != etag
+        assert response.headers['ETag'] == client.get(f"/api/products/{product['id']}").headers['ETag']
+
+    def test_stale_if_match_is_rejected(self, client, sample_product):
+        product = _create(client, sample_product)
+        url = f"/api/products/{product['id']}"
+        etag = client.get(url).headers['ETag']
+
+        # Both writers read the same version; only the first one wins
+        assert client.put(url, json={'price': 10}, headers={'If-Match': etag}).status_code == 200
+        response = client.put(url, json={'price': 20}, headers={'If-Match': etag})
+
+        assert response.status_code == 412
+        assert response.get_json()['errors'] == {'version': ['Product is now at version 2']}
+        assert client.get(url).get_json()['data']['price'] == '10.00'
+
+        assert client.delete(url, headers={'If-Match': etag}).status_code == 412
+        assert client.delete(url, headers={'If-Match': '*'}).status_code == 200
+
+    def test_version_in_body(self, client, sample_product):
+        product = _create(client, sample_product)
+        url = f"/api/products/{product['id']}"
+
+        assert client.put(url, json={'name': 'First', 'version': 1}).status_code == 200
+        assert client.put(url, json={'name': 'Second', 'version': 1}).status_code == 412
+        assert client.get(url).get_json()['data']['name'] == 'First'
+
+    def test_bulk_update_checks_versions(self, client, sample_product):
+        first = _create(client, sample_product)
+        second = _create(client, sample_product, sku='TEST-LAP-002')
+        client.put(f"/api/products/{first['id']}", json={'name': 'Changed'})
+
+        response = client.patch('/api/products/bulk', json=[
+            {'id': first['id'], 'price': 1, 'version': 1},
+            {'id': second['id'], 'price': 1, 'version': 1}
+        ])
+
+        assert response.status_code == 207
+        assert response.get_json()['data']['errors'][0]['index'] == 0
+        assert client.get(f"/api/products/{first['id']}").get_json()['data']['price'] == '999.99'
+        assert client.get(f"/api/products/{second['id']}").get_json()['data']['version'] == 2
+
+class TestStockAdjustments:
+    """Test cases for the atomic stock endpoint."""
+
+    def test_adjust_stock(self, client, sample_product):
+        product = _create(client, sample_product)
+        url = f"/api/products/{product['id']}/stock"
+
+        response = client.post(url, json={'delta': -3})
+        assert response.status_code == 200
+        data = response.get_json()['data']
+        assert (data['stock_quantity'], data['version']) == (2, 2)
+        assert response.headers['ETag'] == client.get(f"/api/products/{product['id']}").headers['ETag']
+
+        stats = client.get('/api/products/categories?stats=true').get_json()['data']['stats']
+        assert stats[0]['total_stock'] == 2
+
+    def test_guards(self, client, sample_product):
+        product = _create(client, sample_product)
+        url = f"/api/products/{product['id']}/stock"
+
+        response = client.post(url, json={'delta': -6})
+        assert response.status_code == 409
+        assert response.get_json()['errors'] == {'delta': ['Cannot remove 6 from a stock of 5']}
+
+        assert client.post(url, json={'delta': 1, 'version': 2}).status_code == 412
+        assert client.post(url, json={'delta': 0}).status_code == 400
+        assert client.post(url, json={}).status_code == 400
+        assert client.post('/api/products/999/stock', json={'delta': 1}).status_code == 404
+        assert client.get(f"/api/products/{product['id']}").get_json()['data']['stock_quantity'] == 5
+
+    def test_concurrent_adjustments_are_not_lost(self, file_app, sample_product):
+        product = _create(file_app.test_client(), sample_product, stock_quantity=100)
+        url = f"/api/products/{product['id']}/stock"
+
+        def take_one(_):
+            return file_app.test_client().post(url, json={'delta': -1}).status_code
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            statuses = list(pool.map(take_one, range(110)))
+
+        assert statuses.count(200) == 100
+        assert statuses.count(409) == 10
+        data = file_app.test_client().get(f"/api/products/{product['id']}").get_json()['data']
+        assert (data['stock_quantity'], data['version']) == (0, 101)
@@ -0,0 +1,151 @@
+import pytest
+import json
+from unittest.mock import patch
+from sqlalchemy import event, update
+from models.product import db, Product
+
+@pytest.fixture
+def catalog(app):
+    """Create a few products across two categories."""
+    with app.app_context():
+        products = [
+            Product(name="Laptop", price=999.99, category="Electronics", stock_quantity=1, sku="E-LAP"),
+            Product(name="Phone", price=599.99, category="Electronics", stock_quantity=3, sku="E-PHO"),
+            Product(name="Novel", price=12.50, category="Books", stock_quantity=4, sku="E-NOV")
+        ]
+        db.session.add_all(products)
+        db.session.commit()
+        return [product.id for product in products]
+
+def _revalidate(client, url, etag):
+    return client.get(url, headers={'If-None-Match': etag})
+
+def _statements(app, request):
+    """Run ``request()`` and return the SQL statements it executed."""
+    statements = []
+    with app.app_context():
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            request()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+    return statements
+
+class TestConditionalRequests:
+    """Test cases for ETag / Last-Modified validation of read endpoints."""
+
+    @pytest.mark.parametrize('url', [
+        '/api/products',
+        '/api/products?category=Books',
+        '/api/products/search?q=laptop',
+        '/api/products/category/Electronics'
+    ])
+    def test_collections_return_304_when_unchanged(self, client, catalog, url):
+        response = client.get(url)
+        assert response.status_code == 200
+        etag = response.headers['ETag']
+        assert not etag.startswith('W/')
+        assert 'Last-Modified' in response.headers
+
+        revalidated = _revalidate(client, url, etag)
+        assert revalidated.status_code == 304
+        assert revalidated.data == b''
+        assert revalidated.headers['ETag'] == etag
+
+    def test_single_product(self, client, catalog):
+        url = f'/api/products/{catalog[0]}'
+        etag = client.get(url).headers['ETag']
+
+        assert _revalidate(client, url, etag).status_code == 304
+        assert _revalidate(client, url, '"something-else"').status_code == 200
+
+    def test_not_modified_skips_serialization(self, client, catalog):
+        url = f'/api/products/{catalog[0]}'
+        etag = client.get(url).headers['ETag']
+        list_etag = client.get('/api/products').headers['ETag']
+
+        with patch('routes.products.product_schema.dump') as dump, \
+             patch('routes.products.product_row_serializer.dump') as list_dump:
+            assert _revalidate(client, url, etag).status_code == 304
+            assert _revalidate(client, '/api/products', list_etag).status_code == 304
+            assert dump.call_count == 0
+            assert list_dump.call_count == 0
+
+    def test_update_changes_etags(self, client, catalog):
+        product_url = f'/api/products/{catalog[0]}'
+        product_etag = client.get(product_url).headers['ETag']
+        list_etag = client.get('/api/products').headers['ETag']
+        books_etag = client.get('/api/products/category/Books').headers['ETag']
+
+        client.put(product_url, data=json.dumps({'price': 899.99}), content_type='application/json')
+
+        assert _revalidate(client, product_url, product_etag).status_code == 200
+        assert _revalidate(client, '/api/products', list_etag).status_code == 200
+        assert _revalidate(client, '/api/products/category/Books', books_etag).status_code == 304
+
+    def test_delete_changes_collection_etag(self, client, catalog):
+        list_etag = client.get('/api/products?sort_by=name&order=asc').headers['ETag']
+        client.delete(f'/api/products/{catalog[2]}')
+
+        assert _revalidate(client, '/api/products?sort_by=name&order=asc', list_etag).status_code == 200
+
+    def test_etag_depends_on_parameters(self, client, catalog):
+        first = client.get('/api/products?per_page=1').headers['ETag']
+        second = client.get('/api/products?per_page=1&page=2').headers['ETag']
+        assert first != second
+
+        # Equivalent query strings normalize to the same tag
+        assert client.get('/api/products?page=1&per_page=1').headers['ETag'] == first
+
+    def test_if_modified_since(self, client, catalog):
+        url = f'/api/products/{catalog[1]}'
+        last_modified = client.get(url).headers['Last-Modified']
+
+        response = client.get(url, headers={'If-Modified-Since': last_modified})
+        assert response.status_code == 304
+
+        response = client.get(url, headers={'If-Modified-Since': 'Mon, 01 Jan 2001 00:00:00 GMT'})
+        assert response.status_code == 200
+
+    def test_errors_have_no_validators(self, client):
+        response = client.get('/api/products/12345')
+        assert response.status_code == 404
+        assert 'ETag' not in response.headers
+
+        response = client.get('/api/products?per_page=1000')
+        assert response.status_code == 400
+        assert 'ETag' not in response.headers
+
+    def test_cached_body_keeps_its_etag(self, client, app, catalog):
+        """A cache hit is sent with the tag it was rendered under, not the database's current one."""
+        url = f'/api/products/{catalog[0]}'
+        first = client.get(url)
+
+        # A write the cache does not hear about, e.g. from another process
+        with app.app_context():
+            db.session.execute(update(Product).where(Product.id == catalog[0]).values(name='Pen', version=Product.version + 1))
+            db.session.commit()
+
+        cached = client.get(url)
+        assert cached.headers['X-Cache'] == 'HIT'
+        assert cached.data == first.data
+        assert cached.headers['ETag'] == first.headers['ETag']
+
+        revalidated = _revalidate(client, url, first.headers['ETag'])
+        assert revalidated.status_code == 304
+        assert revalidated.headers['X-Cache'] == 'HIT'
+
+    @pytest.mark.parametrize('url', ['/api/products', '/api/products/search?q=laptop'])
+    def test_cache_hit_runs_no_queries(self, client, app, catalog, url):
+        etag = client.get(url).headers['ETag']
+
+        assert _statements(app, lambda: client.get(url)) == []
+        assert _statements(app, lambda: _revalidate(client, url, etag)) == []
+
+    def test_exact_total_counted_once(self, client, app, catalog):
+        statements = _statements(app, lambda: client.get('/api/products?count=exact'))
+
+        counts = [statement for statement in statements if 'count(' in statement.lower()]
+        assert len(counts) == 1
+        assert json.loads(client.get('/api/products?count=exact').data)['data']['pagination']['total'] == 3
@@ -0,0 +1,71 @@
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+from app import create_app
+from config import config, ProductionConfig
+from models.product import db, Product
+from models.session import read_only, READ_ENGINE_KEY
+
+@pytest.fixture
+def file_app(tmp_path, monkeypatch):
+    """A production-like app on a SQLite file, with tuning and the read pool on."""
+    monkeypatch.setitem(config, 'sqlite-file', type('FileConfig', (ProductionConfig,), {
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'products.db'}",
+        'SQLITE_TUNING': True,
+        'SQLALCHEMY_READ_POOL': True,
+        'CACHE_BACKEND': 'null'
+    }))
+    app = create_app('sqlite-file')
+    with app.app_context():
+        db.create_all()
+    yield app
+    app.extensions[READ_ENGINE_KEY].dispose()
+    with app.app_context():
+        db.engine.dispose()
+
+class TestDatabaseTuning:
+    """Test cases for the SQLite profile and the read-only connection pool."""
+
+    def test_pragmas_applied_on_connect(self, file_app):
+        with file_app.app_context():
+            pragma = lambda name: db.session.execute(text(f'PRAGMA {name}')).scalar()
+            assert pragma('journal_mode') == 'wal'
+            assert pragma('synchronous') == 1  # NORMAL
+            assert pragma('busy_timeout') == 5000
+            assert pragma('cache_size') == -64000
+
+    def test_read_only_block_uses_the_read_pool(self, file_app):
+        with file_app.app_context():
+            with read_only():
+                assert db.session.execute(text('PRAGMA query_only')).scalar() == 1
+                with pytest.raises(OperationalError):
+                    db.session.execute(text('DELETE FROM products'))
+                db.session.rollback()
+
+                # ORM flushes still go to the writer
+                db.session.add(Product(name='Pen', price=1, category='Office', sku='PEN-1'))
+                db.session.commit()
+
+            assert Product.query.count() == 1
+
+    def test_read_views_use_the_read_pool(self, file_app):
+        client = file_app.test_client()
+        client.post('/api/products', json={'name': 'Pen', 'price': 1, 'category': 'Office', 'sku': 'PEN-1'})
+
+        checkouts = []
+        listener = lambda *args: checkouts.append(1)
+        event.listen(file_app.extensions[READ_ENGINE_KEY], 'checkout', listener)
+        try:
+            assert client.get('/api/products').status_code == 200
+            assert client.get('/api/products/categories').status_code == 200
+            reads = len(checkouts)
+            assert client.put('/api/products/1', json={'stock_quantity': 2}).status_code == 200
+        finally:
+            event.remove(file_app.extensions[READ_ENGINE_KEY], 'checkout', listener)
+
+        assert reads == 2
+        assert len(checkouts) == reads
+        assert client.get('/api/products/1').get_json()['data']['stock_quantity'] == 2
+
+    def test_no_read_pool_for_memory_databases(self, app):
+        assert app.extensions[READ_ENGINE_KEY] is None
@@ -0,0 +1,111 @@
+import pytest
+import asyncio
+import json
+import threading
+from services.direct import DirectProductClient
+from utils.api_client import multi_search
+
+@pytest.fixture
+def direct(app, client):
+    """A direct client over the test app, seeded through the API."""
+    for i, category in enumerate(['Electronics', 'Electronics', 'Books']):
+        client.post('/api/products', data=json.dumps({
+            'name': f'Item {i}', 'price': 10 + i, 'category': category, 'sku': f'DIR-{i}'
+        }), content_type='application/json')
+    return DirectProductClient(app, max_workers=2)
+
+def _run(coroutine):
+    return asyncio.run(coroutine)
+
+def _api(client, url):
+    body = json.loads(client.get(url).data)
+    for key in ('prev_url', 'next_url'):
+        body.get('data', {}).get('pagination', {}).pop(key, None)
+    return body
+
+class TestDirectProductClient:
+    """Test cases for the in-process data access used by the MCP server."""
+
+    def test_reads_match_the_api(self, client, direct):
+        assert _run(direct.list_products({'per_page': 2, 'sort_by': 'name', 'order': 'asc'})) == \
+            _api(client, '/api/products?per_page=2&sort_by=name&order=asc')
+        assert _run(direct.search_products({'q': 'item', 'fields': 'id,name'})) == \
+            _api(client, '/api/products/search?q=item&fields=id,name')
+        assert _run(direct.get_products_by_category('Books', {})) == \
+            _api(client, '/api/products/category/Books')
+        assert _run(direct.get_product(1)) == _api(client, '/api/products/1')
+        assert _run(direct.get_categories()) == _api(client, '/api/products/categories')
+        assert _run(direct.get_categories(stats=True)) == _api(client, '/api/products/categories?stats=true')
+        assert _run(direct.get_inventory_stats({'category': 'Books', 'low_stock': None})) == \
+            _api(client, '/api/products/stats?category=Books')
+
+    def test_writes(self, client, direct):
+        created = _run(direct.create_product({'name': 'New', 'price': 5, 'category': 'Toys', 'sku': 'DIR-NEW'}))
+        assert created['status'] == 'success'
+        assert created['data']['price'] == '5.00'
+
+        duplicate = _run(direct.create_product({'name': 'New', 'price': 5, 'category': 'Toys', 'sku': 'DIR-NEW'}))
+        assert duplicate['errors'] == {'sku': ['SKU must be unique']}
+
+        updated = _run(direct.update_product(created['data']['id'], {'stock_quantity': 7}))
+        assert updated['data']['stock_quantity'] == 7
+        assert _api(client, f"/api/products/{created['data']['id']}")['data']['stock_quantity'] == 7
+
+        adjusted = _run(direct.adjust_stock(created['data']['id'], -2))
+        assert adjusted == _api(client, f"/api/products/{created['data']['id']}") | {'message': 'Stock adjusted successfully'}
+        assert _run(direct.adjust_stock(created['data']['id'], -9))['errors'] == {'delta': ['Cannot remove 9 from a stock of 5']}
+        stale = _run(direct.update_product(created['data']['id'], {'name': 'Stale', 'version': 1}))
+        assert stale['errors'] == {'version': ['Product is now at version 3']}
+
+        assert _run(direct.delete_product(created['data']['id']))['status'] == 'success'
+        assert _run(direct.delete_product(created['data']['id'])) == {'status': 'error', 'message': 'Product not found'}
+
+    def test_writes_invalidate_the_api_cache(self, client, direct):
+        _api(client, '/api/products/categories')
+        _run(direct.create_product({'name': 'New', 'price': 5, 'category': 'Toys', 'sku': 'DIR-NEW'}))
+
+        assert 'Toys' in _api(client, '/api/products/categories')['data']['categories']
+
+    def test_validation_errors(self, direct):
+        result = _run(direct.list_products({'per_page': 1000}))
+        assert result['status'] == 'error'
+        assert 'per_page' in result['errors']
+
+        assert _run(direct.search_products({'q': '  '}))['message'] == 'Search term is required'
+        assert 'price' in _run(direct.create_product({'name': 'x', 'category': 'y', 'sku': 'z'}))['errors']
+
+    def test_database_work_runs_off_the_event_loop(self, direct, monkeypatch):
+        threads = []
+        original = direct._get_categories
+
+        def record():
+            threads.append(threading.current_thread().name)
+            return original()
+
+        monkeypatch.setattr(direct, '_get_categories', record)
+        _run(direct.get_categories())
+
+        assert threads[0].startswith('products-db')
+
+    def test_get_products(self, client, direct):
+        assert _run(direct.get_products([3, 99, 1], 'id,sku')) == _api(client, '/api/products/bulk?ids=3,99,1&fields=id,sku')
+        assert _run(direct.get_products([0]))['status'] == 'error'
+
+    def test_multi_search(self, direct):
+        result = _run(multi_search(direct, [
+            {'category': 'Electronics', 'fields': 'sku', 'sort_by': 'name', 'order': 'asc'},
+            {'query': 'nothing-matches'},
+            {'query': 'item', 'category': 'Books', 'fields': 'sku'},
+            {'per_page': 5},
+            {'query': 'item', 'limit': 5},
+        ]))
+
+        assert result['data']['summary'] == {'queries': 5, 'failed': 2, 'found': 2, 'not_found': 1}
+        first, empty, books, missing, unknown = result['data']['results']
+        assert [item['sku'] for item in first['data']['items']] == ['DIR-0', 'DIR-1']
+        assert empty['found'] is False and empty['data']['items'] == []
+        assert books['data']['items'] == [{'sku': 'DIR-2'}]
+        assert missing['status'] == 'error' and missing['index'] == 3
+        assert 'limit' in unknown['message']
+
+        assert _run(multi_search(direct, [{'query': 'x'}] * 3, max_queries=2))['status'] == 'error'
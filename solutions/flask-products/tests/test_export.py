@@ -0,0 +1,60 @@
+import pytest
+import csv
+import io
+import json
+from models.product import db, Product
+
+@pytest.fixture
+def export_catalog(app):
+    """Create a catalog larger than one export batch."""
+    app.config['EXPORT_BATCH_SIZE'] = 4
+    with app.app_context():
+        for i in range(10):
+            db.session.add(Product(
+                name=f"Widget {i}" if i % 2 else f"Gadget {i}",
+                description="Line one, with a comma" if i == 0 else None,
+                price=1 + i,
+                category='Electronics' if i < 6 else 'Books',
+                stock_quantity=i,
+                sku=f"EXP-{i:03d}"
+            ))
+        db.session.commit()
+
+class TestExport:
+    """Test cases for the streaming catalog export."""
+
+    def test_export_ndjson(self, client, export_catalog):
+        response = client.get('/api/products/export')
+
+        assert response.status_code == 200
+        assert response.is_streamed
+        assert response.mimetype == 'application/x-ndjson'
+
+        rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        assert [row['sku'] for row in rows] == [f"EXP-{i:03d}" for i in range(10)]
+
+        # Each row matches what the single-product endpoint returns
+        single = json.loads(client.get(f"/api/products/{rows[3]['id']}").data)['data']
+        assert rows[3] == single
+
+    def test_export_csv(self, client, export_catalog):
+        response = client.get('/api/products/export?format=csv')
+
+        assert response.mimetype == 'text/csv'
+        assert 'products.csv' in response.headers['Content-Disposition']
+
+        rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+        assert len(rows) == 10
+        assert rows[0]['description'] == 'Line one, with a comma'
+        assert rows[1]['description'] == ''
+        assert rows[2]['price'] == '3.00'
+
+    def test_export_filters(self, client, export_catalog):
+        response = client.get('/api/products/export?category=Electronics&q=widget')
+        rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+        assert [row['sku'] for row in rows] == ['EXP-001', 'EXP-003', 'EXP-005']
+
+    def test_export_invalid_format(self, client):
+        response = client.get('/api/products/export?format=xml')
+        assert response.status_code == 400
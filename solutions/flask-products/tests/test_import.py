@@ -0,0 +1,96 @@
+import pytest
+import json
+from models.product import db, Product
+
+def _ndjson(rows):
+    return '\n'.join(json.dumps(row) for row in rows) + '\n'
+
+def _row(sku, **overrides):
+    row = {'name': f'Item {sku}', 'price': '4.50', 'category': 'Books', 'stock_quantity': 2, 'sku': sku}
+    row.update(overrides)
+    return row
+
+class TestImport:
+    """Test cases for the streaming bulk import."""
+
+    def test_import_ndjson_in_batches(self, client, app):
+        app.config['IMPORT_BATCH_SIZE'] = 3
+        body = _ndjson([_row(f'IMP-{i}') for i in range(8)])
+
+        response = client.post('/api/products/import', data=body, content_type='application/x-ndjson')
+
+        assert response.status_code == 200
+        summary = json.loads(response.data)['data']['summary']
+        assert summary == {'received': 8, 'created': 8, 'updated': 0, 'failed': 0, 'batches': 3}
+        with app.app_context():
+            assert Product.query.count() == 8
+
+    def test_import_upserts_and_reports_errors(self, client, app):
+        app.config['IMPORT_BATCH_SIZE'] = 2
+        client.post('/api/products/import', data=_ndjson([_row('KEEP', stock_quantity=1)]))
+
+        body = _ndjson([_row('NEW-1'), _row('KEEP', stock_quantity=9)]) + 'not json\n' + _ndjson([_row('BAD', price='-1')])
+        response = client.post('/api/products/import', data=body)
+
+        assert response.status_code == 207
+        data = json.loads(response.data)['data']
+        assert data['summary']['created'] == 1
+        assert data['summary']['updated'] == 1
+        assert [error['index'] for error in data['errors']] == [2, 3]
+        assert 'price' in data['errors'][1]['errors']
+        with app.app_context():
+            assert Product.query.filter_by(sku='KEEP').one().stock_quantity == 9
+
+    def test_import_csv_roundtrip(self, client, app):
+        """A CSV produced by the export imports back as updates."""
+        client.post('/api/products/import', data=_ndjson([_row('RT-1'), _row('RT-2', description=None)]))
+        exported = client.get('/api/products/export?format=csv').get_data()
+
+        response = client.post('/api/products/import', data=exported, content_type='text/csv')
+
+        summary = json.loads(response.data)['data']['summary']
+        assert summary['updated'] == 2
+        assert summary['failed'] == 0
+
+    def test_import_caps_error_list(self, client, app):
+        app.config['IMPORT_MAX_ERRORS'] = 2
+        response = client.post('/api/products/import', data='{}\n' * 5)
+
+        assert response.status_code == 207
+        data = json.loads(response.data)['data']
+        assert data['summary']['failed'] == 5
+        assert len(data['errors']) == 2
+        assert data['errors_truncated'] is True
+
+    def test_import_reports_invalid_utf8(self, client, app):
+        """Undecodable lines fail on their own instead of failing the import."""
+        body = _ndjson([_row('UTF-1')]).encode() + b'{"name": "\xff\xfe"}\n' + _ndjson([_row('UTF-2')]).encode()
+
+        response = client.post('/api/products/import', data=body)
+
+        assert response.status_code == 207
+        data = json.loads(response.data)['data']
+        assert data['summary']['created'] == 2
+        assert data['errors'] == [{'index': 1, 'errors': {'_schema': ['Line is not valid UTF-8.']}}]
+
+    def test_import_csv_reports_invalid_utf8(self, client, app):
+        body = b'name,price,category,sku\nGood,4.50,Books,CSV-1\nBad \xff,4.50,Books,CSV-2\n'
+
+        response = client.post('/api/products/import', data=body, content_type='text/csv')
+
+        assert response.status_code == 207
+        data = json.loads(response.data)['data']
+        assert data['summary']['created'] == 1
+        assert data['errors'] == [{'index': 1, 'errors': {'_schema': ['Row is not valid UTF-8.']}}]
+
+    def test_import_without_stock_column_keeps_stock(self, client, app):
+        client.post('/api/products/import', data=_ndjson([_row('STOCK', stock_quantity=9)]))
+        body = 'name,price,category,sku\nRenamed,5.00,Books,STOCK\n'
+
+        response = client.post('/api/products/import', data=body, content_type='text/csv')
+
+        assert json.loads(response.data)['data']['summary']['updated'] == 1
+        with app.app_context():
+            product = Product.query.filter_by(sku='STOCK').one()
+            assert product.stock_quantity == 9
+            assert product.name == 'Renamed'
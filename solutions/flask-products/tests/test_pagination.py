@@ -0,0 +1,192 @@
+import pytest
+import json
+from decimal import Decimal
+from sqlalchemy import event
+from models.product import db, Product
+from utils.counts import CountCache
+from utils.pagination import encode_cursor
+
+@pytest.fixture
+def many_products(app):
+    """Create products with duplicate prices so ties must be broken by id."""
+    with app.app_context():
+        for i in range(25):
+            db.session.add(Product(
+                name=f"Product {i:02d}",
+                description=f"Description {i}",
+                price=Decimal('10.00') + (i % 5),
+                category='Electronics' if i % 2 else 'Books',
+                stock_quantity=i,
+                sku=f"SKU-{i:03d}"
+            ))
+        db.session.commit()
+
+def _walk(client, url, key):
+    """Follow the given cursor URL key until exhausted, collecting item ids."""
+    ids = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        data = json.loads(response.data)['data']
+        ids.extend(item['id'] for item in data['items'])
+        url = data['pagination'][key]
+    return ids
+
+class TestKeysetPagination:
+    """Test cases for cursor-based pagination."""
+
+    def test_cursor_pages_match_offset_ordering(self, client, many_products):
+        """Walking cursors forward returns the same rows as offset paging."""
+        offset_ids = _walk(client, '/api/products?sort_by=price&order=asc&per_page=7', 'next_url')
+        cursor_ids = _walk(client, '/api/products?sort_by=price&order=asc&per_page=7&pagination=cursor', 'next_url')
+
+        assert len(cursor_ids) == 25
+        assert cursor_ids == offset_ids
+
+    def test_cursor_first_page_skips_count(self, client, many_products):
+        """Cursor mode omits the total unless an exact count is requested."""
+        response = client.get('/api/products?pagination=cursor&per_page=10')
+        pagination = json.loads(response.data)['data']['pagination']
+
+        assert pagination['page'] is None
+        assert pagination['total'] is None
+        assert pagination['has_prev'] is False
+        assert pagination['has_next'] is True
+        assert pagination['next_cursor']
+
+        response = client.get('/api/products?pagination=cursor&per_page=10&count=exact')
+        pagination = json.loads(response.data)['data']['pagination']
+        assert pagination['total'] == 25
+        assert pagination['pages'] == 3
+
+    def test_prev_cursor_walks_backwards(self, client, many_products):
+        """Following prev cursors from the last page revisits every row."""
+        url = '/api/products?pagination=cursor&per_page=6&sort_by=name&order=desc'
+        forward = _walk(client, url, 'next_url')
+
+        # Jump to the last page, then walk back to the start
+        last_url = url
+        while True:
+            data = json.loads(client.get(last_url).data)['data']
+            if not data['pagination']['next_url']:
+                break
+            last_url = data['pagination']['next_url']
+
+        last_page_ids = [item['id'] for item in data['items']]
+        backward = _walk(client, data['pagination']['prev_url'], 'prev_url')
+
+        assert sorted(backward + last_page_ids) == sorted(forward)
+        assert forward[-len(last_page_ids):] == last_page_ids
+
+    def test_cursor_with_category_filter(self, client, many_products):
+        """Cursor pagination keeps the category route's filter."""
+        ids = _walk(client, '/api/products/category/Books?pagination=cursor&per_page=4', 'next_url')
+        assert len(ids) == 13
+
+    def test_offset_pages_expose_cursors(self, client, many_products):
+        """Offset pages also hand out a cursor to continue by keyset."""
+        response = client.get('/api/products?per_page=10&page=1')
+        pagination = json.loads(response.data)['data']['pagination']
+
+        assert pagination['prev_cursor'] is None
+        rest = _walk(client, f"/api/products?per_page=10&cursor={pagination['next_cursor']}", 'next_url')
+        assert len(rest) == 15
+
+    def test_invalid_cursor(self, client, many_products):
+        """Malformed or mismatched cursors are rejected."""
+        response = client.get('/api/products?cursor=not-a-cursor')
+        assert response.status_code == 400
+
+        response = client.get('/api/products?pagination=cursor&sort_by=price')
+        cursor = json.loads(response.data)['data']['pagination']['next_cursor']
+
+        response = client.get(f'/api/products?cursor={cursor}&sort_by=name')
+        assert response.status_code == 400
+
+        data = json.loads(response.data)
+        assert 'cursor' in data['errors']
+
+    @pytest.mark.parametrize('sort_by, value', [
+        ('price', 'abc'),
+        ('price', 'NaN'),
+        ('price', True),
+        ('created_at', 'abc'),
+        ('created_at', 12),
+        ('name', 7),
+    ])
+    def test_tampered_cursor_value(self, client, many_products, sort_by, value):
+        """A cursor whose sort value the column cannot hold is a 400, not a 500."""
+        cursor = encode_cursor(value, 1, sort_by, 'desc')
+
+        for url in ('/api/products', '/api/products/category/Books', '/api/products/search?q=product'):
+            separator = '&' if '?' in url else '?'
+            response = client.get(f'{url}{separator}cursor={cursor}&sort_by={sort_by}')
+            assert response.status_code == 400
+            assert 'cursor' in json.loads(response.data)['errors']
+
+def _count_queries(app, client, url):
+    """Request ``url`` and return its pagination block and the COUNT queries it ran."""
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', listener)
+    try:
+        response = client.get(url)
+    finally:
+        event.remove(engine, 'before_cursor_execute', listener)
+    assert response.status_code == 200
+    return json.loads(response.data)['data']['pagination'], [s for s in statements if 'count(' in s.lower()]
+
+class TestCountModes:
+    """Test cases for count=exact|estimate|none."""
+
+    def test_none_overfetches_instead_of_counting(self, app, client, many_products):
+        pagination, counts = _count_queries(app, client, '/api/products?q=product&per_page=10&count=none')
+        assert counts == []
+        assert (pagination['total'], pagination['pages'], pagination['total_estimated']) == (None, None, False)
+        assert (pagination['has_prev'], pagination['has_next']) == (False, True)
+        assert pagination['next_url'] and 'count=none' in pagination['next_url']
+
+        pagination, _ = _count_queries(app, client, '/api/products?q=product&per_page=10&count=none&page=3')
+        assert (pagination['has_prev'], pagination['has_next']) == (True, False)
+
+        # Exactly per_page rows left: the extra row is what tells there is no next page
+        pagination, _ = _count_queries(app, client, '/api/products?per_page=5&count=none&page=5')
+        assert pagination['has_next'] is False
+
+    def test_estimate_without_search_reads_the_summary(self, app, client, many_products):
+        pagination, counts = _count_queries(app, client, '/api/products/category/Books?per_page=5&count=estimate')
+        assert counts == []
+        assert (pagination['total'], pagination['pages'], pagination['total_estimated']) == (13, 3, True)
+        assert pagination['has_next'] is True
+
+        # The last page proves the exact total
+        pagination, _ = _count_queries(app, client, '/api/products/category/Books?per_page=5&count=estimate&page=3')
+        assert (pagination['total'], pagination['total_estimated'], pagination['has_next']) == (13, False, False)
+
+    def test_estimate_for_searches_reuses_a_cached_count(self, app, client, many_products):
+        url = '/api/products/search?q=product&per_page=5&count=estimate&fields=id'
+        pagination, counts = _count_queries(app, client, url)
+        assert len(counts) == 1
+        assert (pagination['total'], pagination['total_estimated']) == (25, True)
+
+        with app.app_context():
+            db.session.add(Product(name='Product new', price=1, category='Books', sku='SKU-NEW'))
+            db.session.commit()
+
+        pagination, counts = _count_queries(app, client, url + '&page=2')
+        assert counts == []
+        assert pagination['total'] == 25
+
+        # Once the cached count expires the search is counted again
+        app.extensions['count_cache'] = CountCache(ttl=60)
+        assert _count_queries(app, client, url + '&page=3')[0]['total'] == 26
+
+    def test_cursor_mode_accepts_every_count(self, app, client, many_products):
+        pagination, counts = _count_queries(app, client, '/api/products?pagination=cursor&per_page=10&count=estimate')
+        assert counts == []
+        assert (pagination['total'], pagination['pages'], pagination['total_estimated']) == (25, 3, True)
+
+        response = client.get('/api/products?count=maybe')
+        assert response.status_code == 400
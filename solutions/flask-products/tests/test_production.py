@@ -0,0 +1,76 @@
+import importlib
+import config as config_module
+from app import create_app
+from models.product import db
+from run import reset_db_connections, gunicorn_options, production_errors, production_warnings
+
+class TestProductionServer:
+    """Test cases for the preforked production launcher in run.py."""
+
+    def test_engine_uses_the_pool_settings(self):
+        app = create_app('production')
+        options = app.config['SQLALCHEMY_ENGINE_OPTIONS']
+
+        with app.app_context():
+            pool = db.engine.pool
+            assert pool.size() == options['pool_size']
+            assert pool._max_overflow == options['max_overflow']
+            assert pool._pre_ping is options['pool_pre_ping']
+            assert pool._recycle == options['pool_recycle']
+
+    def test_reset_after_fork_replaces_the_pool(self, app):
+        with app.app_context():
+            old_pool = db.engine.pool
+            connection = db.engine.connect()
+
+            reset_db_connections(app)
+
+            assert db.engine.pool is not old_pool
+            # The parent's connection is left open for the parent to use
+            assert not connection.closed
+            connection.close()
+
+    def test_gunicorn_options(self, app):
+        app.config.update(WEB_WORKERS=3, WEB_THREADS=8, WEB_MAX_REQUESTS=1000)
+
+        options = gunicorn_options(app, '127.0.0.1', 8080)
+
+        assert options['bind'] == '127.0.0.1:8080'
+        assert (options['workers'], options['threads'], options['worker_class']) == (3, 8, 'gthread')
+        assert options['max_requests_jitter'] == 100
+        assert options['preload_app'] is True
+        assert callable(options['post_fork'])
+
+    def test_production_warnings(self, app):
+        app.config.update(WEB_WORKERS=4, WEB_THREADS=8, SQLALCHEMY_ENGINE_OPTIONS={'pool_size': 2, 'max_overflow': 2})
+        assert len(production_warnings(app)) == 1
+
+        app.config.update(SQLALCHEMY_ENGINE_OPTIONS={'pool_size': 5, 'max_overflow': 10})
+        assert production_warnings(app) == []
+
+    def test_per_worker_cache_is_refused(self, app):
+        app.config.update(WEB_WORKERS=4, CACHE_BACKEND='simple')
+        assert len(production_errors(app)) == 1
+
+        for backend in ('redis', 'null'):
+            app.config.update(CACHE_BACKEND=backend)
+            assert production_errors(app) == []
+
+        app.config.update(WEB_WORKERS=1, CACHE_BACKEND='simple')
+        assert production_errors(app) == []
+
+    def test_production_cache_defaults_to_null_with_workers(self, monkeypatch):
+        monkeypatch.delenv('CACHE_BACKEND', raising=False)
+        try:
+            monkeypatch.setenv('WEB_WORKERS', '4')
+            assert importlib.reload(config_module).ProductionConfig.CACHE_BACKEND == 'null'
+
+            monkeypatch.setenv('WEB_WORKERS', '1')
+            assert importlib.reload(config_module).ProductionConfig.CACHE_BACKEND == 'simple'
+
+            monkeypatch.setenv('WEB_WORKERS', '4')
+            monkeypatch.setenv('CACHE_BACKEND', 'redis')
+            assert importlib.reload(config_module).ProductionConfig.CACHE_BACKEND == 'redis'
+        finally:
+            monkeypatch.undo()
+            importlib.reload(config_module)
@@ -0,0 +1,90 @@
+import pytest
+import json
+from contextlib import contextmanager
+from sqlalchemy import event
+from models.product import db, Product
+
+SORT_FIELDS = ['name', 'price', 'created_at', 'updated_at']
+
+@pytest.fixture
+def indexed_catalog(app):
+    """Create enough products across categories to give the planner a choice."""
+    with app.app_context():
+        for i in range(60):
+            db.session.add(Product(
+                name=f"Product {i:02d}",
+                price=5 + i,
+                category=['Electronics', 'Books', 'Clothing'][i % 3],
+                stock_quantity=i,
+                sku=f"PLAN-{i:03d}"
+            ))
+        db.session.commit()
+
+@contextmanager
+def captured_selects():
+    """Collect the SELECT statements issued while the block runs."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            statements.append((statement, parameters))
+
+    event.listen(db.engine, 'before_cursor_execute', capture)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', capture)
+
+def query_plans(client, url):
+    """Request the URL and return the EXPLAIN QUERY PLAN of each SELECT it ran."""
+    with captured_selects() as statements:
+        response = client.get(url)
+        assert response.status_code == 200
+
+    plans = []
+    with db.engine.connect() as connection:
+        for statement, parameters in statements:
+            rows = connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters).fetchall()
+            plans.append([row[-1] for row in rows])
+    return plans
+
+def assert_indexed(plans):
+    """Fail on full table scans of products or temporary sort B-trees."""
+    assert plans
+    for plan in plans:
+        for step in plan:
+            assert 'TEMP B-TREE' not in step, plan
+            if step.startswith(('SCAN products', 'SEARCH products')):
+                assert 'INDEX' in step or 'PRIMARY KEY' in step, plan
+
+class TestQueryPlans:
+    """Check each list route is answered from an index, never scan + sort."""
+
+    @pytest.mark.parametrize('sort_by', SORT_FIELDS)
+    @pytest.mark.parametrize('order', ['asc', 'desc'])
+    def test_list_products(self, client, indexed_catalog, sort_by, order):
+        assert_indexed(query_plans(client, f'/api/products?sort_by={sort_by}&order={order}'))
+
+    @pytest.mark.parametrize('sort_by', SORT_FIELDS)
+    def test_list_products_by_category(self, client, indexed_catalog, sort_by):
+        assert_indexed(query_plans(client, f'/api/products?category=Books&sort_by={sort_by}'))
+
+    @pytest.mark.parametrize('sort_by', SORT_FIELDS)
+    @pytest.mark.parametrize('order', ['asc', 'desc'])
+    def test_category_route(self, client, indexed_catalog, sort_by, order):
+        assert_indexed(query_plans(client, f'/api/products/category/Books?sort_by={sort_by}&order={order}'))
+
+    @pytest.mark.parametrize('sort_by', SORT_FIELDS)
+    def test_cursor_pages_seek_the_index(self, client, indexed_catalog, sort_by):
+        url = f'/api/products/category/Books?pagination=cursor&per_page=5&sort_by={sort_by}'
+        next_url = json.loads(client.get(url).data)['data']['pagination']['next_url']
+
+        plans = query_plans(client, next_url)
+        assert_indexed(plans)
+        assert any(step.startswith('SEARCH products') for plan in plans for step in plan)
+
+    def test_get_product(self, client, indexed_catalog):
+        assert_indexed(query_plans(client, '/api/products/1'))
+
+    def test_categories(self, client, indexed_catalog):
+        assert_indexed(query_plans(client, '/api/products/categories'))
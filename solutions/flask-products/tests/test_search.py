@@ -0,0 +1,89 @@
+import pytest
+import json
+from models.product import db, Product
+from utils.search import product_search, get_search_backend
+
+@pytest.fixture
+def catalog(app):
+    """Create products whose names and descriptions overlap differently."""
+    with app.app_context():
+        products = [
+            Product(name="Keyboard", description="Works with any laptop", price=49.99,
+                    category="Electronics", stock_quantity=3, sku="KEY-001"),
+            Product(name="Laptop Stand", description="Aluminium stand", price=39.99,
+                    category="Office Supplies", stock_quantity=8, sku="STD-001"),
+            Product(name="Gaming Laptop", description="Laptop with a fast laptop GPU", price=1499.99,
+                    category="Electronics", stock_quantity=2, sku="LAP-002"),
+        ]
+        db.session.add_all(products)
+        db.session.commit()
+        return {product.sku: product.id for product in products}
+
+def _search(client, url):
+    response = client.get(url)
+    assert response.status_code == 200
+    return [item['sku'] for item in json.loads(response.data)['data']['items']]
+
+class TestProductSearch:
+    """Test cases for the full-text search backend."""
+
+    def test_sqlite_uses_fts5(self, app):
+        """SQLite databases get the FTS5 backend by default."""
+        assert product_search.backend.name == 'fts5'
+
+    def test_prefix_matching(self, client, catalog):
+        """Each search token matches as a word prefix."""
+        assert sorted(_search(client, '/api/products/search?q=lapt')) == ['KEY-001', 'LAP-002', 'STD-001']
+        assert _search(client, '/api/products/search?q=alumin+sta') == ['STD-001']
+        assert _search(client, '/api/products/search?q=LAP-002') == ['LAP-002']
+
+    def test_relevance_ordering(self, client, catalog):
+        """sort_by=relevance ranks name matches above description-only ones."""
+        skus = _search(client, '/api/products/search?q=laptop&sort_by=relevance')
+        assert skus[-1] == 'KEY-001'
+        assert set(skus[:2]) == {'LAP-002', 'STD-001'}
+
+    def test_list_products_search_filter(self, client, catalog):
+        """The list route's q filter goes through the same index."""
+        assert _search(client, '/api/products?q=gaming') == ['LAP-002']
+
+    def test_index_follows_writes(self, client, catalog):
+        """Updates and deletes are reflected in search results."""
+        client.put(
+            f"/api/products/{catalog['STD-001']}",
+            data=json.dumps({'name': 'Monitor Riser', 'description': 'Raises your monitor'}),
+            content_type='application/json'
+        )
+        assert _search(client, '/api/products/search?q=riser') == ['STD-001']
+        assert 'STD-001' not in _search(client, '/api/products/search?q=laptop')
+
+        client.delete(f"/api/products/{catalog['LAP-002']}")
+        assert _search(client, '/api/products/search?q=gaming') == []
+
+    def test_relevance_rejects_cursor(self, client, catalog):
+        """Relevance order has no keyset, so cursor mode is refused."""
+        response = client.get('/api/products/search?q=laptop&sort_by=relevance&pagination=cursor')
+        assert response.status_code == 400
+
+    def test_like_backend_fallback(self, app, catalog):
+        """The ILIKE backend still finds substrings on any engine."""
+        backend = get_search_backend('sqlite', preferred='like')
+        skus = [product.sku for product in backend.filter(Product.query, 'aptop').all()]
+        assert sorted(skus) == ['KEY-001', 'LAP-002', 'STD-001']
+
+    def test_missing_index_falls_back_to_like(self, app, client, catalog):
+        """A database created before the index existed still searches, until it is rebuilt."""
+        with app.app_context():
+            with db.engine.begin() as connection:
+                get_search_backend('sqlite').uninstall(connection)
+            app.extensions['product_search'] = None
+
+            assert product_search.backend.name == 'like'
+        assert sorted(_search(client, '/api/products/search?q=aptop')) == ['KEY-001', 'LAP-002', 'STD-001']
+
+        result = app.test_cli_runner().invoke(args=['rebuild-search-index'])
+        assert "'fts5' backend" in result.output
+
+        with app.app_context():
+            assert product_search.backend.name == 'fts5'
+        assert _search(client, '/api/products/search?q=gaming') == ['LAP-002']
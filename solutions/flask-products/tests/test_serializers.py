@@ -0,0 +1,99 @@
+import pytest
+import json
+from flask import jsonify
+from models.product import db, Product
+from utils import serializers
+from utils.serializers import RowSerializer, product_columns, product_row_serializer, json_response
+from utils.validators import ProductSchema
+
+@pytest.fixture
+def varied_products(app):
+    """Create products covering nulls, rounding and non-ASCII text."""
+    with app.app_context():
+        db.session.add_all([
+            Product(name="Laptop", description="Fast", price=999.99, category="Electronics", stock_quantity=1, sku="S-1"),
+            Product(name="Café Crème", description=None, price=3, category="Food", stock_quantity=0, sku="S-2"),
+            Product(name="Cable \"HDMI\"", description="Line\nbreak", price=0.1, category="Electronics", stock_quantity=7, sku="S-3")
+        ])
+        db.session.commit()
+
+def _schema_body(rows, fields=None):
+    items = ProductSchema(many=True, only=fields).dump(rows)
+    return jsonify({'status': 'success', 'message': 'Success', 'data': {'items': items}}).get_data()
+
+def _fast_body(rows, fields=None):
+    items = (RowSerializer(fields) if fields else product_row_serializer).dump(rows)
+    return json_response({'status': 'success', 'message': 'Success', 'data': {'items': items}}).get_data()
+
+class TestRowSerializer:
+    """Test cases for the fast list serialization path."""
+
+    @pytest.mark.parametrize('use_orjson', [True, False])
+    def test_byte_identical_to_schema(self, app, varied_products, monkeypatch, use_orjson):
+        if not use_orjson:
+            monkeypatch.setattr(serializers, 'orjson', None)
+        elif serializers.orjson is None:
+            pytest.skip('orjson is not installed')
+
+        with app.test_request_context():
+            products = Product.query.order_by(Product.id).all()
+            rows = db.session.query(*product_columns()).order_by(Product.id).all()
+
+            assert _fast_body(rows) == _schema_body(products)
+
+    def test_field_subset(self, app, varied_products):
+        fields = ('id', 'price', 'sku')
+        with app.test_request_context():
+            products = Product.query.order_by(Product.id).all()
+            rows = db.session.query(*product_columns(fields)).order_by(Product.id).all()
+
+            assert _fast_body(rows, fields) == _schema_body(products, fields)
+
+    def test_debug_output_matches_jsonify(self, app):
+        app.debug = True
+        with app.test_request_context():
+            payload = {'b': [1, None], 'a': 'x'}
+            assert json_response(payload).get_data() == jsonify(payload).get_data()
+
+    def test_list_endpoint_uses_schema_format(self, client, varied_products):
+        items = json.loads(client.get('/api/products?sort_by=name&order=asc').data)['data']['items']
+
+        assert [item['price'] for item in items] == ['0.10', '3.00', '999.99']
+        assert items[1]['name'] == 'Café Crème'
+        assert items[1]['description'] is None
+
+class TestSparseFieldsets:
+    """Test cases for the ?fields= parameter of list routes."""
+
+    def test_only_requested_fields_are_returned(self, client, varied_products):
+        items = json.loads(client.get('/api/products?fields=price,id,name').data)['data']['items']
+
+        assert len(items) == 3
+        assert all(set(item) == {'id', 'name', 'price'} for item in items)
+
+    def test_unrequested_columns_are_not_selected(self, app, client, varied_products):
+        from tests.test_query_plans import captured_selects
+
+        with app.app_context(), captured_selects() as statements:
+            client.get('/api/products/category/Electronics?fields=name&sort_by=price')
+
+        page_query = statements[-1][0]
+        assert 'products.description' not in page_query
+        assert 'products.sku' not in page_query
+        assert 'products.price' in page_query
+
+    def test_cursor_pages_work_without_sort_fields(self, client, varied_products):
+        url = '/api/products?fields=sku&sort_by=price&order=asc&per_page=2&pagination=cursor'
+        first = json.loads(client.get(url).data)['data']
+        assert [item['sku'] for item in first['items']] == ['S-3', 'S-2']
+        assert 'fields=sku' in first['pagination']['next_url']
+
+        second = json.loads(client.get(first['pagination']['next_url']).data)['data']
+        assert second['items'] == [{'sku': 'S-1'}]
+
+    def test_unknown_field(self, client):
+        response = client.get('/api/products?fields=id,secret')
+        data = json.loads(response.data)
+
+        assert response.status_code == 400
+        assert 'secret' in data['errors']['fields'][0]
@@ -0,0 +1,80 @@
+import pytest
+import json
+import math
+from models.product import db, Product
+
+PRODUCTS = [
+    # (category, price, stock)
+    ('Books', 10, 0), ('Books', 20, 3), ('Books', 30, 12), ('Books', 40, 5), ('Books', 50, 100),
+    ('Garden', 8.5, 1), ('Garden', 99.99, 0),
+]
+
+@pytest.fixture
+def inventory(app):
+    with app.app_context():
+        for i, (category, price, stock) in enumerate(PRODUCTS):
+            db.session.add(Product(name=f'Item {i}', price=price, category=category, stock_quantity=stock, sku=f'ST-{i}'))
+        db.session.commit()
+
+def _get(client, url):
+    response = client.get(url)
+    return response, json.loads(response.data)
+
+def _nearest_rank(prices, p):
+    ordered = sorted(prices)
+    return ordered[max(1, math.ceil(p / 100 * len(ordered))) - 1]
+
+class TestInventoryStats:
+    """Test cases for the SQL-computed inventory stats endpoint."""
+
+    def test_grouped_aggregates(self, client, inventory):
+        response, data = _get(client, '/api/products/stats')
+        assert response.status_code == 200
+        stats = data['data']
+
+        assert stats['low_stock_threshold'] == 10
+        assert [group['category'] for group in stats['categories']] == ['Books', 'Garden']
+
+        books = stats['categories'][0]
+        prices = [price for category, price, _ in PRODUCTS if category == 'Books']
+        assert books['product_count'] == 5
+        assert books['total_stock'] == 120
+        assert books['inventory_value'] == 20 * 3 + 30 * 12 + 40 * 5 + 50 * 100
+        assert (books['min_price'], books['max_price'], books['avg_price']) == (10, 50, 30)
+        assert books['price_percentiles'] == {f'p{p}': _nearest_rank(prices, p) for p in (25, 50, 75, 90)}
+        assert books['stock_levels'] == {'out_of_stock': 1, 'low_stock': 2, 'in_stock': 2}
+
+        totals = stats['totals']
+        assert totals['product_count'] == len(PRODUCTS)
+        assert totals['inventory_value'] == round(sum(price * stock for _, price, stock in PRODUCTS), 2)
+        assert totals['price_percentiles']['p50'] == _nearest_rank([price for _, price, _ in PRODUCTS], 50)
+        assert totals['stock_levels'] == {'out_of_stock': 2, 'low_stock': 3, 'in_stock': 2}
+
+    def test_filters(self, client, inventory):
+        _, data = _get(client, '/api/products/stats?category=Garden&low_stock=0')
+        stats = data['data']
+        assert [group['category'] for group in stats['categories']] == ['Garden']
+        assert stats['totals']['product_count'] == 2
+        assert stats['totals']['stock_levels'] == {'out_of_stock': 1, 'low_stock': 0, 'in_stock': 1}
+
+        response, data = _get(client, '/api/products/stats?low_stock=-1')
+        assert response.status_code == 400
+        assert 'low_stock' in data['errors']
+
+    def test_empty_catalog(self, client):
+        _, data = _get(client, '/api/products/stats')
+        assert data['data']['categories'] == []
+        assert data['data']['totals']['product_count'] == 0
+        assert data['data']['totals']['price_percentiles']['p50'] is None
+
+    def test_cached_until_stock_changes(self, client, inventory):
+        assert client.get('/api/products/stats').headers['X-Cache'] == 'MISS'
+        assert client.get('/api/products/stats').headers['X-Cache'] == 'HIT'
+
+        client.put('/api/products/1', json={'name': 'Renamed', 'stock_quantity': 0})
+        assert client.get('/api/products/stats').headers['X-Cache'] == 'HIT'
+
+        client.put('/api/products/1', json={'stock_quantity': 7})
+        response, data = _get(client, '/api/products/stats')
+        assert response.headers['X-Cache'] == 'MISS'
+        assert data['data']['categories'][0]['total_stock'] == 127
@@ -0,0 +1,232 @@
+import asyncio
+import random
+import httpx
+
+# Methods that can be sent again without changing the outcome
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'PUT', 'DELETE', 'OPTIONS'})
+RETRY_STATUS_CODES = frozenset({502, 503, 504})
+
+# Keys accepted in each multi_search query, mapped to list parameters
+MULTI_SEARCH_KEYS = {
+    'query': 'q',
+    'category': 'category',
+    'page': 'page',
+    'per_page': 'per_page',
+    'sort_by': 'sort_by',
+    'order': 'order',
+    'fields': 'fields'
+}
+
+class ProductAPIClient:
+    """Async client for the products REST API with one shared connection pool.
+
+    Connections are kept alive and reused across calls, at most
+    ``max_concurrency`` requests are in flight at once, every call has a
+    timeout, and idempotent requests that fail with a connection error,
+    a timeout or a 502/503/504 are retried with exponential backoff.
+
+    Calls return the API's JSON envelope (``{"status": ..., ...}``) for
+    success and error responses alike, so MCP tools can hand it straight
+    back; transport failures are reported in the same shape.
+
+    Exposes one coroutine per MCP tool (``list_products``, ``get_product``,
+    ...); ``services.direct.DirectProductClient`` offers the same methods
+    without going through HTTP.
+    """
+
+    def __init__(self, base_url, timeout=10.0, max_connections=20,
+                 max_keepalive_connections=10, max_concurrency=10,
+                 retries=3, backoff=0.1, transport=None):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections
+        )
+        self.max_concurrency = max_concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self._transport = transport
+        self._client = None
+        self._semaphore = None
+
+    @classmethod
+    def from_config(cls, config, **kwargs):
+        """Build a client from the PRODUCTS_API_* settings of a config object."""
+        return cls(
+            config.PRODUCTS_API_URL,
+            timeout=config.PRODUCTS_API_TIMEOUT,
+            max_connections=config.PRODUCTS_API_MAX_CONNECTIONS,
+            max_keepalive_connections=config.PRODUCTS_API_MAX_KEEPALIVE,
+            max_concurrency=config.PRODUCTS_API_MAX_CONCURRENCY,
+            retries=config.PRODUCTS_API_RETRIES,
+            backoff=config.PRODUCTS_API_BACKOFF,
+            **kwargs
+        )
+
+    @property
+    def client(self):
+        # Created on first use so it binds to the event loop that runs the tools
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                limits=self.limits,
+                transport=self._transport
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._semaphore = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    def _delay(self, attempt):
+        """Exponential backoff with jitter before retry number ``attempt``."""
+        return self.backoff * (2 ** attempt) * (0.5 + random.random() / 2)
+
+    async def request(self, method, path, params=None, json=None, timeout=None):
+        """Send a request and return the decoded JSON envelope."""
+        method = method.upper()
+        attempts = self.retries + 1 if method in IDEMPOTENT_METHODS else 1
+        params = {key: value for key, value in (params or {}).items() if value is not None}
+        client = self.client
+
+        for attempt in range(attempts):
+            last_attempt = attempt == attempts - 1
+            try:
+                async with self._semaphore:
+                    response = await client.request(
+                        method, path, params=params, json=json,
+                        timeout=timeout if timeout is not None else self.timeout
+                    )
+            except httpx.TransportError as e:
+                if last_attempt:
+                    return {'status': 'error', 'message': f'Products API unavailable: {e!r}'}
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or last_attempt:
+                    return self._envelope(response)
+
+            await asyncio.sleep(self._delay(attempt))
+
+    @staticmethod
+    def _envelope(response):
+        try:
+            return response.json()
+        except ValueError:
+            return {
+                'status': 'success' if response.is_success else 'error',
+                'message': f'Products API returned HTTP {response.status_code}'
+            }
+
+    async def get(self, path, params=None, timeout=None):
+        return await self.request('GET', path, params=params, timeout=timeout)
+
+    async def post(self, path, json=None, params=None, timeout=None):
+        return await self.request('POST', path, params=params, json=json, timeout=timeout)
+
+    async def put(self, path, json=None, timeout=None):
+        return await self.request('PUT', path, json=json, timeout=timeout)
+
+    async def delete(self, path, json=None, timeout=None):
+        return await self.request('DELETE', path, json=json, timeout=timeout)
+
+    async def list_products(self, params):
+        return await self.get('/products', params=params)
+
+    async def get_product(self, product_id):
+        return await self.get(f'/products/{product_id}')
+
+    async def get_products(self, product_ids, fields=None):
+        return await self.get('/products/bulk', params={
+            'ids': ','.join(str(product_id) for product_id in product_ids),
+            'fields': fields
+        })
+
+    async def create_product(self, data):
+        return await self.post('/products', json=data)
+
+    async def update_product(self, product_id, data):
+        return await self.put(f'/products/{product_id}', json=data)
+
+    async def delete_product(self, product_id):
+        return await self.delete(f'/products/{product_id}')
+
+    async def adjust_stock(self, product_id, delta, version=None):
+        # POST: never retried, a repeated delta would be applied twice
+        body = {'delta': delta}
+        if version is not None:
+            body['version'] = version
+        return await self.post(f'/products/{product_id}/stock', json=body)
+
+    async def upsert_products(self, items):
+        return await self.post('/products/bulk', json=items, params={'upsert': 'true'})
+
+    async def search_products(self, params):
+        return await self.get('/products/search', params=params)
+
+    async def get_products_by_category(self, category, params):
+        return await self.get(f'/products/category/{category}', params=params)
+
+    async def get_categories(self, stats=False):
+        return await self.get('/products/categories', params={'stats': 'true'} if stats else None)
+
+    async def get_inventory_stats(self, params):
+        return await self.get('/products/stats', params=params)
+
+async def multi_search(client, queries, max_queries=20):
+    """Run several search/category queries concurrently through ``client``.
+
+    Works with any client offering ``list_products`` (HTTP or direct). Each
+    query is a dict with ``query`` and/or ``category`` plus optional paging
+    keys. Results come back in input order, one envelope per query, each
+    tagged with its index and whether it matched anything, so one bad or
+    empty query does not hide the others.
+    """
+    if not queries:
+        return {'status': 'error', 'message': 'At least one query is required'}
+    if len(queries) > max_queries:
+        return {'status': 'error', 'message': f'At most {max_queries} queries can be run in one call'}
+
+    async def run(query):
+        if not isinstance(query, dict) or not (query.get('query') or query.get('category')):
+            return {'status': 'error', 'message': 'Each query needs a "query" or "category"'}
+        unknown = sorted(set(query).difference(MULTI_SEARCH_KEYS))
+        if unknown:
+            return {'status': 'error', 'message': f"Unknown query keys: {', '.join(unknown)}"}
+        return await client.list_products({MULTI_SEARCH_KEYS[key]: value for key, value in query.items()})
+
+    outcomes = await asyncio.gather(*(run(query) for query in queries), return_exceptions=True)
+
+    results = []
+    for index, outcome in enumerate(outcomes):
+        if isinstance(outcome, Exception):
+            outcome = {'status': 'error', 'message': str(outcome)}
+        result = {'index': index, **outcome}
+        if outcome.get('status') == 'success':
+            result['found'] = bool(outcome['data']['items'])
+        results.append(result)
+
+    failed = sum(1 for result in results if result['status'] != 'success')
+    found = sum(1 for result in results if result.get('found'))
+    return {
+        'status': 'success',
+        'message': f'{len(queries) - failed} of {len(queries)} queries succeeded',
+        'data': {
+            'summary': {
+                'queries': len(queries),
+                'failed': failed,
+                'found': found,
+                'not_found': len(queries) - failed - found
+            },
+            'results': results
+        }
+    }
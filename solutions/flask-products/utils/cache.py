@@ -0,0 +1,259 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import current_app, request, make_response
+from marshmallow import ValidationError
+
+# Every cached entry carries this tag so bulk writes can drop them all at once
+ALL_PRODUCTS_TAG = 'products'
+
+# Validators stored with a cached body, so a hit is answered with the tag it was rendered under
+VALIDATOR_HEADERS = ('ETag', 'Last-Modified')
+
+class SimpleCacheBackend:
+    """In-process LRU cache with per-entry TTL."""
+
+    name = 'simple'
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_versions(self, tags):
+        with self._lock:
+            return [self._versions.get(tag, 0) for tag in tags]
+
+    def bump(self, tags):
+        with self._lock:
+            for tag in tags:
+                self._versions[tag] = self._versions.get(tag, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+class RedisCacheBackend:
+    """Cache shared between processes, stored in Redis (requires ``redis``)."""
+
+    name = 'redis'
+
+    def __init__(self, url, prefix='products-cache:'):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package (pip install redis)")
+        self._client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key):
+        raw = self._client.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key, value, ttl):
+        self._client.set(self.prefix + key, json.dumps(value), ex=max(int(ttl), 1))
+
+    def get_versions(self, tags):
+        values = self._client.mget([f'{self.prefix}tag:{tag}' for tag in tags])
+        return [int(value) if value is not None else 0 for value in values]
+
+    def bump(self, tags):
+        pipeline = self._client.pipeline()
+        for tag in tags:
+            pipeline.incr(f'{self.prefix}tag:{tag}')
+        pipeline.execute()
+
+    def clear(self):
+        for key in self._client.scan_iter(match=f'{self.prefix}*'):
+            self._client.delete(key)
+
+    def __len__(self):
+        return sum(1 for _ in self._client.scan_iter(match=f'{self.prefix}*'))
+
+def create_cache_backend(name, max_entries=1024, redis_url='redis://localhost:6379/0'):
+    """The backend for a CACHE_BACKEND setting; ``None`` for null (caching disabled)."""
+    if name == 'simple':
+        return SimpleCacheBackend(max_entries=max_entries)
+    if name == 'redis':
+        return RedisCacheBackend(redis_url)
+    return None
+
+def invalidate_tags(backend, tags):
+    """Bump the versions of ``tags`` (falsy and repeated entries skipped); returns how many were bumped."""
+    tags = list(dict.fromkeys(tag for tag in tags if tag))
+    if backend is None or not tags:
+        return 0
+    backend.bump(tags)
+    return len(tags)
+
+class ResponseCache:
+    """Caches rendered JSON responses of read endpoints.
+
+    Entries are keyed on the endpoint, its URL arguments and the validated
+    query parameters, and are tagged (per product, per category, ...).
+    Invalidating a tag bumps its version, which makes every entry stored
+    under an older version a miss, so writes only drop what they affect.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('CACHE_BACKEND', 'simple')
+        app.config.setdefault('CACHE_DEFAULT_TTL', 60)
+        app.config.setdefault('CACHE_MAX_ENTRIES', 1024)
+        app.config.setdefault('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+
+        app.extensions['response_cache'] = {
+            'backend': create_cache_backend(
+                app.config['CACHE_BACKEND'], app.config['CACHE_MAX_ENTRIES'], app.config['CACHE_REDIS_URL']
+            ),
+            'stats': {'hits': 0, 'misses': 0, 'stores': 0, 'invalidations': 0},
+            'lock': threading.Lock()
+        }
+
+    @property
+    def _state(self):
+        return current_app.extensions['response_cache']
+
+    @property
+    def backend(self):
+        return self._state['backend']
+
+    def _count(self, stat, amount=1):
+        state = self._state
+        with state['lock']:
+            state['stats'][stat] += amount
+
+    @staticmethod
+    def make_key(endpoint, view_args, params):
+        """Build a stable key from the endpoint and its normalized arguments."""
+        arguments = json.dumps([view_args, params], sort_keys=True, default=str, separators=(',', ':'))
+        return f'{endpoint}:{arguments}'
+
+    def get(self, key, versions):
+        """Return the cached response for ``key`` if its tag versions are current.
+
+        The response carries the ETag and Last-Modified it was rendered with
+        and answers the request's If-None-Match / If-Modified-Since itself
+        (304), so a hit never pairs an old body with a newer tag.
+        """
+        entry = self.backend.get(key)
+        if entry is None or entry['versions'] != versions:
+            self._count('misses')
+            return None
+
+        self._count('hits')
+        response = current_app.response_class(
+            entry['body'],
+            status=entry['status'],
+            mimetype=entry['mimetype'],
+            headers=entry.get('headers')
+        )
+        response.headers['X-Cache'] = 'HIT'
+        return response.make_conditional(request)
+
+    def set(self, key, versions, response, ttl=None):
+        """Store a rendered response together with the tag versions it was built at."""
+        self.backend.set(key, {
+            'versions': versions,
+            'body': response.get_data(as_text=True),
+            'status': response.status_code,
+            'mimetype': response.mimetype,
+            'headers': {name: response.headers[name] for name in VALIDATOR_HEADERS if name in response.headers}
+        }, ttl or current_app.config['CACHE_DEFAULT_TTL'])
+        self._count('stores')
+
+    def invalidate(self, *tags):
+        """Expire every entry carrying any of the given tags."""
+        bumped = invalidate_tags(self.backend, tags)
+        if bumped:
+            self._count('invalidations', bumped)
+
+    def invalidate_all(self):
+        """Expire every cached product response."""
+        self.invalidate(ALL_PRODUCTS_TAG)
+
+    def clear(self):
+        if self.backend is not None:
+            self.backend.clear()
+
+    def stats(self):
+        state = self._state
+        with state['lock']:
+            stats = dict(state['stats'])
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        stats['backend'] = self.backend.name if self.backend is not None else 'null'
+        stats['entries'] = len(self.backend) if self.backend is not None else 0
+        return stats
+
+    def cached(self, tags, schema=None):
+        """Cache a view's successful responses under the given tags.
+
+        ``tags`` is called with the validated query parameters and the view's
+        URL arguments and returns the tags to attach. When ``schema`` is given,
+        the query string is normalized through it to build the key; requests
+        that fail validation bypass the cache so the view can report the error.
+        Place it above ``conditional``: hits then skip the validator query, and
+        misses store the ETag the body was rendered with.
+        """
+        def decorator(view):
+            @wraps(view)
+            def wrapper(**view_args):
+                if self.backend is None:
+                    return view(**view_args)
+
+                params = {}
+                if schema is not None:
+                    try:
+                        params = schema.load(request.args)
+                    except ValidationError:
+                        return view(**view_args)
+
+                key = self.make_key(request.endpoint, view_args, params)
+                entry_tags = [ALL_PRODUCTS_TAG, *tags(params, **view_args)]
+
+                # Versions are read before rendering, so a write that lands
+                # meanwhile leaves this entry stale instead of hiding the write
+                versions = self.backend.get_versions(entry_tags)
+                response = self.get(key, versions)
+                if response is not None:
+                    return response
+
+                response = make_response(view(**view_args))
+                if response.status_code == 200 and not response.is_streamed:
+                    self.set(key, versions, response)
+                response.headers['X-Cache'] = 'MISS'
+                return response
+            return wrapper
+        return decorator
+
+response_cache = ResponseCache()
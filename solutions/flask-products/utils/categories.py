@@ -0,0 +1,158 @@
+from sqlalchemy import event, select, insert, delete, func
+from models.product import db, Product
+from models.category import CategorySummary
+
+summary_table = CategorySummary.__table__
+
+# Trigger bodies shared by insert/update/delete. Removing a product takes it
+# out of its old category's totals and re-reads that category's price range
+# (an index seek on ix_products_category_price_id); adding one folds it in.
+_SQLITE_REMOVE = """
+    UPDATE category_summary SET
+        product_count = product_count - 1,
+        total_stock = total_stock - old.stock_quantity,
+        min_price = (SELECT min(price) FROM products WHERE category = old.category),
+        max_price = (SELECT max(price) FROM products WHERE category = old.category)
+    WHERE name = old.category;
+    DELETE FROM category_summary WHERE name = old.category AND product_count <= 0;
+"""
+
+_SQLITE_ADD = """
+    INSERT INTO category_summary (name, product_count, total_stock, min_price, max_price)
+    VALUES (new.category, 1, new.stock_quantity, new.price, new.price)
+    ON CONFLICT (name) DO UPDATE SET
+        product_count = product_count + 1,
+        total_stock = total_stock + excluded.total_stock,
+        min_price = min(min_price, excluded.min_price),
+        max_price = max(max_price, excluded.max_price);
+"""
+
+class SQLiteCategoryTriggers:
+    """Row triggers keeping ``category_summary`` in step with ``products``."""
+
+    prefix = 'category_summary'
+
+    def install(self, connection):
+        connection.exec_driver_sql(f"""
+            CREATE TRIGGER IF NOT EXISTS {self.prefix}_ai AFTER INSERT ON products BEGIN
+                {_SQLITE_ADD}
+            END
+        """)
+        connection.exec_driver_sql(f"""
+            CREATE TRIGGER IF NOT EXISTS {self.prefix}_ad AFTER DELETE ON products BEGIN
+                {_SQLITE_REMOVE}
+            END
+        """)
+        connection.exec_driver_sql(f"""
+            CREATE TRIGGER IF NOT EXISTS {self.prefix}_au
+            AFTER UPDATE OF category, price, stock_quantity ON products BEGIN
+                {_SQLITE_REMOVE}
+                {_SQLITE_ADD}
+            END
+        """)
+
+    def uninstall(self, connection):
+        for suffix in ('ai', 'ad', 'au'):
+            connection.exec_driver_sql(f"DROP TRIGGER IF EXISTS {self.prefix}_{suffix}")
+
+class PostgresCategoryTriggers:
+    """One PL/pgSQL row trigger keeping ``category_summary`` in step with ``products``."""
+
+    function_name = 'category_summary_sync'
+
+    def install(self, connection):
+        connection.exec_driver_sql(f"""
+            CREATE OR REPLACE FUNCTION {self.function_name}() RETURNS trigger AS $$
+            BEGIN
+                IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                    UPDATE category_summary SET
+                        product_count = product_count - 1,
+                        total_stock = total_stock - OLD.stock_quantity,
+                        min_price = (SELECT min(price) FROM products WHERE category = OLD.category),
+                        max_price = (SELECT max(price) FROM products WHERE category = OLD.category)
+                    WHERE name = OLD.category;
+                    DELETE FROM category_summary WHERE name = OLD.category AND product_count <= 0;
+                END IF;
+                IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                    INSERT INTO category_summary AS summary (name, product_count, total_stock, min_price, max_price)
+                    VALUES (NEW.category, 1, NEW.stock_quantity, NEW.price, NEW.price)
+                    ON CONFLICT (name) DO UPDATE SET
+                        product_count = summary.product_count + 1,
+                        total_stock = summary.total_stock + EXCLUDED.total_stock,
+                        min_price = LEAST(summary.min_price, EXCLUDED.min_price),
+                        max_price = GREATEST(summary.max_price, EXCLUDED.max_price);
+                END IF;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+        """)
+        connection.exec_driver_sql(f"DROP TRIGGER IF EXISTS {self.function_name} ON products")
+        connection.exec_driver_sql(f"""
+            CREATE TRIGGER {self.function_name}
+            AFTER INSERT OR DELETE OR UPDATE OF category, price, stock_quantity ON products
+            FOR EACH ROW EXECUTE FUNCTION {self.function_name}()
+        """)
+
+    def uninstall(self, connection):
+        connection.exec_driver_sql(f"DROP TRIGGER IF EXISTS {self.function_name} ON products")
+        connection.exec_driver_sql(f"DROP FUNCTION IF EXISTS {self.function_name}()")
+
+CATEGORY_TRIGGERS = {
+    'sqlite': SQLiteCategoryTriggers,
+    'postgresql': PostgresCategoryTriggers
+}
+
+def _summary_select():
+    """Aggregate ``products`` into ``category_summary``'s columns."""
+    return select(
+        Product.category.label('name'),
+        func.count(Product.id).label('product_count'),
+        func.coalesce(func.sum(Product.stock_quantity), 0).label('total_stock'),
+        func.min(Product.price).label('min_price'),
+        func.max(Product.price).label('max_price')
+    ).group_by(Product.category)
+
+def category_summary_source(dialect_name):
+    """The selectable to read category totals from.
+
+    On databases with triggers this is the maintained ``category_summary``
+    table; elsewhere it falls back to a GROUP BY over ``products`` with the
+    same columns, so callers read either the same way.
+    """
+    if dialect_name in CATEGORY_TRIGGERS:
+        return summary_table
+    return _summary_select().subquery('category_summary')
+
+def rebuild_category_summary(connection):
+    """Install the triggers if missing and recompute every row from ``products``."""
+    triggers = CATEGORY_TRIGGERS.get(connection.dialect.name)
+    if triggers is None:
+        return
+    triggers().install(connection)
+    connection.execute(delete(summary_table))
+    connection.execute(insert(summary_table).from_select(
+        ['name', 'product_count', 'total_stock', 'min_price', 'max_price'], _summary_select()
+    ))
+
+def serialize_category_stats(row):
+    """Convert a category summary row to a JSON-ready dict."""
+    return {
+        'name': row.name,
+        'product_count': row.product_count,
+        'total_stock': int(row.total_stock),
+        'min_price': float(row.min_price) if row.min_price is not None else None,
+        'max_price': float(row.max_price) if row.max_price is not None else None
+    }
+
+@event.listens_for(db.metadata, 'after_create')
+def _install_category_triggers(target, connection, tables=(), **kwargs):
+    # Fires once every table exists; a summary table added next to an existing
+    # products table (create_all on an older database) is filled from it
+    if summary_table in tables:
+        rebuild_category_summary(connection)
+
+@event.listens_for(db.metadata, 'before_drop')
+def _uninstall_category_triggers(target, connection, **kwargs):
+    triggers = CATEGORY_TRIGGERS.get(connection.dialect.name)
+    if triggers is not None and Product.__table__ in kwargs.get('tables', ()):
+        triggers().uninstall(connection)
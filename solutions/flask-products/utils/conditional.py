@@ -0,0 +1,87 @@
+import hashlib
+import json
+from datetime import timezone
+from functools import wraps
+from flask import current_app, request, make_response
+from marshmallow import ValidationError
+
+def make_etag(*parts):
+    """Hash the given parts into a strong entity tag."""
+    raw = json.dumps(parts, sort_keys=True, default=str, separators=(',', ':'))
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+def product_etag(product):
+    """The entity tag of one product's current version.
+
+    Sent with product GETs and checked against ``If-Match`` on writes; the
+    creation time keeps a reused id from matching a deleted product's tag.
+    """
+    return make_etag('product', product.id, product.version, product.created_at.isoformat())
+
+def if_match_failed(if_match, etag):
+    """True when an ``If-Match`` header was sent and none of its tags is ``etag``.
+
+    ``if_match`` is a werkzeug ``ETags`` (``request.if_match``, or parsed
+    from the header with ``parse_etags``); ``*`` matches any current entity.
+    """
+    return bool(if_match) and not if_match.contains(etag)
+
+def _as_utc(value):
+    """Treat naive datetimes from the database as UTC, at HTTP-date precision."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.replace(microsecond=0)
+
+def _not_modified(etag, last_modified):
+    """Check the request's If-None-Match / If-Modified-Since validators."""
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+    if request.if_modified_since and last_modified is not None:
+        return last_modified <= request.if_modified_since
+    return False
+
+def conditional(validator, schema=None, scoped=True):
+    """Answer conditional GETs with 304 before the view renders anything.
+
+    ``validator`` is called with the validated query parameters and the
+    view's URL arguments and returns ``(etag_parts, last_modified)`` from a
+    cheap query, or ``None`` when there is nothing to validate (the view
+    then runs as usual, e.g. to return a 404). The ETag also covers the
+    endpoint and parameters, so different pages never share a tag. With
+    ``scoped=False`` the validator returns the finished tag instead of its
+    parts, for tags that writes must recompute (see ``product_etag``).
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(**view_args):
+            params = {}
+            if schema is not None:
+                try:
+                    params = schema.load(request.args)
+                except ValidationError:
+                    return view(**view_args)
+
+            validated = validator(params, **view_args)
+            if validated is None:
+                return view(**view_args)
+
+            etag, last_modified = validated
+            if scoped:
+                etag = make_etag(request.endpoint, view_args, params, *etag)
+            last_modified = _as_utc(last_modified)
+
+            if _not_modified(etag, last_modified):
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(view(**view_args))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag)
+            if last_modified is not None:
+                response.last_modified = last_modified
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,69 @@
+import json
+from sqlalchemy import select, func
+from utils.cache import SimpleCacheBackend
+from utils.categories import category_summary_source
+
+# List filters a total depends on (sort and position do not change it)
+COUNTED_FILTERS = ('q', 'category')
+
+class CountCache:
+    """Recently counted totals per filter set, reused by ``count=estimate`` pages.
+
+    Entries are not invalidated by writes; they expire after ``ttl`` seconds,
+    which is the staleness an estimate accepts.
+    """
+
+    def __init__(self, ttl=60, max_entries=1024):
+        self.ttl = ttl
+        self._backend = SimpleCacheBackend(max_entries=max_entries)
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(ttl=config.get('COUNT_ESTIMATE_TTL', 60), max_entries=config.get('COUNT_ESTIMATE_MAX_ENTRIES', 1024))
+
+    @staticmethod
+    def key(filters):
+        return json.dumps({name: filters.get(name) for name in COUNTED_FILTERS}, sort_keys=True)
+
+    def get(self, filters):
+        return self._backend.get(self.key(filters))
+
+    def set(self, filters, total):
+        self._backend.set(self.key(filters), total, self.ttl)
+
+def summary_total_statement(dialect_name, category=None):
+    """Total products overall or in one category, from the category summary."""
+    summary = category_summary_source(dialect_name)
+    statement = select(func.coalesce(func.sum(summary.c.product_count), 0))
+    if category:
+        statement = statement.where(summary.c.name == category)
+    return statement
+
+def planner_estimate_sql(statement, dialect):
+    """``EXPLAIN`` SQL and parameters for ``statement``, for the DBAPI directly.
+
+    Only PostgreSQL's planner estimates are used; returns ``None`` elsewhere.
+    """
+    if dialect.name != 'postgresql':
+        return None
+    compiled = statement.order_by(None).compile(dialect=dialect)
+    return f'EXPLAIN (FORMAT JSON) {compiled}', compiled.params
+
+def planner_rows(plan):
+    """Read the estimated row count from PostgreSQL's JSON plan output."""
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+def bound_estimate(page, estimate):
+    """Fit an estimated total to what the page itself proves.
+
+    The last offset page gives the exact total; otherwise the total is at
+    least the rows up to this page plus one.
+    """
+    if page.page is None:
+        return max(estimate, len(page.items)), True
+    seen = (page.page - 1) * page.per_page + len(page.items)
+    if not page.has_next and (page.items or page.page == 1):
+        return seen, False
+    return max(estimate, seen + (1 if page.has_next else 0)), True
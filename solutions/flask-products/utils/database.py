@@ -0,0 +1,72 @@
+import os
+from urllib.parse import quote
+from sqlalchemy import create_engine, event
+from models.product import db
+from models.session import READ_ENGINE_KEY
+
+def apply_sqlite_pragmas(engine, pragmas):
+    """Run ``PRAGMA name=value`` for each pragma on every new SQLite connection."""
+
+    @event.listens_for(engine, 'connect')
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f'PRAGMA {name}={value}')
+        finally:
+            cursor.close()
+
+def read_only_sqlite_uri(url):
+    """URI opening the same SQLite file read-only; ``None`` for in-memory databases."""
+    if url.database in (None, '', ':memory:'):
+        return None
+    return f'sqlite:///file:{quote(os.path.abspath(url.database))}?mode=ro&uri=true'
+
+class DatabaseTuning:
+    """Flask extension tuning SQLite connections and creating the read-only pool.
+
+    With SQLITE_TUNING, every SQLite connection gets SQLITE_PRAGMAS (WAL,
+    synchronous=NORMAL, mmap, cache size, busy timeout), so readers no longer
+    block the writer or each other. With SQLALCHEMY_READ_POOL, views run
+    under ``models.session.read_only()`` use a second engine: the one at
+    SQLALCHEMY_READ_DATABASE_URI (a replica) or, for a SQLite file, the same
+    file opened read-only. Must be initialized after ``db``.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('SQLITE_TUNING', False)
+        app.config.setdefault('SQLITE_PRAGMAS', {})
+        app.config.setdefault('SQLALCHEMY_READ_POOL', False)
+        app.config.setdefault('SQLALCHEMY_READ_DATABASE_URI', None)
+
+        with app.app_context():
+            engine = db.engine
+
+        tune = engine.dialect.name == 'sqlite' and app.config['SQLITE_TUNING']
+        if tune:
+            apply_sqlite_pragmas(engine, app.config['SQLITE_PRAGMAS'])
+
+        read_engine = None
+        if app.config['SQLALCHEMY_READ_POOL']:
+            read_uri = app.config['SQLALCHEMY_READ_DATABASE_URI']
+            if read_uri is None and engine.dialect.name == 'sqlite':
+                read_uri = read_only_sqlite_uri(engine.url)
+            if read_uri is not None:
+                read_engine = create_engine(
+                    read_uri,
+                    echo=app.config.get('SQLALCHEMY_ECHO', False),
+                    **app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {})
+                )
+
+        if read_engine is not None and tune and read_engine.dialect.name == 'sqlite':
+            # Only a writer can switch the journal mode; WAL is stored in the file anyway
+            pragmas = {name: value for name, value in app.config['SQLITE_PRAGMAS'].items() if name != 'journal_mode'}
+            apply_sqlite_pragmas(read_engine, {**pragmas, 'query_only': 'ON'})
+
+        app.extensions[READ_ENGINE_KEY] = read_engine
+
+database_tuning = DatabaseTuning()
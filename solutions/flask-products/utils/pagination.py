@@ -0,0 +1,251 @@
+import base64
+import json
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy import func, select, tuple_
+
+CURSOR_DIRECTIONS = ('next', 'prev')
+
+class Page:
+    """A page of results produced by either offset or keyset pagination."""
+
+    def __init__(self, items, per_page, page=None, total=None,
+                 next_cursor=None, prev_cursor=None, has_next=None):
+        self.items = items
+        self.per_page = per_page
+        self.page = page
+        self.total = total
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+        # Known without a total when one extra row was fetched
+        self.has_next = has_next
+        # Set when ``total`` is an estimate rather than a count
+        self.total_estimated = False
+
+def _encode_value(value):
+    """Convert a sort key value into a JSON-safe representation."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+def _decode_value(value, python_type):
+    """Convert a JSON cursor value back into the sort column's Python type.
+
+    Raises ``ValueError`` for a value the column could not hold, e.g. from an
+    edited cursor.
+    """
+    if value is None:
+        return None
+    try:
+        if python_type is datetime:
+            return datetime.fromisoformat(value)
+        if python_type is Decimal:
+            if isinstance(value, bool) or not isinstance(value, (str, int)):
+                raise TypeError(value)
+            decoded = Decimal(value)
+            if not decoded.is_finite():
+                raise ValueError(value)
+            return decoded
+        if isinstance(value, bool) or not isinstance(value, python_type):
+            raise TypeError(value)
+        return value
+    except (ValueError, TypeError, ArithmeticError):
+        raise ValueError('Cursor is malformed.')
+
+def encode_cursor(sort_value, row_id, sort_by, order, direction='next'):
+    """Create an opaque cursor pointing just past the given (sort_value, id) key."""
+    payload = {
+        'k': [_encode_value(sort_value), row_id],
+        's': sort_by,
+        'o': order,
+        'd': direction
+    }
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor, sort_by, order, python_type=None):
+    """Decode a cursor and check it was issued for the same sort.
+
+    Returns the ``(sort_value, id)`` key and the direction; with
+    ``python_type`` (the sort column's) the sort value is converted to it.
+    Raises ``ValueError`` if the cursor is malformed or belongs to another
+    ordering.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        sort_value, row_id = payload['k']
+        direction = payload['d']
+    except (ValueError, TypeError, KeyError, UnicodeError):
+        raise ValueError('Cursor is malformed.')
+
+    if not isinstance(row_id, int) or direction not in CURSOR_DIRECTIONS:
+        raise ValueError('Cursor is malformed.')
+
+    if payload.get('s') != sort_by or payload.get('o') != order:
+        raise ValueError('Cursor does not match the requested sort_by and order.')
+
+    if python_type is not None:
+        sort_value = _decode_value(sort_value, python_type)
+
+    return (sort_value, row_id), direction
+
+def apply_sort(query, model, sort_by, order):
+    """Order a query by the sort column with the primary key as tie-breaker."""
+    sort_column = getattr(model, sort_by)
+    if order == 'desc':
+        return query.order_by(sort_column.desc(), model.id.desc())
+    return query.order_by(sort_column.asc(), model.id.asc())
+
+def count_statement(statement):
+    """A ``SELECT count(*)`` over the rows of ``statement``, ignoring its ordering."""
+    return select(func.count()).select_from(statement.order_by(None).subquery())
+
+def cursors_for(items, sort_by, order, has_prev, has_next):
+    """Build the prev/next cursors for a page of rows ordered by (sort_by, id)."""
+    if not items:
+        return None, None
+
+    first, last = items[0], items[-1]
+    prev_cursor = encode_cursor(getattr(first, sort_by), first.id, sort_by, order, 'prev') if has_prev else None
+    next_cursor = encode_cursor(getattr(last, sort_by), last.id, sort_by, order, 'next') if has_next else None
+    return prev_cursor, next_cursor
+
+def _offset_page(items, total, sort_by, order, page, per_page, has_next=None):
+    has_prev = page > 1
+    if has_next is None:
+        has_next = page < (total + per_page - 1) // per_page
+    prev_cursor, next_cursor = None, None
+    if sort_by is not None:
+        prev_cursor, next_cursor = cursors_for(items, sort_by, order, has_prev, has_next)
+
+    return Page(
+        items=items,
+        per_page=per_page,
+        page=page,
+        total=total,
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor,
+        has_next=has_next
+    )
+
+def _overfetched_offset_page(rows, sort_by, order, page, per_page):
+    return _offset_page(rows[:per_page], None, sort_by, order, page, per_page, has_next=len(rows) > per_page)
+
+def offset_paginate(query, model, sort_by, order, page, per_page, with_total=True, total=None):
+    """Paginate with LIMIT/OFFSET.
+
+    With ``with_total`` the total is counted exactly (a second query over the
+    filtered set), unless the caller already counted it and passes ``total``;
+    without it one extra row is fetched instead, which is enough to tell
+    whether another page follows. Pass ``sort_by=None`` for a query that is
+    already ordered (for example by relevance); such pages carry no cursors.
+    """
+    if sort_by is not None:
+        query = apply_sort(query, model, sort_by, order)
+
+    if not with_total:
+        rows = query.limit(per_page + 1).offset((page - 1) * per_page).all()
+        return _overfetched_offset_page(rows, sort_by, order, page, per_page)
+
+    if total is not None:
+        rows = query.limit(per_page).offset((page - 1) * per_page).all()
+        return _offset_page(rows, total, sort_by, order, page, per_page)
+
+    paginated = query.paginate(
+        page=page,
+        per_page=per_page,
+        error_out=False
+    )
+
+    return _offset_page(paginated.items, paginated.total, sort_by, order, page, per_page)
+
+async def async_offset_paginate(session, statement, model, sort_by, order, page, per_page, with_total=True):
+    """``offset_paginate`` for a ``select()`` run on an ``AsyncSession``."""
+    if sort_by is not None:
+        statement = apply_sort(statement, model, sort_by, order)
+
+    if not with_total:
+        result = await session.execute(statement.limit(per_page + 1).offset((page - 1) * per_page))
+        return _overfetched_offset_page(result.all(), sort_by, order, page, per_page)
+
+    total = await session.scalar(count_statement(statement))
+    result = await session.execute(statement.limit(per_page).offset((page - 1) * per_page))
+
+    return _offset_page(result.all(), total, sort_by, order, page, per_page)
+
+def _keyset_seek(query, model, sort_by, order, cursor):
+    """Restrict a query to rows past ``cursor`` and order it in scan direction.
+
+    Returns the query and whether it walks backwards from a ``prev`` cursor.
+    """
+    sort_column = getattr(model, sort_by)
+    key = tuple_(sort_column, model.id)
+    backwards = False
+
+    if cursor:
+        bound, direction = decode_cursor(cursor, sort_by, order, sort_column.type.python_type)
+        backwards = direction == 'prev'
+
+        # Walking backwards flips both the comparison and the scan direction
+        if (order == 'desc') != backwards:
+            query = query.filter(key < bound)
+        else:
+            query = query.filter(key > bound)
+
+    scan_order = order
+    if backwards:
+        scan_order = 'asc' if order == 'desc' else 'desc'
+
+    return apply_sort(query, model, sort_by, scan_order), backwards
+
+def _keyset_page(rows, sort_by, order, per_page, cursor, backwards, total):
+    has_more = len(rows) > per_page
+    items = rows[:per_page]
+
+    if backwards:
+        items.reverse()
+        has_prev, has_next = has_more, True
+    else:
+        has_prev, has_next = cursor is not None, has_more
+
+    prev_cursor, next_cursor = cursors_for(items, sort_by, order, has_prev, has_next)
+
+    return Page(
+        items=items,
+        per_page=per_page,
+        total=total,
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor
+    )
+
+def keyset_paginate(query, model, sort_by, order, per_page, cursor=None, with_total=False, total=None):
+    """Paginate by seeking past the (sort_by, id) key encoded in ``cursor``.
+
+    Each page is a single range scan over the (sort column, id) ordering, so
+    its cost does not grow with the page's position. One extra row is fetched
+    to tell whether another page follows; the total is only counted when
+    ``with_total`` is set and no ``total`` is passed in.
+    """
+    if not with_total:
+        total = None
+    elif total is None:
+        total = query.order_by(None).count()
+
+    query, backwards = _keyset_seek(query, model, sort_by, order, cursor)
+    rows = query.limit(per_page + 1).all()
+
+    return _keyset_page(rows, sort_by, order, per_page, cursor, backwards, total)
+
+async def async_keyset_paginate(session, statement, model, sort_by, order, per_page, cursor=None, with_total=False):
+    """``keyset_paginate`` for a ``select()`` run on an ``AsyncSession``."""
+    total = None
+    if with_total:
+        total = await session.scalar(count_statement(statement))
+
+    statement, backwards = _keyset_seek(statement, model, sort_by, order, cursor)
+    result = await session.execute(statement.limit(per_page + 1))
+
+    return _keyset_page(result.all(), sort_by, order, per_page, cursor, backwards, total)
@@ -1,27 +1,34 @@
 from flask import jsonify
 from marshmallow import ValidationError
+from utils.serializers import json_response
 
-def success_response(data=None, message="Success", status_code=200):
-    """Create a standardized success response."""
+def success_body(data=None, message="Success"):
+    """The standard success envelope, for callers that build their own response."""
     response = {
         'status': 'success',
         'message': message
     }
     if data is not None:
         response['data'] = data
-    
-    return jsonify(response), status_code
+    return response
 
-def error_response(message="An error occurred", errors=None, status_code=400):
-    """Create a standardized error response."""
+def success_response(data=None, message="Success", status_code=200):
+    """Create a standardized success response."""
+    return jsonify(success_body(data, message)), status_code
+
+def error_body(message="An error occurred", errors=None):
+    """The standard error envelope, for callers that build their own response."""
     response = {
         'status': 'error',
         'message': message
     }
     if errors:
         response['errors'] = errors
-    
-    return jsonify(response), status_code
+    return response
+
+def error_response(message="An error occurred", errors=None, status_code=400):
+    """Create a standardized error response."""
+    return jsonify(error_body(message, errors)), status_code
 
 def validation_error_response(validation_error):
     """Create a response for validation errors."""
@@ -31,32 +38,77 @@ def validation_error_response(validation_error):
         status_code=400
     )
 
-def paginated_response(items, page, per_page, total, endpoint=None, **kwargs):
-    """Create a paginated response."""
-    has_prev = page > 1
-    has_next = page < (total + per_page - 1) // per_page
+def pagination_info(page, per_page, total, next_cursor=None, prev_cursor=None,
+                    has_next=None, total_estimated=False):
+    """Build the pagination block of a list response.
     
-    pagination_info = {
+    Offset pages pass a ``page`` number; keyset pages pass ``page=None`` and
+    are navigated with the opaque ``next_cursor``/``prev_cursor`` tokens.
+    ``total`` is ``None`` when counting was skipped (``count=none``), in which
+    case offset pages pass ``has_next`` from an over-fetched row, and
+    ``total_estimated`` marks a total that was estimated (``count=estimate``).
+    """
+    pages = (total + per_page - 1) // per_page if total is not None else None
+    if page is None:
+        has_prev = prev_cursor is not None
+        has_next = next_cursor is not None
+    else:
+        has_prev = page > 1
+        if has_next is None:
+            has_next = page < pages
+    
+    return {
         'page': page,
         'per_page': per_page,
         'total': total,
-        'pages': (total + per_page - 1) // per_page,
+        'total_estimated': total_estimated,
+        'pages': pages,
         'has_prev': has_prev,
-        'has_next': has_next
+        'has_next': has_next,
+        'next_cursor': next_cursor,
+        'prev_cursor': prev_cursor
     }
+
+def paginated_body(items, pagination):
+    """The body of a paginated response, for callers that do not need HTTP."""
+    return success_body({
+        'items': items,
+        'pagination': pagination
+    }, "Success")
+
+def navigation_params(query_params, **url_params):
+    """Query parameters to carry into prev/next URLs: the filters and sort, not the position."""
+    for key, value in query_params.items():
+        if key not in ('page', 'per_page', 'cursor', 'fieldset'):
+            url_params.setdefault(key, value)
+    if query_params.get('fieldset'):
+        url_params.setdefault('fields', ','.join(query_params['fieldset']))
+    return url_params
+
+def add_navigation_urls(info, build_url, **kwargs):
+    """Add ``prev_url``/``next_url`` to a pagination block; ``build_url(**params)`` makes each URL."""
+    page, per_page = info['page'], info['per_page']
+    if page is None:
+        info['prev_url'] = build_url(cursor=info['prev_cursor'], per_page=per_page, **kwargs) if info['has_prev'] else None
+        info['next_url'] = build_url(cursor=info['next_cursor'], per_page=per_page, **kwargs) if info['has_next'] else None
+    else:
+        info['prev_url'] = build_url(page=page-1, per_page=per_page, **kwargs) if info['has_prev'] else None
+        info['next_url'] = build_url(page=page+1, per_page=per_page, **kwargs) if info['has_next'] else None
+    return info
+
+def paginated_response(items, page, per_page, total, endpoint=None,
+                       next_cursor=None, prev_cursor=None, has_next=None,
+                       total_estimated=False, **kwargs):
+    """Create a paginated response (see ``pagination_info`` for the arguments)."""
+    info = pagination_info(page, per_page, total, next_cursor, prev_cursor, has_next, total_estimated)
     
     # Add navigation URLs if endpoint is provided
     if endpoint:
         from flask import url_for
-        pagination_info['prev_url'] = url_for(endpoint, page=page-1, per_page=per_page, **kwargs) if has_prev else None
-        pagination_info['next_url'] = url_for(endpoint, page=page+1, per_page=per_page, **kwargs) if has_next else None
+        add_navigation_urls(info, lambda **params: url_for(endpoint, **params), **kwargs)
     
-    return success_response(
-        data={
-            'items': items,
-            'pagination': pagination_info
-        }
-    )
+    # List pages are the hot path: encode them with the fast JSON encoder
+    return json_response(paginated_body(items, info))
 
 def not_found_response(resource="Resource"):
     """Create a not found response."""
@@ -0,0 +1,266 @@
+import re
+import sqlite3
+from functools import lru_cache
+from flask import current_app, has_app_context
+from sqlalchemy import event, or_, func, literal_column, table, column, text
+from models.product import db, Product
+
+# Relative weight of each indexed column when ranking matches
+NAME_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+SKU_WEIGHT = 5.0
+
+def search_tokens(term):
+    """Split a user search term into word tokens."""
+    return re.findall(r'\w+', term or '', re.UNICODE)
+
+class LikeSearchBackend:
+    """Substring search with ILIKE; works everywhere but scans every row."""
+
+    name = 'like'
+
+    def install(self, connection):
+        pass
+
+    def is_installed(self, connection):
+        return True
+
+    def uninstall(self, connection):
+        pass
+
+    def rebuild(self, connection):
+        pass
+
+    def filter(self, query, term):
+        pattern = f'%{term}%'
+        return query.filter(or_(
+            Product.name.ilike(pattern),
+            Product.description.ilike(pattern),
+            Product.sku.ilike(pattern)
+        ))
+
+    def order_by_relevance(self, query, term):
+        # Without an index there is no score, so prefer name matches
+        return query.order_by(Product.name.ilike(f'%{term}%').desc(), Product.id.desc())
+
+class SQLiteFTS5Backend:
+    """Full-text search backed by an external-content FTS5 table.
+
+    ``products_fts`` indexes name, description and sku and is kept in sync
+    with ``products`` by triggers, so bulk Core statements stay indexed too.
+    Every token of the search term is matched as a prefix and results can
+    be ranked with BM25.
+    """
+
+    name = 'fts5'
+    table_name = 'products_fts'
+
+    def install(self, connection):
+        connection.exec_driver_sql(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {self.table_name} USING fts5(
+                name, description, sku,
+                content='products', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2',
+                prefix='2 3'
+            )
+        """)
+        connection.exec_driver_sql(f"""
+            CREATE TRIGGER IF NOT EXISTS {self.table_name}_ai AFTER INSERT ON products BEGIN
+                INSERT INTO {self.table_name}(rowid, name, description, sku)
+                VALUES (new.id, new.name, new.description, new.sku);
+            END
+        """)
+        connection.exec_driver_sql(f"""
+            CREATE TRIGGER IF NOT EXISTS {self.table_name}_ad AFTER DELETE ON products BEGIN
+                INSERT INTO {self.table_name}({self.table_name}, rowid, name, description, sku)
+                VALUES ('delete', old.id, old.name, old.description, old.sku);
+            END
+        """)
+        connection.exec_driver_sql(f"""
+            CREATE TRIGGER IF NOT EXISTS {self.table_name}_au AFTER UPDATE OF name, description, sku ON products BEGIN
+                INSERT INTO {self.table_name}({self.table_name}, rowid, name, description, sku)
+                VALUES ('delete', old.id, old.name, old.description, old.sku);
+                INSERT INTO {self.table_name}(rowid, name, description, sku)
+                VALUES (new.id, new.name, new.description, new.sku);
+            END
+        """)
+
+    def is_installed(self, connection):
+        """The FTS table and its three sync triggers all exist."""
+        names = (self.table_name, f'{self.table_name}_ai', f'{self.table_name}_ad', f'{self.table_name}_au')
+        found = connection.execute(
+            text("SELECT name FROM sqlite_master WHERE name IN (:t, :ai, :ad, :au)"),
+            dict(zip(('t', 'ai', 'ad', 'au'), names))
+        ).scalars().all()
+        return len(found) == len(names)
+
+    def uninstall(self, connection):
+        connection.exec_driver_sql(f"DROP TABLE IF EXISTS {self.table_name}")
+
+    def rebuild(self, connection):
+        self.install(connection)
+        connection.exec_driver_sql(f"INSERT INTO {self.table_name}({self.table_name}) VALUES ('rebuild')")
+
+    def match_expression(self, term):
+        """Build an FTS5 query matching every token as a prefix."""
+        return ' '.join(f'"{token}"*' for token in search_tokens(term))
+
+    def filter(self, query, term):
+        if not search_tokens(term):
+            return LikeSearchBackend().filter(query, term)
+
+        fts = table(self.table_name, column('rowid'))
+        return query.join(fts, fts.c.rowid == Product.id).filter(
+            literal_column(self.table_name).op('MATCH')(self.match_expression(term))
+        )
+
+    def order_by_relevance(self, query, term):
+        if not search_tokens(term):
+            return LikeSearchBackend().order_by_relevance(query, term)
+
+        # bm25() is lower for better matches
+        rank = func.bm25(literal_column(self.table_name), NAME_WEIGHT, DESCRIPTION_WEIGHT, SKU_WEIGHT)
+        return query.order_by(rank.asc(), Product.id.desc())
+
+class PostgresFullTextBackend:
+    """Full-text search using a GIN-indexed tsvector expression."""
+
+    name = 'postgres'
+    index_name = 'ix_products_search_tsv'
+
+    # Must match the indexed expression exactly for the planner to use it
+    document = literal_column(
+        "to_tsvector('simple', coalesce(products.name, '') || ' ' || "
+        "coalesce(products.description, '') || ' ' || products.sku)"
+    )
+
+    def install(self, connection):
+        connection.execute(text(
+            f"CREATE INDEX IF NOT EXISTS {self.index_name} ON products USING GIN "
+            "(to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(description, '') || ' ' || sku))"
+        ))
+
+    def is_installed(self, connection):
+        return connection.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {'name': self.index_name}).scalar()
+
+    def uninstall(self, connection):
+        connection.execute(text(f"DROP INDEX IF EXISTS {self.index_name}"))
+
+    def rebuild(self, connection):
+        self.install(connection)
+
+    def ts_query(self, term):
+        return func.to_tsquery(
+            literal_column("'simple'"),
+            ' & '.join(f'{token}:*' for token in search_tokens(term))
+        )
+
+    def filter(self, query, term):
+        if not search_tokens(term):
+            return LikeSearchBackend().filter(query, term)
+        return query.filter(self.document.op('@@')(self.ts_query(term)))
+
+    def order_by_relevance(self, query, term):
+        if not search_tokens(term):
+            return LikeSearchBackend().order_by_relevance(query, term)
+        return query.order_by(func.ts_rank_cd(self.document, self.ts_query(term)).desc(), Product.id.desc())
+
+@lru_cache(maxsize=None)
+def _fts5_available():
+    """Check whether the bundled SQLite library was compiled with FTS5."""
+    try:
+        connection = sqlite3.connect(':memory:')
+        connection.execute('CREATE VIRTUAL TABLE probe USING fts5(content)')
+        connection.close()
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+SEARCH_BACKENDS = {
+    'like': LikeSearchBackend,
+    'fts5': SQLiteFTS5Backend,
+    'postgres': PostgresFullTextBackend
+}
+
+def get_search_backend(dialect_name, preferred='auto'):
+    """Pick the search backend for a database dialect.
+
+    ``preferred`` may name a backend explicitly; ``auto`` uses the native
+    full-text engine when the database has one and falls back to ILIKE.
+    """
+    if preferred != 'auto':
+        return SEARCH_BACKENDS[preferred]()
+    if dialect_name == 'sqlite' and _fts5_available():
+        return SQLiteFTS5Backend()
+    if dialect_name == 'postgresql':
+        return PostgresFullTextBackend()
+    return LikeSearchBackend()
+
+def configured_search_backend(dialect_name):
+    """The backend ``SEARCH_BACKEND`` selects (``auto`` outside an app context)."""
+    preferred = current_app.config.get('SEARCH_BACKEND', 'auto') if has_app_context() else 'auto'
+    return get_search_backend(dialect_name, preferred)
+
+def include_in_migrations(object, name, type_, reflected, compare_to):
+    """Hide the search index's own tables from Alembic autogenerate."""
+    return not (type_ == 'table' and name.startswith(SQLiteFTS5Backend.table_name))
+
+@event.listens_for(Product.__table__, 'after_create')
+def _install_search_index(target, connection, **kwargs):
+    configured_search_backend(connection.dialect.name).install(connection)
+
+@event.listens_for(Product.__table__, 'before_drop')
+def _uninstall_search_index(target, connection, **kwargs):
+    configured_search_backend(connection.dialect.name).uninstall(connection)
+
+class ProductSearch:
+    """Flask extension giving routes access to the configured search backend."""
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('SEARCH_BACKEND', 'auto')
+        app.extensions['product_search'] = None
+
+        @app.cli.command('rebuild-search-index')
+        def rebuild_search_index():
+            """Create the search index if missing and re-index all products."""
+            backend = configured_search_backend(db.engine.dialect.name)
+            with db.engine.begin() as connection:
+                backend.rebuild(connection)
+            current_app.extensions['product_search'] = None
+            print(f"Search index rebuilt using the '{backend.name}' backend")
+
+    @property
+    def backend(self):
+        """The configured backend, or LIKE search while its index does not exist.
+
+        Databases created before the index was added (or with another
+        SEARCH_BACKEND) have no index until ``flask rebuild-search-index``
+        is run; searching them falls back to LIKE instead of failing.
+        """
+        backend = current_app.extensions.get('product_search')
+        if backend is None:
+            backend = configured_search_backend(db.engine.dialect.name)
+            with db.engine.connect() as connection:
+                installed = backend.is_installed(connection)
+            if not installed:
+                current_app.logger.warning(
+                    f"The '{backend.name}' search index is missing; using LIKE search. "
+                    "Run 'flask rebuild-search-index' to create it, then restart."
+                )
+                backend = LikeSearchBackend()
+            current_app.extensions['product_search'] = backend
+        return backend
+
+    def filter(self, query, term):
+        """Restrict a product query to rows matching the search term."""
+        return self.backend.filter(query, term)
+
+    def order_by_relevance(self, query, term):
+        """Order a (filtered) product query by match quality."""
+        return self.backend.order_by_relevance(query, term)
+
+product_search = ProductSearch()
@@ -0,0 +1,121 @@
+import json
+from decimal import Decimal
+from flask import current_app
+from flask.json.provider import DefaultJSONProvider
+from models.product import Product
+
+try:
+    import orjson
+except ImportError:  # optional: fall back to the stdlib encoder
+    orjson = None
+
+# Fields of ProductSchema, in schema order
+PRODUCT_FIELDS = (
+    'id', 'name', 'description', 'price', 'category',
+    'stock_quantity', 'sku', 'created_at', 'updated_at', 'version'
+)
+
+_TWO_PLACES = Decimal('0.01')
+
+def _integer(value):
+    return int(value) if value is not None else None
+
+def _string(value):
+    return str(value) if value is not None else None
+
+def _price(value):
+    # Same steps as fields.Decimal(places=2) followed by Flask's Decimal -> str
+    if value is None:
+        return None
+    number = Decimal(str(value))
+    if number.is_finite():
+        number = number.quantize(_TWO_PLACES)
+    return str(number)
+
+def _iso_datetime(value):
+    return value.isoformat() if value is not None else None
+
+_FORMATTERS = {
+    'id': _integer,
+    'name': _string,
+    'description': _string,
+    'price': _price,
+    'category': _string,
+    'stock_quantity': _integer,
+    'sku': _string,
+    'created_at': _iso_datetime,
+    'updated_at': _iso_datetime,
+    'version': _integer
+}
+
+def product_columns(fields=PRODUCT_FIELDS):
+    """Columns to select for the given fields, in the same order."""
+    return [getattr(Product, field) for field in fields]
+
+class RowSerializer:
+    """Turns row tuples selected with ``product_columns(fields)`` into dicts.
+
+    The per-field formatters are resolved once, so a page costs one zip per
+    row instead of a walk over marshmallow's field objects. The output is
+    what ``ProductSchema(only=fields).dump()`` produces once Flask has
+    encoded it. Columns selected after ``fields`` (e.g. the id and sort key
+    that cursors need) are ignored.
+    """
+
+    def __init__(self, fields=PRODUCT_FIELDS):
+        self.fields = tuple(fields)
+        self._formatters = [(field, _FORMATTERS[field]) for field in self.fields]
+
+    def dump_row(self, row):
+        return {field: format_value(value) for (field, format_value), value in zip(self._formatters, row)}
+
+    def dump_object(self, obj):
+        """Serialize a model instance (or anything with the field attributes)."""
+        return {field: format_value(getattr(obj, field)) for field, format_value in self._formatters}
+
+    def dump(self, rows):
+        return [self.dump_row(row) for row in rows]
+
+product_row_serializer = RowSerializer()
+
+def json_response(payload, status_code=200):
+    """Encode ``payload`` like ``jsonify`` does, with orjson when it is installed.
+
+    orjson is only used where its output is byte-identical to the app's JSON
+    provider: compact output with sorted keys and nothing outside ASCII
+    (the provider escapes non-ASCII characters). Anything else, and anything
+    orjson cannot encode, goes through the provider.
+    """
+    provider = current_app.json
+    compact = not ((provider.compact is None and current_app.debug) or provider.compact is False)
+
+    if orjson is not None and isinstance(provider, DefaultJSONProvider) and compact and provider.sort_keys:
+        try:
+            body = orjson.dumps(
+                payload,
+                default=provider.default,
+                option=orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+            )
+        except TypeError:
+            body = None
+        if body is not None and body.isascii():
+            return current_app.response_class(body + b'\n', status=status_code, mimetype=provider.mimetype)
+
+    response = provider.response(payload)
+    response.status_code = status_code
+    return response
+
+def compact_json(payload):
+    """Encode a JSON-safe payload as bytes, exactly as ``json_response`` does.
+
+    For code running outside a Flask app (the ASGI variant): sorted keys,
+    compact separators, ASCII-only and a trailing newline.
+    """
+    if orjson is not None:
+        try:
+            body = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+        except TypeError:
+            body = None
+        if body is not None and body.isascii():
+            return body + b'\n'
+    return (json.dumps(payload, sort_keys=True, separators=(',', ':')) + '\n').encode('ascii')
@@ -1,5 +1,42 @@
-from marshmallow import Schema, fields, validate, validates_schema, ValidationError
+from marshmallow import Schema, fields, validate, validates, validates_schema, ValidationError
 from flask import current_app
+from utils.pagination import decode_cursor
+from models.product import Product
+from utils.serializers import PRODUCT_FIELDS
+
+class FieldSet(fields.Field):
+    """Comma-separated list of product field names, loaded in schema order."""
+    
+    def _deserialize(self, value, attr, data, **kwargs):
+        if not isinstance(value, str):
+            raise ValidationError('Must be a comma-separated list of field names.')
+        names = {name.strip() for name in value.split(',') if name.strip()}
+        if not names:
+            raise ValidationError('At least one field name is required.')
+        unknown = sorted(names.difference(PRODUCT_FIELDS))
+        if unknown:
+            raise ValidationError(f"Unknown fields: {', '.join(unknown)}. Must be any of: {', '.join(PRODUCT_FIELDS)}.")
+        return tuple(name for name in PRODUCT_FIELDS if name in names)
+    
+    def _serialize(self, value, attr, obj, **kwargs):
+        return ','.join(value) if value is not None else None
+
+class IdList(fields.Field):
+    """Comma-separated list of product ids, kept in the order given."""
+    
+    def _deserialize(self, value, attr, data, **kwargs):
+        try:
+            ids = [int(part) for part in str(value).split(',') if part.strip()]
+        except ValueError:
+            raise ValidationError('Must be a comma-separated list of product ids.')
+        if not ids:
+            raise ValidationError('At least one product id is required.')
+        if any(product_id < 1 for product_id in ids):
+            raise ValidationError('Product ids must be positive integers.')
+        return ids
+    
+    def _serialize(self, value, attr, obj, **kwargs):
+        return ','.join(str(product_id) for product_id in value) if value is not None else None
 
 class ProductSchema(Schema):
     """Schema for validating product data."""
@@ -40,6 +77,7 @@ class ProductSchema(Schema):
     )
     created_at = fields.DateTime(dump_only=True, format='iso')
     updated_at = fields.DateTime(dump_only=True, format='iso')
+    version = fields.Integer(dump_only=True)
     
     @validates_schema
     def validate_product(self, data, **kwargs):
@@ -63,10 +101,74 @@ class ProductUpdateSchema(ProductSchema):
         validate=validate.Length(min=1, max=50),
         allow_none=True
     )
+    # No default: a partial update must not reset the stock
+    stock_quantity = fields.Integer(
+        validate=validate.Range(min=0),
+        allow_none=True,
+        error_messages={'invalid': 'Stock quantity must be a non-negative integer.'}
+    )
     sku = fields.String(
         validate=validate.Length(min=1, max=50),
         allow_none=True
     )
+    # The version the change was based on (as read); rejected if it is stale
+    version = fields.Integer(
+        validate=validate.Range(min=1),
+        allow_none=True
+    )
+
+class ProductBulkUpdateSchema(ProductUpdateSchema):
+    """Schema for one item of a bulk update - identifies the product by id."""
+    
+    id = fields.Integer(
+        required=True,
+        validate=validate.Range(min=1),
+        error_messages={'required': 'Product id is required.'}
+    )
+
+class StockAdjustmentSchema(Schema):
+    """Schema for validating a stock adjustment."""
+    
+    # Added to the current stock; negative to remove
+    delta = fields.Integer(
+        required=True,
+        validate=validate.NoneOf([0], error='Delta must not be zero.'),
+        error_messages={
+            'required': 'Delta is required.',
+            'invalid': 'Delta must be an integer.'
+        }
+    )
+    # Only apply the adjustment to this version of the product
+    version = fields.Integer(
+        validate=validate.Range(min=1),
+        allow_none=True
+    )
+
+class ProductBulkDeleteSchema(Schema):
+    """Schema for validating a bulk delete request."""
+    
+    ids = fields.List(
+        fields.Integer(validate=validate.Range(min=1)),
+        required=True,
+        validate=validate.Length(min=1),
+        error_messages={'required': 'A list of product ids is required.'}
+    )
+
+class ProductBatchQuerySchema(Schema):
+    """Schema for validating a lookup of many products by id."""
+    
+    ids = IdList(
+        required=True,
+        error_messages={'required': 'A list of product ids is required.'}
+    )
+    fieldset = FieldSet(data_key='fields')
+    
+    @validates('ids')
+    def validate_ids(self, value, **kwargs):
+        """Apply the same size limit as the bulk write endpoints."""
+        max_items = current_app.config.get('BULK_MAX_ITEMS', 1000)
+        if len(value) > max_items:
+            raise ValidationError(f'A bulk request may contain at most {max_items} items.')
 
 class ProductQuerySchema(Schema):
     """Schema for validating query parameters."""
@@ -89,9 +191,70 @@ class ProductQuerySchema(Schema):
     )
     sort_by = fields.String(
         load_default='created_at',
-        validate=validate.OneOf(['name', 'price', 'created_at', 'updated_at'])
+        validate=validate.OneOf(['name', 'price', 'created_at', 'updated_at', 'relevance'])
     )
     order = fields.String(
         load_default='desc',
         validate=validate.OneOf(['asc', 'desc'])
-    )
\ No newline at end of file
+    )
+    pagination = fields.String(
+        validate=validate.OneOf(['offset', 'cursor'])
+    )
+    cursor = fields.String(
+        validate=validate.Length(min=1, max=500),
+        allow_none=True
+    )
+    # exact: COUNT query; estimate: cached/statistics total; none: no total, has_next only
+    count = fields.String(
+        validate=validate.OneOf(['exact', 'estimate', 'none'])
+    )
+    # ?fields=id,name,price - "fields" itself is taken by Schema
+    fieldset = FieldSet(data_key='fields')
+    
+    @validates_schema
+    def validate_cursor(self, data, **kwargs):
+        """Ensure the cursor is well formed and matches the requested sort."""
+        if data.get('sort_by') == 'relevance' and (data.get('cursor') or data.get('pagination') == 'cursor'):
+            raise ValidationError('Cursor pagination cannot be combined with sort_by=relevance.', 'sort_by')
+        if data.get('cursor'):
+            try:
+                sort_by = data.get('sort_by', 'created_at')
+                decode_cursor(data['cursor'], sort_by, data.get('order', 'desc'), getattr(Product, sort_by).type.python_type)
+            except ValueError as e:
+                raise ValidationError(str(e), 'cursor')
+
+
+class CategoryQuerySchema(Schema):
+    """Schema for validating category listing parameters."""
+    
+    # Include product count, stock and price range per category
+    stats = fields.Boolean(load_default=False)
+
+class InventoryStatsQuerySchema(Schema):
+    """Schema for validating inventory stats parameters."""
+    
+    category = fields.String(
+        validate=validate.Length(min=1, max=50),
+        allow_none=True
+    )
+    # Stock at or below this (and above zero) counts as low; defaults to LOW_STOCK_THRESHOLD
+    low_stock = fields.Integer(
+        validate=validate.Range(min=0),
+        allow_none=True
+    )
+
+class ProductExportSchema(Schema):
+    """Schema for validating catalog export parameters."""
+    
+    format = fields.String(
+        load_default='ndjson',
+        validate=validate.OneOf(['ndjson', 'csv'])
+    )
+    q = fields.String(
+        validate=validate.Length(min=1, max=100),
+        allow_none=True
+    )
+    category = fields.String(
+        validate=validate.Length(min=1, max=50),
+        allow_none=True
+    )